@@ -0,0 +1,70 @@
+# benchmarks/bench_catalog.py
+"""
+Benchmark del Catalog: escanear who-old y who-new a la vez frente a una tras otra.
+
+Construye dos bibliotecas sintéticas de distinto tamaño y envuelve scan_dir con
+un sleep (como en bench_parallel_scan.py) para imitar un montaje de red. El
+escaneo conjunto debería costar lo mismo que el de la raíz más grande.
+
+Uso:
+    python benchmarks/bench_catalog.py [--latency-ms 20] [--workers 4]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mycli import library  # noqa: E402
+from mycli.library import LibraryIndex  # noqa: E402
+from core.catalog import Catalog  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_parallel_scan import build_library, with_latency  # noqa: E402
+
+
+def timed_scan(cfg, names, depth):
+    """(segundos, resultado) de un escaneo en frío (índice vacío) de names."""
+    catalog = Catalog.from_config(cfg, LibraryIndex())
+    t0 = time.perf_counter()
+    found = catalog.scan(names, depth)
+    return time.perf_counter() - t0, found
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--latency-ms", type=float, default=20.0)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--depth", type=int, default=2)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = {
+            "who_classic_path": str(build_library(Path(tmp) / "classic", doctors=8, seasons=4)),
+            "who_new_path": str(build_library(Path(tmp) / "new", doctors=6, seasons=3)),
+            "scan_workers": args.workers,
+        }
+        real_scan, slow_scan = with_latency(args.latency_ms / 1000.0)
+        # LibraryIndex lista con su propia referencia a scan_dir
+        library.scan_dir = slow_scan
+        try:
+            t_old, old = timed_scan(cfg, ["who-old"], args.depth)
+            t_new, new = timed_scan(cfg, ["who-new"], args.depth)
+            t_both, both = timed_scan(cfg, None, args.depth)
+        finally:
+            library.scan_dir = real_scan
+
+    print(f"who-old solo:      {t_old * 1000:8.1f} ms")
+    print(f"who-new solo:      {t_new * 1000:8.1f} ms")
+    print(f"una tras otra:     {(t_old + t_new) * 1000:8.1f} ms")
+    print(f"catalog (ambas):   {t_both * 1000:8.1f} ms  (mayor individual {max(t_old, t_new) * 1000:.1f} ms)")
+    if both != {**old, **new}:
+        print("ERROR: el escaneo conjunto dio resultados distintos")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
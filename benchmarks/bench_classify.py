@@ -0,0 +1,138 @@
+# benchmarks/bench_classify.py
+"""
+Benchmark de la clasificación de nombres (classify.py) contra la implementación
+anterior (regex construidas en cada llamada), sobre un listado sintético.
+
+Comprueba además que ambas den exactamente los mismos resultados.
+
+Uso:
+    python benchmarks/bench_classify.py [--names 10000] [--seed 7]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mycli import classify  # noqa: E402
+from core import catalog  # noqa: E402
+
+
+# ---------- implementación anterior (referencia) ----------
+def legacy_norm_name(s):
+    if not s:
+        return ""
+    s = unicodedata.normalize("NFKD", s)
+    s = s.encode("ascii", "ignore").decode("ascii")
+    s = s.replace('.', ' ').replace('_', ' ').replace('-', ' ')
+    s = re.sub(r'\s+', ' ', s).strip().lower()
+    return s
+
+
+def legacy_looks_like_season_dir(name):
+    n = legacy_norm_name(name)
+    if 'doctor' in n or 'who' in n or 'dr' in n:
+        if re.search(r'\b\d+\b', n) or re.search(r'\b(decimo|tenth|10mo|10º|10th)\b', n):
+            return True
+        if re.search(r'\bseason\b|\btemporada\b|\btemporad\b', n):
+            return True
+        if re.search(r'\bprimer\b|\bsegund[ao]\b|\btercer\b|\bcuart[ao]\b|\bquint[ao]\b|\bsext[ao]\b|\bseptim[ao]\b|\boctav[ao]\b|\bnoven[ao]\b|\bdecim[ao]\b', n):
+            return True
+    if re.search(r'\bseason\b|\btemporada\b', n):
+        return True
+    return False
+
+
+def legacy_is_doctor_dir(name):
+    n = legacy_norm_name(name)
+    if ("doctor" in n) or ("dr " in n) or n.startswith("dr.") or ("who" in n):
+        return True
+    if re.search(r'\b(dr|doctor|who)\b', n):
+        return True
+    return False
+
+
+def legacy_extract_ordinal(name, words, eng):
+    n = legacy_norm_name(name)
+    m = re.search(r'\b(\d{1,3})\b', n)
+    if m:
+        return int(m.group(1))
+    m2 = re.search(r'\b(\d{1,3})(?:mo|º|th|st|nd|rd)\b', n)
+    if m2:
+        return int(m2.group(1))
+    for word, val in words.items():
+        if re.search(r'\b' + re.escape(word) + r'\b', n):
+            return val
+    for w, v in eng.items():
+        if re.search(r'\b' + re.escape(w) + r'\b', n):
+            return v
+    return None
+
+
+# ---------- listado sintético ----------
+def synthetic_names(count, seed):
+    rnd = random.Random(seed)
+    words = list(catalog.ORDINAL_WORDS) + list(catalog.ENGLISH_ORDINALS)
+    heads = ["Doctor", "Dr.", "Dr", "Doctor_Who", "doctor-who", "El", "The", "Who", "Serie", "Extras", "DVD"]
+    tails = ["Temporada", "Season", "temporad", "Specials", "Disc", "Vol", "Parte", "1080p", "x265"]
+    out = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rnd.randint(1, 4)):
+            r = rnd.random()
+            if r < 0.3:
+                parts.append(rnd.choice(heads))
+            elif r < 0.55:
+                parts.append(rnd.choice(words).capitalize())
+            elif r < 0.75:
+                parts.append(str(rnd.randint(1, 40)) + rnd.choice(["", "", "mo", "th", "º", "st"]))
+            else:
+                parts.append(rnd.choice(tails))
+        out.append(rnd.choice([" ", ".", "_", " - "]).join(parts))
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--names", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    names = synthetic_names(args.names, args.seed)
+    words, eng = catalog.ORDINAL_WORDS, catalog.ENGLISH_ORDINALS
+
+    t0 = time.perf_counter()
+    legacy = [(legacy_is_doctor_dir(n), legacy_looks_like_season_dir(n),
+               legacy_extract_ordinal(n, words, eng) if legacy_is_doctor_dir(n) else None) for n in names]
+    t_legacy = time.perf_counter() - t0
+
+    classify._norm_name.cache_clear()
+    vocab = classify.OrdinalVocab(words, eng)
+    t0 = time.perf_counter()
+    current = [(i.is_doctor, i.is_season, i.ordinal) for i in classify.classify_names(names, vocab)]
+    t_current = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    classify.classify_names(names, vocab)
+    t_warm = time.perf_counter() - t0
+
+    mismatches = [(n, a, b) for n, a, b in zip(names, legacy, current) if a != b]
+    print(f"{len(names)} nombres")
+    print(f"anterior:         {t_legacy * 1000:8.1f} ms")
+    print(f"classify (frío):  {t_current * 1000:8.1f} ms  x{t_legacy / t_current:5.1f}")
+    print(f"classify (cache): {t_warm * 1000:8.1f} ms  x{t_legacy / t_warm:5.1f}")
+    if mismatches:
+        print(f"ERROR: {len(mismatches)} resultados distintos, p. ej.:")
+        for n, a, b in mismatches[:10]:
+            print(f"  {n!r}: anterior={a} nuevo={b}")
+        return 1
+    print("Resultados idénticos.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
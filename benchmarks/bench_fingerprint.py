@@ -0,0 +1,101 @@
+# benchmarks/bench_fingerprint.py
+"""
+Benchmark de huellas de contenido (watch_key = "fingerprint").
+
+Crea una biblioteca de N episodios (archivos dispersos de --size-mb, con bytes
+distintos al principio/mitad/final) y mide:
+  - huellas en frío, secuencial y con el pool de hilos,
+  - en caliente (todo del caché: un stat por archivo),
+  - incremental tras modificar --changed archivos (solo esos se releen),
+y comprueba que el estado de vistos sobrevive a mover la biblioteca de carpeta.
+
+Uso:
+    python benchmarks/bench_fingerprint.py [--episodes 5000] [--size-mb 300] [--workers 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mycli.fingerprint import CHUNK, FingerprintCache  # noqa: E402
+from mycli.utils import WatchSession  # noqa: E402
+
+
+def build_library(base: Path, episodes: int, size: int):
+    paths = []
+    for i in range(episodes):
+        season = base / f"Doctor {i // 500 + 1}" / f"Season {i // 50 % 10 + 1}"
+        season.mkdir(parents=True, exist_ok=True)
+        p = season / f"Episode {i:05d}.mkv"
+        with open(p, "wb") as fh:
+            tag = f"episodio {i}".encode()
+            for offset in (0, size // 2, size - CHUNK):
+                fh.seek(offset)
+                fh.write(tag)
+            fh.truncate(size)
+        paths.append(p)
+    return paths
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--episodes", type=int, default=5000)
+    ap.add_argument("--size-mb", type=int, default=300)
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--changed", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = build_library(tmp / "lib", args.episodes, args.size_mb * 1024 * 1024)
+
+        t_seq, fps = timed(lambda: FingerprintCache().fingerprints(paths, 1))
+        cache = FingerprintCache(tmp / "fingerprints.json")
+        t_par, fps_par = timed(lambda: cache.fingerprints(paths, args.workers))
+        cache.save()
+        t_warm, _ = timed(lambda: FingerprintCache.load(cache.path).fingerprints(paths, args.workers))
+        ok &= fps == fps_par and len(set(fps.values())) == len(paths)
+
+        for p in paths[:args.changed]:
+            with open(p, "r+b") as fh:
+                fh.write(b"editado")
+        warm = FingerprintCache.load(cache.path)
+        t_inc, _ = timed(lambda: warm.fingerprints(paths, args.workers))
+
+        # marcar vistos, mover la biblioteca y volver a mirar
+        state = tmp / "state" / "watched.json"
+        session = WatchSession(str(state), key_mode="fingerprint")
+        session.refresh()
+        session.set_watched(paths[:100], True)
+        os.rename(tmp / "lib", tmp / "moved")
+        moved = [tmp / "moved" / p.relative_to(tmp / "lib") for p in paths[:100]]
+        after = WatchSession(str(state), key_mode="fingerprint")
+        after.refresh()
+        still = sum(1 for _, w in after.status(moved) if w)
+        ok &= still == 100
+
+    print(f"episodios:            {args.episodes} ({args.size_mb} MB c/u, dispersos)")
+    print(f"frío, secuencial:     {t_seq * 1000:8.1f} ms")
+    print(f"frío, {args.workers} hilos:         {t_par * 1000:8.1f} ms")
+    print(f"caliente (caché):     {t_warm * 1000:8.1f} ms")
+    print(f"{args.changed} modificados:       {t_inc * 1000:8.1f} ms")
+    print(f"vistos tras mover:    {still}/100")
+    if not ok:
+        print("ERROR: huellas distintas, repetidas o estado perdido al mover")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
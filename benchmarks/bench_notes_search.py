@@ -0,0 +1,84 @@
+# benchmarks/bench_notes_search.py
+"""
+Benchmark de `notes search` sobre una carpeta sintética de notas.
+
+Mide la construcción del índice en frío, la actualización sin cambios (un
+scandir), la actualización tras editar unas pocas notas y la latencia de búsqueda
+con el índice ya cargado.
+
+Uso:
+    python benchmarks/bench_notes_search.py [--notes 50000] [--seed 3]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mycli.notes_index import NotesSearchIndex, notes_index_path  # noqa: E402
+
+WORDS = ("tardis dalek cyberman gallifrey regeneración sonic destornillador companion "
+         "episodio temporada doctor maestro silurian ood weeping angel torchwood unit "
+         "londres cardiff espacio tiempo paradoja").split()
+# vocabulario de relleno con frecuencias tipo Zipf, como texto real
+FILLER = [f"w{i}" for i in range(20000)]
+FILLER_WEIGHTS = [1.0 / (i + 1) for i in range(len(FILLER))]
+
+
+def build_notes(root: Path, count: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        n = rnd.randint(20, 120)
+        words = rnd.choices(FILLER, FILLER_WEIGHTS, k=n) + rnd.sample(WORDS, 3)
+        body = " ".join(words)
+        (root / f"nota_{i:06d}.txt").write_text(body + "\n", encoding="utf-8")
+
+
+def ms(t):
+    return f"{t * 1000:9.1f} ms"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--notes", type=int, default=50000)
+    ap.add_argument("--seed", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        notes = Path(tmp) / "notas"
+        build_notes(notes, args.notes, args.seed)
+        path = notes_index_path(notes)
+
+        t0 = time.perf_counter()
+        with NotesSearchIndex(path) as idx:
+            idx.update(notes)
+        print(f"índice en frío ({args.notes} notas): {ms(time.perf_counter() - t0)}")
+
+        t0 = time.perf_counter()
+        idx = NotesSearchIndex(path)
+        t_load = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        changed = idx.update(notes)
+        print(f"apertura del índice:          {ms(t_load)}")
+        print(f"update sin cambios:           {ms(time.perf_counter() - t0)}  ({changed} notas)")
+
+        for i in range(0, 10):
+            (notes / f"nota_{i:06d}.txt").write_text("gallifrey paradoja editada\n", encoding="utf-8")
+        t0 = time.perf_counter()
+        changed = idx.update(notes)
+        print(f"update con 10 editadas:       {ms(time.perf_counter() - t0)}  ({changed} notas)")
+
+        for query in ("tardis", "dalek gallifrey", "regeneracion", "paradoja editada", "w15000", "inexistente"):
+            t0 = time.perf_counter()
+            hits = idx.search(query, 20)
+            print(f"search {query!r:<20}  {ms(time.perf_counter() - t0)}  ({len(hits)} resultados)")
+        idx.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# benchmarks/bench_parallel_scan.py
+"""
+Benchmark del escaneo paralelo (scan_workers) con latencia simulada por listado.
+
+Construye una biblioteca sintética en un directorio temporal y envuelve scan_dir
+con un sleep para imitar un montaje SMB/NFS donde cada listado cuesta 20-50 ms.
+
+Uso:
+    python benchmarks/bench_parallel_scan.py [--latency-ms 30] [--workers 1 4 8]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mycli import utils  # noqa: E402
+
+
+def build_library(root: Path, doctors: int = 6, seasons: int = 4, episodes: int = 8) -> Path:
+    for d in range(1, doctors + 1):
+        for s in range(1, seasons + 1):
+            season = root / f"Doctor {d}" / f"Temporada {s}"
+            season.mkdir(parents=True, exist_ok=True)
+            for e in range(1, episodes + 1):
+                (season / f"S{s:02d}E{e:02d}.mkv").touch()
+    return root
+
+
+def with_latency(latency_s: float):
+    real_scan = utils.scan_dir
+
+    def slow_scan(path):
+        time.sleep(latency_s)
+        return real_scan(path)
+    return real_scan, slow_scan
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--latency-ms", type=float, default=30.0)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    ap.add_argument("--doctors", type=int, default=6)
+    ap.add_argument("--seasons", type=int, default=4)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = build_library(Path(tmp), args.doctors, args.seasons)
+        real_scan, slow_scan = with_latency(args.latency_ms / 1000.0)
+        utils.scan_dir = slow_scan
+        try:
+            reference = None
+            baseline = None
+            for w in args.workers:
+                t0 = time.perf_counter()
+                result = utils.detect_season_dirs(root, max_depth=2, workers=w)
+                elapsed = time.perf_counter() - t0
+                if reference is None:
+                    reference, baseline = result, elapsed
+                elif result != reference:
+                    print(f"ERROR: resultados distintos con workers={w}")
+                    return 1
+                print(f"workers={w:<3} {elapsed * 1000:9.1f} ms  x{baseline / elapsed:5.2f}  ({len(result)} candidatas)")
+        finally:
+            utils.scan_dir = real_scan
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# benchmarks/bench_player.py
+"""
+Reproductor persistente (mycli.player, player_mode "ipc") contra un proceso por episodio.
+
+Usa tests/fake_mpv.py como reproductor: un proceso Python que abre el socket IPC
+tras --startup-delay segundos (el arranque de mpv, con su ventana, suele
+costar eso o más). Mide con la mediana de --repeat corridas:
+
+  spawn   lanzar un reproductor nuevo y esperar a que cargue el episodio
+          (lo que paga cada `p #` sin IPC)
+  switch  cambiar de episodio con loadfile sobre el reproductor ya abierto
+
+y comprueba que el cambio quede bajo --switch-budget-ms. También corre una
+lista completa con play_list (el reproductor falso avanza episodio por
+episodio; uno se salta) y verifica los episodios que devuelve como vistos.
+Sale con código 1 si algo falla.
+
+Uso:
+    python benchmarks/bench_player.py [--episodes 20] [--repeat 5] [--startup-delay 0.3] [--switch-budget-ms 50]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+TESTS = HERE.parent / "tests"
+sys.path.insert(0, str(TESTS))
+
+from mycli.player import PlayerSession  # noqa: E402
+from mycli.playlist import write_m3u  # noqa: E402
+from fake_mpv import FakeMpv  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--episodes", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--startup-delay", type=float, default=0.3)
+    ap.add_argument("--switch-budget-ms", type=float, default=50.0)
+    args = ap.parse_args(argv)
+
+    fake_cmd = [sys.executable, str(TESTS / "fake_mpv.py"), "--startup-delay", str(args.startup_delay)]
+    episodes = [f"/biblioteca/Doctor 10/Temporada 2/S02E{i:02d}.mkv" for i in range(1, args.episodes + 1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sock = Path(tmp) / "player.sock"
+
+        # --- un reproductor nuevo por episodio ---
+        spawn = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            player = PlayerSession(mode="ipc", socket_path=sock, argv=fake_cmd)
+            player.play(episodes[0])
+            spawn.append(time.perf_counter() - t0)
+            player.command("quit")
+            player.close()
+            player.proc.wait()
+
+        # --- un reproductor para la sesión: loadfile por episodio ---
+        with FakeMpv(sock) as fake:
+            player = PlayerSession(mode="ipc", socket_path=sock)
+            player.play(episodes[0])  # conexión
+            switch = []
+            for ep in episodes[1:]:
+                t0 = time.perf_counter()
+                player.play(ep)
+                switch.append(time.perf_counter() - t0)
+            loaded = [c[1] for c in fake.commands if c[0] == "loadfile"]
+
+            # lista completa: todos terminan (eof) salvo el segundo, que se salta
+            m3u = write_m3u(Path(tmp) / "lista.m3u", episodes)
+
+            def viewer():
+                time.sleep(0.1)
+                for i in range(len(episodes)):
+                    if i == 1:
+                        fake.handle(["playlist-next"])
+                    else:
+                        fake.advance()
+                    time.sleep(0.005)
+            threading.Thread(target=viewer, daemon=True).start()
+            finished = player.play_list(episodes, m3u)
+            player.close()
+        expected = [str(Path(e).resolve()) for e in episodes[:1] + episodes[2:]]
+
+    spawn_ms = statistics.median(spawn) * 1000
+    switch_ms = statistics.median(switch) * 1000
+    print(f"spawn (reproductor nuevo):  {spawn_ms:8.1f} ms")
+    print(f"switch (loadfile por IPC):  {switch_ms:8.2f} ms  (presupuesto {args.switch_budget_ms:.0f} ms)")
+    print(f"aceleración:                x{spawn_ms / switch_ms:.0f}")
+
+    ok = True
+    if loaded != episodes:
+        print("ERROR: el reproductor no recibió los episodios en orden", file=sys.stderr)
+        ok = False
+    if [str(Path(e).resolve()) for e in finished or []] != expected:
+        print(f"ERROR: play_list devolvió {len(finished or [])} vistos, se esperaban {len(expected)}", file=sys.stderr)
+        ok = False
+    if switch_ms > args.switch_budget_ms:
+        print("ERROR: cambiar de episodio supera el presupuesto", file=sys.stderr)
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# benchmarks/bench_probe.py
+"""
+Benchmark de media_probe: metadatos de una temporada leyendo solo cabeceras.
+
+Genera episodios sintéticos MP4 (moov al final, tras un mdat grande), Matroska
+y AVI con cabeceras válidas y datos de relleno, y mide:
+  - probe en frío de la temporada (pool de hilos),
+  - visita repetida (todo del caché: un stat por episodio),
+y comprueba que duración y resolución coinciden con lo escrito.
+
+Uso:
+    python benchmarks/bench_probe.py [--episodes 40] [--payload-mb 8] [--workers 8]
+"""
+import argparse
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mycli.media_probe import ProbeCache  # noqa: E402
+
+
+# ---------- generadores ----------
+def _box(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def write_mp4(path: Path, seconds: float, width: int, height: int, payload: int) -> None:
+    scale = 1000
+    mvhd = _box(b"mvhd", b"\0" * 12 + struct.pack(">II", scale, int(seconds * scale)) + b"\0" * 80)
+    tkhd = _box(b"tkhd", b"\0" * 76 + struct.pack(">II", width << 16, height << 16))
+    audio = _box(b"trak", _box(b"tkhd", b"\0" * 84))
+    moov = _box(b"moov", mvhd + audio + _box(b"trak", tkhd))
+    with open(path, "wb") as fh:
+        fh.write(_box(b"ftyp", b"isom\0\0\0\0isomavc1"))
+        fh.write(struct.pack(">I4s", 8 + payload, b"mdat"))
+        fh.write(b"\0" * payload)
+        fh.write(moov)
+
+
+def _ebml(eid: int, body: bytes) -> bytes:
+    size = len(body) | (1 << 56)  # tamaño en 8 bytes
+    return eid.to_bytes((eid.bit_length() + 7) // 8, "big") + size.to_bytes(8, "big") + body
+
+
+def write_mkv(path: Path, seconds: float, width: int, height: int, payload: int) -> None:
+    header = _ebml(0x1A45DFA3, _ebml(0x4282, b"matroska"))
+    info = _ebml(0x1549A966, _ebml(0x2AD7B1, (1_000_000).to_bytes(3, "big")) + _ebml(0x4489, struct.pack(">d", seconds * 1000)))
+    video = _ebml(0xE0, _ebml(0xB0, width.to_bytes(2, "big")) + _ebml(0xBA, height.to_bytes(2, "big")))
+    tracks = _ebml(0x1654AE6B, _ebml(0xAE, video))
+    cluster = _ebml(0x1F43B675, b"\0" * payload)
+    with open(path, "wb") as fh:
+        fh.write(header + _ebml(0x18538067, info + tracks + cluster))
+
+
+def write_avi(path: Path, seconds: float, width: int, height: int, payload: int) -> None:
+    frames = int(seconds * 25)
+    avih = struct.pack("<10I", 40000, 0, 0, 0, frames, 0, 1, 0, width, height) + b"\0" * 16
+    hdrl = b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih
+    body = b"AVI " + b"LIST" + struct.pack("<I", len(hdrl)) + hdrl + b"LIST" + struct.pack("<I", 4 + payload) + b"movi" + b"\0" * payload
+    with open(path, "wb") as fh:
+        fh.write(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+
+WRITERS = {".mp4": write_mp4, ".mkv": write_mkv, ".avi": write_avi}
+
+
+def build_season(base: Path, episodes: int, payload: int):
+    """Episodios alternando contenedor; devuelve [(ruta, segundos, ancho, alto)]."""
+    base.mkdir(parents=True, exist_ok=True)
+    out = []
+    exts = list(WRITERS)
+    for i in range(episodes):
+        ext = exts[i % len(exts)]
+        seconds, w, h = 1500.0 + i * 7, 720 + 16 * (i % 5), 576
+        p = base / f"Episode {i + 1:02d}{ext}"
+        WRITERS[ext](p, seconds, w, h, payload)
+        out.append((p, seconds, w, h))
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--episodes", type=int, default=40)
+    ap.add_argument("--payload-mb", type=float, default=8.0)
+    ap.add_argument("--workers", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        season = build_season(Path(tmp) / "Season 1", args.episodes, int(args.payload_mb * 1024 * 1024))
+        paths = [p for p, _, _, _ in season]
+        cache = ProbeCache(Path(tmp) / "media_probe.json")
+
+        t0 = time.perf_counter()
+        cold = cache.probe_many(paths, args.workers)
+        t_cold = time.perf_counter() - t0
+        cache.save()
+
+        t0 = time.perf_counter()
+        warm = ProbeCache.load(cache.path).probe_many(paths, args.workers)
+        t_warm = time.perf_counter() - t0
+
+    bad = [p.name for p, sec, w, h in season
+           if not (cold[str(p)] and abs(cold[str(p)].duration - sec) < 0.01 and (cold[str(p)].width, cold[str(p)].height) == (w, h))]
+    print(f"episodios:          {args.episodes} ({args.payload_mb:g} MB de datos c/u)")
+    print(f"probe en frío:      {t_cold * 1000:8.1f} ms")
+    print(f"visita repetida:    {t_warm * 1000:8.1f} ms (caché + stat)")
+    print(f"total temporada:    {sum(i.duration for i in warm.values()) / 3600:.2f} h")
+    if bad or cold != warm:
+        print("ERROR: metadatos incorrectos en", bad or "el caché")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
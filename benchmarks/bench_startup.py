@@ -0,0 +1,103 @@
+# benchmarks/bench_startup.py
+"""
+Presupuesto de arranque del entry point `ohmycli`.
+
+Mide en procesos nuevos (arranque en frío de Python):
+  - el import acumulado de `mycli.main` según `-X importtime`;
+  - el tiempo de pared de `main(['-h'])` (mediana de varias corridas);
+y comprueba que `-h` no importe los módulos de comandos ni mycli.utils.
+Sale con código 1 si se supera algún presupuesto.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 7] [--import-budget-ms 50] [--wall-budget-ms 150]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+# módulos que no deben cargarse para `ohmycli -h`
+LAZY_MODULES = ["mycli.utils", "mycli.commands.who_old", "mycli.commands.who_new", "mycli.commands.catalog",
+                "mycli.commands.notes", "core.catalog", "mycli.media_probe",
+                "mycli.watcher", "mycli.player"]
+
+HELP_SNIPPET = (
+    "import sys; sys.path.insert(0, {src!r}); "
+    "from mycli.main import main; main(['-h']); "
+    "print('LOADED=' + ','.join(m for m in {mods!r} if m in sys.modules))"
+)
+
+
+def import_time_us() -> int:
+    """Tiempo acumulado (µs) del import de mycli.main reportado por -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {SRC!r}); import mycli.main"],
+        capture_output=True, text=True,
+    )
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "mycli.main":
+            return int(parts[1].strip())
+    raise RuntimeError("No encontré 'mycli.main' en la salida de -X importtime:\n" + proc.stderr[-2000:])
+
+
+def help_wall_time() -> tuple:
+    """(segundos, módulos perezosos cargados) de un proceso que ejecuta main(['-h'])."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", HELP_SNIPPET.format(src=SRC, mods=LAZY_MODULES)],
+        capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - t0
+    loaded = ""
+    for line in proc.stdout.splitlines():
+        if line.startswith("LOADED="):
+            loaded = line[len("LOADED="):]
+    return elapsed, [m for m in loaded.split(",") if m]
+
+
+def interpreter_wall_time() -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"])
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--import-budget-ms", type=float, default=50.0)
+    ap.add_argument("--wall-budget-ms", type=float, default=150.0)
+    args = ap.parse_args(argv)
+
+    imports = [import_time_us() / 1000.0 for _ in range(args.runs)]
+    walls, loaded = [], []
+    for _ in range(args.runs):
+        w, loaded = help_wall_time()
+        walls.append(w * 1000.0)
+    bare = statistics.median(interpreter_wall_time() * 1000.0 for _ in range(args.runs))
+
+    imp_ms = statistics.median(imports)
+    wall_ms = statistics.median(walls)
+    print(f"import mycli.main (importtime):  {imp_ms:7.1f} ms  (presupuesto {args.import_budget_ms:.0f} ms)")
+    print(f"ohmycli -h (pared):         {wall_ms:7.1f} ms  (presupuesto {args.wall_budget_ms:.0f} ms)")
+    print(f"python -c pass (referencia): {bare:6.1f} ms")
+
+    failed = False
+    if imp_ms > args.import_budget_ms:
+        print("REGRESIÓN: el import de mycli supera el presupuesto.")
+        failed = True
+    if wall_ms > args.wall_budget_ms:
+        print("REGRESIÓN: `ohmycli -h` supera el presupuesto de tiempo de pared.")
+        failed = True
+    if loaded:
+        print("REGRESIÓN: `ohmycli -h` importó módulos que deberían cargarse bajo demanda: " + ", ".join(loaded))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# benchmarks/bench_suite.py
+"""
+Suite de benchmarks de los caminos calientes sobre datos sintéticos.
+
+Genera (synth_library.py) una biblioteca, un watched.json y carpetas de notas
+en un directorio temporal y mide, con la mediana de --repeat corridas:
+
+  detect_season_dirs         todos los Doctors, en frío y con LibraryIndex caliente
+  list_episodes_for_season   todas las temporadas, en frío y con índice caliente
+  list_with_watch_status     todas las temporadas contra un estado de --watched entradas
+  mark_watched               --marks marcas sueltas (journal) sobre ese estado
+  save_watch_state           snapshot completo del estado
+  notes_list[N]              `notes list` (_list) en frío (sin manifest) y caliente, por tamaño
+  cli_help / cli_notes_list  arranque del CLI en un proceso nuevo
+
+Los resultados (segundos) salen como JSON. Con un baseline guardado
+(--save-baseline) cada corrida se compara contra él y termina con código 1
+si algo quedó más lento que --threshold veces el baseline. Los tiempos
+dependen de la máquina: el baseline es local (no se versiona).
+
+Uso:
+    python benchmarks/bench_suite.py [--doctors 15] [--seasons 6] [--episodes 12] [--depth 0]
+        [--watched 100000] [--notes 10000 100000] [--output resultados.json]
+        [--baseline benchmarks/baseline.json] [--save-baseline] [--threshold 1.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SRC = HERE.parent / "src"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(HERE))
+
+from mycli import utils  # noqa: E402
+from mycli.library import LibraryIndex  # noqa: E402
+from mycli.commands.notes.notes import _list as notes_list  # noqa: E402
+from synth_library import build_library, build_notes, build_watched  # noqa: E402
+
+DEFAULT_BASELINE = HERE / "baseline.json"
+
+
+def median_time(fn, repeat: int, setup=None) -> float:
+    """Mediana de repeat corridas de fn(); setup() (sin cronometrar) antes de cada una."""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(arg) if setup else fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def cli_time(argv, env, repeat: int) -> float:
+    def run():
+        subprocess.run([sys.executable, "-m", "mycli", *argv], env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return median_time(run, repeat)
+
+
+def run_suite(args, tmp: Path) -> dict:
+    r = {}
+    lib = tmp / "lib"
+    seasons = build_library(lib, args.doctors, args.seasons, args.episodes, args.depth)
+    doctors = sorted({s.parent for s in seasons})
+    episodes = [e for s in seasons for e in utils.list_episodes_for_season(s)]
+
+    # --- escaneo ---
+    r["detect_season_dirs.cold"] = median_time(
+        lambda: [utils.detect_season_dirs(d, max_depth=2) for d in doctors], args.repeat)
+    warm = LibraryIndex()
+    for d in doctors:
+        utils.detect_season_dirs(d, max_depth=2, index=warm)
+    r["detect_season_dirs.warm"] = median_time(
+        lambda: [utils.detect_season_dirs(d, max_depth=2, index=warm) for d in doctors], args.repeat)
+    r["list_episodes_for_season.cold"] = median_time(
+        lambda: [utils.list_episodes_for_season(s) for s in seasons], args.repeat)
+    r["list_episodes_for_season.warm"] = median_time(
+        lambda: [utils.list_episodes_for_season(s, warm) for s in seasons], args.repeat)
+
+    # --- estado de vistos ---
+    state_path = build_watched(tmp / "state" / "watched.json", episodes, max(args.watched, len(episodes)))
+    state = utils.load_watch_state(str(state_path))
+    season_eps = [utils.list_episodes_for_season(s, warm) for s in seasons]
+    r["list_with_watch_status"] = median_time(
+        lambda: [utils.list_with_watch_status(eps, state) for eps in season_eps], args.repeat)
+    marks = episodes[:args.marks]
+    r["mark_watched"] = median_time(
+        lambda: [utils.mark_watched(str(e), state, str(state_path)) for e in marks], args.repeat)
+    r["save_watch_state"] = median_time(lambda: utils.save_watch_state(state, str(state_path)), args.repeat)
+
+    # --- notas ---
+    for n in args.notes:
+        notes_dir = build_notes(tmp / f"notes_{n}", n)
+        manifest = notes_dir.with_name(notes_dir.name + ".manifest.json")
+
+        def drop_manifest():
+            manifest.unlink(missing_ok=True)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            r[f"notes_list[{n}].cold"] = median_time(lambda _: notes_list(notes_dir), args.repeat, drop_manifest)
+            notes_list(notes_dir)
+            r[f"notes_list[{n}].warm"] = median_time(lambda: notes_list(notes_dir), args.repeat)
+
+    # --- arranque del CLI (proceso nuevo, HOME sintético con su config) ---
+    home = tmp / "home"
+    (home / ".ohmycli").mkdir(parents=True, exist_ok=True)
+    (home / ".ohmycli" / "config.json").write_text(json.dumps({
+        "who_classic_path": str(lib), "who_new_path": str(lib),
+        "notes_path": str(tmp / f"notes_{args.notes[0]}") if args.notes else str(tmp / "notes"),
+        "state_path": str(state_path),
+    }), encoding="utf-8")
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=str(SRC), OHMYCLI_NO_DAEMON="1")
+    r["cli_help"] = cli_time(["-h"], env, args.repeat)
+    r["cli_notes_list"] = cli_time(["notes", "list"], env, args.repeat)
+    return r
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """[(nombre, baseline, actual, razón)] de lo que empeoró más que threshold."""
+    worse = []
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base and now / base > threshold:
+            worse.append((name, base, now, now / base))
+    return worse
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--doctors", type=int, default=15)
+    ap.add_argument("--seasons", type=int, default=6)
+    ap.add_argument("--episodes", type=int, default=12)
+    ap.add_argument("--depth", type=int, choices=(0, 1), default=0, help="1 = episodios en 'Disco N' bajo la temporada")
+    ap.add_argument("--watched", type=int, default=100_000, help="Entradas del watched.json sintético")
+    ap.add_argument("--marks", type=int, default=50, help="Marcas sueltas para mark_watched")
+    ap.add_argument("--notes", type=int, nargs="*", default=[10_000], help="Tamaños de carpeta de notas (p. ej. 10000 100000 500000)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--output", help="Archivo JSON de resultados (default: stdout)")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    ap.add_argument("--save-baseline", action="store_true", help="Guardar esta corrida como baseline")
+    ap.add_argument("--threshold", type=float, default=1.25, help="Razón actual/baseline que cuenta como regresión")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_suite(args, Path(tmp))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: getattr(args, k) for k in ("doctors", "seasons", "episodes", "depth", "watched", "marks", "notes", "repeat")},
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(text + "\n", encoding="utf-8")
+        print(f"Baseline guardado en {baseline_path}", file=sys.stderr)
+        return 0
+    if not baseline_path.exists():
+        return 0
+    base = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if base.get("meta", {}).get("params") != report["meta"]["params"]:
+        print("Aviso: el baseline se tomó con otros parámetros; la comparación es orientativa.", file=sys.stderr)
+    worse = compare(results, base.get("results", {}), args.threshold)
+    for name, old, now, ratio in worse:
+        print(f"REGRESIÓN {name}: {old * 1000:.1f} ms -> {now * 1000:.1f} ms (x{ratio:.2f})", file=sys.stderr)
+    if not worse:
+        print(f"Sin regresiones frente a {baseline_path} (umbral x{args.threshold}).", file=sys.stderr)
+    return 1 if worse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
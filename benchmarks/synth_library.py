@@ -0,0 +1,117 @@
+# benchmarks/synth_library.py
+"""
+Generadores de datos sintéticos para los benchmarks.
+
+  - build_library: biblioteca de Doctor Who con N Doctors, temporadas y
+    episodios, con los estilos de nombre que reconocen extract_ordinal_from_name
+    ("Tercer Doctor", "The Tenth Doctor", "Doctor 11", "12th Doctor") y
+    looks_like_season_dir ("Temporada 2", "Season 03", "Doctor Who - S04"),
+    y opcionalmente una carpeta intermedia ("Disco 1") bajo cada temporada.
+  - build_watched: watched.json con N entradas (episodios reales + relleno).
+  - build_notes: carpeta de notas con N archivos de texto.
+
+Se puede usar suelto para dejar una biblioteca en disco:
+    python benchmarks/synth_library.py DESTINO [--doctors 12] [--seasons 4] [--episodes 10]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+SPANISH = ["Primer", "Segundo", "Tercer", "Cuarto", "Quinto", "Sexto", "Septimo", "Octavo",
+           "Noveno", "Decimo", "Undecimo", "Doceavo", "Treceavo", "Catorceavo", "Quinceavo"]
+ENGLISH = ["First", "Second", "Third", "Fourth", "Fifth", "Sixth", "Seventh", "Eighth",
+           "Ninth", "Tenth", "Eleventh", "Twelfth"]
+_SUFFIX = {1: "st", 2: "nd", 3: "rd"}
+
+DOCTOR_STYLES = ("spanish", "english", "number", "suffix")
+SEASON_STYLES = ("temporada", "season", "doctor-who")
+EPISODE_EXTS = (".mkv", ".mp4", ".avi")
+
+
+def doctor_name(n: int, style: str) -> str:
+    if style == "spanish" and n <= len(SPANISH):
+        return f"{SPANISH[n - 1]} Doctor"
+    if style == "english" and n <= len(ENGLISH):
+        return f"The {ENGLISH[n - 1]} Doctor"
+    if style == "suffix":
+        return f"{n}{_SUFFIX.get(n if n < 20 else n % 10, 'th')} Doctor"
+    return f"Doctor {n}"
+
+
+def season_name(n: int, style: str) -> str:
+    if style == "season":
+        return f"Season {n:02d}"
+    if style == "doctor-who":
+        return f"Doctor Who - S{n:02d}"
+    return f"Temporada {n}"
+
+
+def build_library(root: Path, doctors: int = 12, seasons: int = 4, episodes: int = 10,
+                  depth: int = 0, styles: List[str] = DOCTOR_STYLES) -> List[Path]:
+    """
+    Crea la biblioteca bajo root (archivos vacíos) y devuelve las carpetas de temporada.
+    depth=1 mete los episodios en "Disco N" dentro de cada temporada.
+    """
+    root = Path(root)
+    season_dirs = []
+    for d in range(1, doctors + 1):
+        doctor = root / doctor_name(d, styles[(d - 1) % len(styles)])
+        for s in range(1, seasons + 1):
+            season = doctor / season_name(s, SEASON_STYLES[(d + s) % len(SEASON_STYLES)])
+            season_dirs.append(season)
+            for e in range(1, episodes + 1):
+                where = season / f"Disco {(e - 1) // 4 + 1}" if depth else season
+                where.mkdir(parents=True, exist_ok=True)
+                (where / f"S{s:02d}E{e:02d}{EPISODE_EXTS[e % len(EPISODE_EXTS)]}").touch()
+    return season_dirs
+
+
+def build_watched(path: Path, episodes: List[Path], total: int, watched_ratio: float = 0.5, seed: int = 1) -> Path:
+    """watched.json con total entradas: los episodios dados (resueltos) y rutas de relleno."""
+    rnd = random.Random(seed)
+    ts = datetime(2024, 1, 1).isoformat()
+    keys = [str(Path(e).resolve()) for e in episodes[:total]]
+    filler = Path(path).parent / "otra-biblioteca"
+    keys += [str(filler / f"Doctor {i % 15}" / f"Temporada {i % 7}" / f"E{i:07d}.mkv") for i in range(total - len(keys))]
+    state = {k: {"watched": rnd.random() < watched_ratio, "ts": ts} for k in keys}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+    return path
+
+
+def build_notes(notes_dir: Path, count: int, seed: int = 1) -> Path:
+    """count notas cortas (nota_0000001.txt ...) con mtimes repartidos en un año."""
+    rnd = random.Random(seed)
+    notes_dir = Path(notes_dir)
+    notes_dir.mkdir(parents=True, exist_ok=True)
+    base = datetime(2024, 1, 1).timestamp()
+    words = ["doctor", "tardis", "dalek", "regeneracion", "temporada", "episodio", "companion", "gallifrey"]
+    for i in range(count):
+        p = notes_dir / f"nota_{i:07d}.txt"
+        p.write_text(f"Nota {i}: {' '.join(rnd.choices(words, k=8))}\n", encoding="utf-8")
+        t = base + rnd.random() * 365 * 86400
+        os.utime(p, (t, t))
+    return notes_dir
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("dest")
+    ap.add_argument("--doctors", type=int, default=12)
+    ap.add_argument("--seasons", type=int, default=4)
+    ap.add_argument("--episodes", type=int, default=10)
+    ap.add_argument("--depth", type=int, choices=(0, 1), default=0)
+    args = ap.parse_args(argv)
+    seasons = build_library(Path(args.dest), args.doctors, args.seasons, args.episodes, args.depth)
+    print(f"{len(seasons)} temporadas en {args.dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
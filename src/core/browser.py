@@ -0,0 +1,338 @@
+# src/core/browser.py
+"""
+Navegación interactiva y consultas sobre las colecciones del Catalog.
+
+who-old y who-new (y el comando catalog) son la misma interfaz sobre una
+colección distinta: aquí viven el menú de Doctores/temporadas, el menú de
+episodios y el despacho a las consultas no interactivas.
+"""
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from mycli.utils import (
+    list_episodes_for_season,
+    doctor_episodes,
+    detect_season_dirs,
+    season_dirs_in,
+    prompt_choice,
+    watched_counts,
+    progress_label,
+    WatchSession,
+)
+from mycli import query
+from mycli.library import LibraryIndex, library_index_path
+from mycli.media_probe import ProbeCache, describe, format_duration, probe_cache_path
+from mycli.player import PlayerSession, player_session
+from mycli.playlist import playlist_path, write_m3u
+from mycli.watcher import attach_watcher, detach_watcher
+
+from .catalog import BUILTIN_COLLECTIONS, Catalog
+
+
+def run_collection(name: str, args, cfg: dict) -> None:
+    """Punto de entrada de who-old / who-new: navegación o list/status sobre la colección name."""
+    index = LibraryIndex.load(library_index_path(cfg))
+    catalog = Catalog.from_config(cfg, index)
+    col = catalog.get(name)
+    if col is None:
+        print(f"Error: {BUILTIN_COLLECTIONS.get(name, (name,))[0]} no configurado en la config.")
+        return
+    if not col.root.exists():
+        print(f"La ruta configurada no existe: {col.root}")
+        return
+
+    # índice persistente: en caliente solo se comparan mtimes de carpetas
+    try:
+        if getattr(args, 'who_cmd', None):
+            query.run_query(args, cfg, catalog.doctors(name), index)
+        else:
+            browse(catalog, name, cfg)
+    finally:
+        index.save()
+
+
+def browse(catalog: Catalog, name: str, cfg: dict, session: Optional[WatchSession] = None) -> None:
+    # con library_watcher, lo que aparezca en disco durante la sesión se aplica al índice
+    attach_watcher(catalog.index, cfg.get("library_watcher"))
+    # un reproductor para toda la navegación (con player_mode "ipc", un solo proceso)
+    player = player_session(cfg)
+    try:
+        _browse(catalog, name, cfg, session, player)
+    finally:
+        player.close()
+        detach_watcher(catalog.index)
+
+
+def _browse(catalog: Catalog, name: str, cfg: dict, session: Optional[WatchSession] = None,
+            player: Optional[PlayerSession] = None) -> None:
+    index = catalog.index
+    workers = catalog.workers
+    if player is None:
+        player = player_session(cfg)
+    state_path = cfg.get("state_path")
+    backend = cfg.get("state_backend")
+    if session is None:
+        session = WatchSession(state_path, backend, cfg.get("watch_key"))
+    # metadatos de episodios (duración/resolución): un caché para toda la navegación
+    probes = ProbeCache.load(probe_cache_path(cfg))
+    doctor_dirs = catalog.doctors(name)
+    if not doctor_dirs:
+        print("No se detectaron carpetas de 'Doctor' en la ruta configurada.")
+        return
+
+    # --- Bucle principal: seleccionar doctor, volver aquí al pulsar 'q' en submenús ---
+    while True:
+        # cambios vistos por el watcher desde la última vuelta (Doctors nuevos incluidos)
+        if catalog.sync():
+            doctor_dirs = catalog.doctors(name) or doctor_dirs
+        # mostrar lista de Doctors (nombre y progreso; el total sale del índice, sin tocar el disco)
+        print("\nDoctores / grupos encontrados:")
+        seen = watched_counts([p for p, _, _ in doctor_dirs], state=session.refresh(), path=state_path, backend=backend)
+        for i, (p, disp, ordv) in enumerate(doctor_dirs, 1):
+            print(f"[{i}] {disp}  ({progress_label(seen[str(p)], index.cached_media_count(p, 2))})")
+
+        idx = prompt_choice(len(doctor_dirs), "Selecciona Doctor (q para salir)")
+        if idx is None:
+            # el usuario quiere salir del subcomando -> retornamos al main
+            print(f"Saliendo de {name}.")
+            return
+
+        selected_doctor = doctor_dirs[idx][0]
+
+        # dentro del Doctor: temporadas (subcarpetas) y archivos directos, en un solo recorrido
+        seasons, media_here = season_dirs_in(selected_doctor, index, workers)
+
+        # si hay temporadas, pedir seleccionar temporada; si no, usar media directos
+        if seasons:
+            print("\nTemporadas / carpetas internas:")
+            seen = watched_counts(seasons + [selected_doctor], state=session.refresh(), path=state_path, backend=backend)
+            for i, s in enumerate(seasons, 1):
+                print(f"[{i}] {s.name}  ({progress_label(seen[str(s)], index.cached_media_count(s, 1))})")
+            # última opción: el Doctor completo (todas las temporadas en un menú, para play-all)
+            print(f"[{len(seasons) + 1}] Todas las temporadas  ({progress_label(seen[str(selected_doctor)], index.cached_media_count(selected_doctor, 2))})")
+            sidx = prompt_choice(len(seasons) + 1, "Selecciona temporada/carpeta (q para volver)")
+            if sidx is None:
+                # volver al listado de doctors
+                continue
+            if sidx == len(seasons):
+                season_path = selected_doctor
+                episodes = doctor_episodes(seasons, index, workers)
+                refresher = _seasons_refresher(catalog, seasons)
+            else:
+                season_path = seasons[sidx]
+                episodes = list_episodes_for_season(season_path, index, workers)
+                refresher = _season_refresher(catalog, season_path)
+            if not episodes:
+                print("No se encontraron episodios en", season_path)
+                # volver al listado de seasons/doctors
+                continue
+
+            # Llamada al menú interactivo (reproduce + marcar vistos)
+            episode_menu_and_play(episodes, season_path, player, cfg, session, probes, refresh=refresher)
+            # al volver del menú de episodios, permanecemos en el doctor seleccionado (o volvemos a doctor list)
+            continue
+
+        # si no hay temporadas pero sí archivos multimedia directos en la carpeta del Doctor
+        if media_here:
+            # usar el mismo menú interactivo, pasándole la carpeta del Doctor como 'season_path'
+            episode_menu_and_play(media_here, selected_doctor, player, cfg, session, probes,
+                                  refresh=_doctor_media_refresher(catalog, selected_doctor))
+            # al volver del menú de episodios regresamos al listado de doctors
+            continue
+
+        # fallback: buscar temporadas más abajo
+        candidates = detect_season_dirs(selected_doctor, max_depth=2, index=index, workers=workers)
+        if not candidates:
+            print("No se encontraron episodios ni temporadas bajo", selected_doctor)
+            # volver al listado de doctors
+            continue
+
+        print("\nTemporadas candidatas detectadas:")
+        for i, (p, disp, score) in enumerate(candidates, 1):
+            print(f"[{i}] {disp}  score={score}")
+        cidx = prompt_choice(len(candidates), "Selecciona temporada (q para volver)")
+        if cidx is None:
+            continue
+        season_path = candidates[cidx][0]
+        episodes = list_episodes_for_season(season_path, index, workers)
+        if not episodes:
+            print("No se encontraron episodios en", season_path)
+            continue
+        # usar menú interactivo
+        episode_menu_and_play(episodes, season_path, player, cfg, session, probes,
+                              refresh=_season_refresher(catalog, season_path))
+        # volver al listado de doctors
+        continue
+
+
+def _season_refresher(catalog: Catalog, season_path: Path) -> Optional[Callable[[], Optional[list]]]:
+    """Con watcher: función que devuelve los episodios de la temporada si algo cambió (None si no)."""
+    if catalog.index.watcher is None:
+        return None
+    def refresh():
+        if catalog.sync():
+            return list_episodes_for_season(season_path, catalog.index, catalog.workers)
+        return None
+    return refresh
+
+
+def _seasons_refresher(catalog: Catalog, season_paths: list) -> Optional[Callable[[], Optional[list]]]:
+    """Como _season_refresher, para el menú de un Doctor completo."""
+    if catalog.index.watcher is None:
+        return None
+    def refresh():
+        if catalog.sync():
+            return doctor_episodes(season_paths, catalog.index, catalog.workers)
+        return None
+    return refresh
+
+
+def _doctor_media_refresher(catalog: Catalog, doctor_path: Path) -> Optional[Callable[[], Optional[list]]]:
+    if catalog.index.watcher is None:
+        return None
+    def refresh():
+        if catalog.sync():
+            return catalog.index.media_files(doctor_path)
+        return None
+    return refresh
+
+
+def episode_menu_and_play(episodes: list, season_path: Path, player: Union[str, PlayerSession, None], cfg: dict,
+                          session: Optional[WatchSession] = None, probes: Optional[ProbeCache] = None,
+                          refresh: Optional[Callable[[], Optional[list]]] = None):
+    """
+    Muestra la lista de episodios con estado y permite:
+      - reproducir (p. ej. 'p 3')
+      - marcar visto 'm 3'
+      - desmarcar 'u 3'
+      - marcar todos 'ma'
+      - desmarcar todos 'ua'
+      - reproducir de corrido los no vistos 'pa' (play-all) o desde uno 'pf 3' (play-from)
+      - volver 'q'
+    refresh (opcional) devuelve la lista de episodios actualizada si cambió en disco.
+    player es un PlayerSession o, como antes, el comando del reproductor (o None).
+    """
+    if not isinstance(player, PlayerSession):
+        player = PlayerSession(player, cfg.get("player_mode") or "spawn")
+    if session is None:
+        # state_path puede ser None -> usa default; backend "json" (default) o "sqlite"
+        session = WatchSession(cfg.get("state_path"), cfg.get("state_backend"), cfg.get("watch_key"))
+    if probes is None:
+        probes = ProbeCache.load(probe_cache_path(cfg))
+
+    def describe_all(episodes):
+        # cabeceras leídas una vez por visita; en visitas repetidas todo sale del caché
+        infos = probes.probe_many(episodes)
+        probes.save()
+        known = [i.duration for i in infos.values() if i is not None and i.duration]
+        total = f" (total {format_duration(sum(known))})" if known else ""
+        return total, [describe(infos.get(str(ep))) for ep in episodes]
+
+    total, labels = describe_all(episodes)
+    while True:
+        if refresh is not None:
+            updated = refresh()
+            if updated is not None:
+                # el watcher informó cambios: los ids de archivo se vuelven a tomar
+                session.invalidate()
+                if updated != episodes:
+                    episodes = updated
+                    total, labels = describe_all(episodes)
+        # estado en memoria: solo se relee si otro proceso cambió el archivo
+        session.refresh()
+        with_status = session.status(episodes)
+        print(f"\nEpisodios{total}:")
+        for i, (ep, watched) in enumerate(with_status, 1):
+            mark = "✓" if watched else " "
+            try:
+                disp = str(Path(ep).relative_to(season_path))
+            except Exception:
+                disp = Path(ep).name
+            info = labels[i - 1]
+            print(f"[{i}] [{mark}] {disp}" + (f"  [{info}]" if info else ""))
+
+        print("\nComandos: p # (play), m # (marcar visto), u # (desmarcar), ma (marcar todos), ua (desmarcar todos),"
+              " pa (play-all: no vistos), pf # (play-from #), q (volver)")
+        cmd = input(">").strip().lower()
+        if not cmd:
+            continue
+        if cmd == 'q':
+            return
+        if cmd == 'ma':
+            session.set_watched(episodes, True)
+            print("Marcado todo como visto.")
+            continue
+        if cmd == 'ua':
+            session.set_watched(episodes, False)
+            print("Desmarcado todo.")
+            continue
+        if cmd in ('pa', 'play-all'):
+            _play_pending(with_status, 0, player, session, probes)
+            continue
+
+        parts = cmd.split()
+        if len(parts) == 2 and parts[0] in ('p','m','u','pf','play-from'):
+            action, num = parts[0], parts[1]
+            if not num.isdigit():
+                print("Número inválido.")
+                continue
+            idx = int(num) - 1
+            if idx < 0 or idx >= len(episodes):
+                print("Índice fuera de rango.")
+                continue
+            ep = episodes[idx]
+            epstr = str(ep)
+            if action == 'p':
+                # reproducir (con IPC: loadfile sobre el reproductor ya abierto)
+                player.play(epstr)
+            elif action == 'm':
+                session.set_watched([ep], True)
+                print("Marcado como visto.")
+            elif action == 'u':
+                session.set_watched([ep], False)
+                print("Desmarcado.")
+            else:
+                _play_pending(with_status, idx, player, session, probes)
+            continue
+        print("Comando desconocido.")
+
+
+def _play_pending(with_status: list, start: int, player: PlayerSession, session: WatchSession, probes: ProbeCache) -> None:
+    """
+    Reproduce de corrido los episodios no vistos desde start (una lista M3U, un solo
+    lanzamiento) y marca los terminados al final, con una sola escritura del estado.
+    """
+    pending = [ep for ep, watched in with_status[start:] if not watched]
+    if not pending:
+        print("No quedan episodios sin ver.")
+        return
+    infos = probes.probe_many(pending)
+    m3u = write_m3u(playlist_path(), pending, {k: i.duration for k, i in infos.items() if i is not None and i.duration})
+    print(f"Reproduciendo {len(pending)} episodios ({m3u}).")
+    if player.mode == "ipc":
+        print("Al terminar la lista (o con Ctrl-C) se marcan los episodios vistos completos.")
+    finished = player.play_list(pending, m3u)
+    if finished is None:
+        finished = _ask_finished(pending)
+    if finished:
+        session.set_watched(finished, True)
+    print(f"Marcados como vistos: {len(finished)} de {len(pending)}.")
+
+
+def _ask_finished(pending: list) -> list:
+    """
+    Sin IPC no se sabe hasta dónde se vio: se pregunta (los primeros N de la lista).
+    Enter no marca nada; marcar todos requiere escribir el número del último.
+    """
+    for i, ep in enumerate(pending, 1):
+        print(f"[{i}] {Path(ep).name}")
+    while True:
+        s = input(f"¿Hasta cuál viste? [1-{len(pending)}] (Enter o 0 = ninguno): ").strip()
+        if not s:
+            return []
+        if s.isdigit() and int(s) <= len(pending):
+            return list(pending[:int(s)])
+        print("Número inválido.")
+
+
+__all__ = ["run_collection", "browse", "episode_menu_and_play"]
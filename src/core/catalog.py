@@ -0,0 +1,192 @@
+# src/core/catalog.py
+"""
+Catálogo de colecciones de la biblioteca (who-old, who-new y raíces extra).
+
+Una colección es una raíz con su vocabulario de ordinales. Las colecciones
+salen de la config: who_classic_path -> "who-old", who_new_path -> "who-new"
+y cada entrada de "collections" en config.json. El Catalog comparte un único
+LibraryIndex entre todas, escanea varias raíces a la vez (un hilo por
+colección, cada una con sus scan_workers) y guarda en memoria las carpetas de
+Doctor detectadas, así que escanear las dos raíces cuesta lo que la más grande.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from mycli.classify import OrdinalVocab, classify_names, _norm_name
+from mycli.library import LibraryIndex
+from mycli.timing import traced
+from mycli.utils import walk_tree
+
+# --- vocabularios de ordinales ---
+CLASSIC_ORDINAL_WORDS = {
+    "primer": 1, "primero": 1, "primera": 1,
+    "segundo": 2, "segunda": 2,
+    "tercer": 3, "tercero": 3, "tercera": 3,
+    "cuarto": 4, "cuarta": 4,
+    "quinto": 5, "quinta": 5,
+    "sexto": 6, "sexta": 6,
+    "septimo": 7, "septima": 7, "séptimo": 7, "séptima": 7,
+    "octavo": 8, "octava": 8,
+    #solo llega hasta el Octavo Dr
+}
+
+CLASSIC_ENGLISH_ORDINALS = {
+    "first":1,"second":2,"third":3,"fourth":4,"fifth":5,"sixth":6,
+    "seventh":7,"eighth":8
+}
+
+ORDINAL_WORDS = dict(CLASSIC_ORDINAL_WORDS, **{
+    "noveno": 9, "novena": 9,
+    "decimo": 10, "décimo": 10, "décima": 10,
+    "undecimo": 11, "once": 11, "onceavo": 11,
+    "doceavo": 12, "doce": 12,
+    "treceavo": 13, "trece": 13,
+    "catorceavo": 14, "catorce": 14,
+    "quinceavo": 15, "quince": 15,
+})
+
+ENGLISH_ORDINALS = dict(CLASSIC_ENGLISH_ORDINALS, **{
+    "ninth":9,"tenth":10,"eleventh":11,"twelfth":12
+})
+
+CLASSIC_VOCAB = OrdinalVocab(CLASSIC_ORDINAL_WORDS, CLASSIC_ENGLISH_ORDINALS)
+NEW_VOCAB = OrdinalVocab(ORDINAL_WORDS, ENGLISH_ORDINALS)
+
+# colecciones fijas: nombre -> (clave de config, vocabulario)
+BUILTIN_COLLECTIONS = {
+    "who-old": ("who_classic_path", CLASSIC_VOCAB),
+    "who-new": ("who_new_path", NEW_VOCAB),
+}
+
+NO_ORDINAL = 10**6
+
+
+class Collection(NamedTuple):
+    name: str
+    root: Path
+    vocab: OrdinalVocab
+    source: str  # de dónde sale la ruta (para mensajes de error)
+
+
+def collections_from_config(cfg: Dict[str, Any]) -> List[Collection]:
+    """
+    Colecciones configuradas: las fijas (si su clave tiene valor) y las de "collections",
+    que puede ser {nombre: ruta} o [{"name": ..., "path": ...}]. Las extra usan el
+    vocabulario completo de ordinales.
+    """
+    out = []
+    for name, (key, vocab) in BUILTIN_COLLECTIONS.items():
+        if cfg.get(key):
+            out.append(Collection(name, Path(cfg[key]), vocab, key))
+    extra = cfg.get("collections") or {}
+    if isinstance(extra, list):
+        extra = {e.get("name"): e.get("path") for e in extra if isinstance(e, dict)}
+    for name, path in extra.items():
+        if name and path and name not in BUILTIN_COLLECTIONS:
+            out.append(Collection(str(name), Path(path).expanduser(), NEW_VOCAB, f"collections.{name}"))
+    return out
+
+
+@traced("catalog.find_doctor_dirs")
+def find_doctor_dirs(base_path: Path, index: LibraryIndex, vocab: OrdinalVocab, workers: int = 1) -> list:
+    """(path, nombre, ordinal) de las carpetas de Doctor, ordenadas por ordinal y nombre."""
+    def doctors_in(parent: Path, names: list) -> list:
+        # clasificación del listado completo de una vez
+        return [(parent / info.name, info.name, info.ordinal if info.ordinal is not None else NO_ORDINAL)
+                for info in classify_names(names, vocab) if info.is_doctor]
+
+    # detectar hijos directos que parezcan "Doctor X" (solo se lista la raíz)
+    children = index.listing(base_path)[0]
+    doctor_dirs = doctors_in(base_path, children)
+
+    # si no hay en nivel 1, buscar un nivel más (un listado por hijo)
+    if not doctor_dirs:
+        tree = walk_tree(base_path, 1, index, workers)
+        for c in children:
+            doctor_dirs.extend(doctors_in(base_path / c, tree.get(base_path / c, ([], []))[0]))
+
+    # ordenar por ordinal (None -> grande) y luego por nombre
+    doctor_dirs.sort(key=lambda t: (t[2], _norm_name(t[1])))
+    return doctor_dirs
+
+
+class Catalog:
+    """Escaneo compartido de varias colecciones sobre un mismo LibraryIndex."""
+
+    def __init__(self, collections: Iterable[Collection], index: LibraryIndex, workers: int = 1):
+        self.collections: Dict[str, Collection] = {c.name: c for c in collections}
+        self.index = index
+        self.workers = workers
+        # nombre -> carpetas de Doctor ya detectadas en este proceso
+        self._doctors: Dict[str, list] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any], index: LibraryIndex) -> "Catalog":
+        return cls(collections_from_config(cfg), index, cfg.get("scan_workers", 1))
+
+    def get(self, name: str) -> Optional[Collection]:
+        return self.collections.get(name)
+
+    def _scan_one(self, name: str, depth: int) -> list:
+        col = self.collections[name]
+        doctors = self._doctors.get(name)
+        if doctors is None:
+            doctors = find_doctor_dirs(col.root, self.index, col.vocab, self.workers)
+            self._doctors[name] = doctors
+        # precargar en el índice depth niveles por debajo de cada Doctor
+        if depth > 0:
+            for p, _, _ in doctors:
+                walk_tree(p, depth, self.index, self.workers)
+        return doctors
+
+    @traced("Catalog.scan")
+    def scan(self, names: Optional[Iterable[str]] = None, depth: int = 0) -> Dict[str, list]:
+        """
+        Detecta los Doctors de las colecciones names (todas por defecto) con un hilo por
+        colección; con depth > 0 además deja listadas sus carpetas hasta esa profundidad.
+        Las raíces que no existen se omiten. Retorna {nombre: carpetas de Doctor}.
+        """
+        names = [n for n in (self.collections if names is None else names)
+                 if n in self.collections and self.collections[n].root.exists()]
+        if len(names) <= 1:
+            return {n: self._scan_one(n, depth) for n in names}
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            return dict(zip(names, pool.map(lambda n: self._scan_one(n, depth), names)))
+
+    def doctors(self, name: str) -> list:
+        """Carpetas de Doctor de una colección (escanea solo la primera vez)."""
+        return self.scan([name]).get(name, [])
+
+    def sync(self) -> set:
+        """
+        Aplica los cambios del watcher del índice (si hay uno) y descarta los Doctors
+        detectados de las colecciones cuya raíz o carpetas de primer nivel cambiaron.
+        Devuelve las carpetas cambiadas.
+        """
+        watcher = self.index.watcher
+        if watcher is None:
+            return set()
+        changed = watcher.poll()
+        if changed:
+            for name, col in self.collections.items():
+                root = str(col.root)
+                if any(c == root or os.path.dirname(c) == root for c in changed):
+                    self._doctors.pop(name, None)
+        return changed
+
+
+__all__ = [
+    "CLASSIC_ORDINAL_WORDS",
+    "CLASSIC_ENGLISH_ORDINALS",
+    "ORDINAL_WORDS",
+    "ENGLISH_ORDINALS",
+    "CLASSIC_VOCAB",
+    "NEW_VOCAB",
+    "BUILTIN_COLLECTIONS",
+    "Collection",
+    "collections_from_config",
+    "find_doctor_dirs",
+    "Catalog",
+]
@@ -1,5 +1,12 @@
 # src/mycli/__init__.py
 """Paquete mycli"""
-from .main import main
 
 __all__ = ["main"]
+
+
+def __getattr__(name):
+    # main se importa al pedirlo: el cliente del daemon (__main__.py) no carga la CLI completa
+    if name == "main":
+        from .main import main
+        return main
+    raise AttributeError(f"module 'mycli' has no attribute {name!r}")
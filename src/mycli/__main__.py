@@ -1,6 +1,55 @@
 # src/mycli/__main__.py
-from .main import main
+"""
+Punto de entrada de ohmycli.
+
+Las consultas no interactivas se reenvían al daemon si hay uno corriendo
+(`ohmycli daemon start`); así no se paga importar comandos, cargar la config
+ni escanear la biblioteca en cada llamada. Sin daemon (o con
+OHMYCLI_NO_DAEMON=1) todo corre en este proceso, como siempre; también con
+--timings/--profile, que miden este proceso.
+"""
+import os
+import sys
+
+# comando -> subcomandos que el daemon puede atender (sin menús, sin stdin)
+DAEMON_QUERIES = {
+    "who-old": ("list", "status"),
+    "who-new": ("list", "status"),
+    "catalog": ("list", "status"),
+    "notes": ("list", "search", "view"),
+}
+# opciones globales que consumen un valor
+_VALUE_OPTS = ("--config", "--player", "--profile")
+
+
+def _daemon_eligible(argv) -> bool:
+    if os.environ.get("OHMYCLI_NO_DAEMON"):
+        return False
+    words = []
+    skip = False
+    for tok in argv:
+        if skip:
+            skip = False
+        elif tok in _VALUE_OPTS:
+            skip = True
+        elif tok in ("-h", "--help", "--pager", "--timings", "--profile", "--profile-memory"):
+            return False
+        elif not tok.startswith("-"):
+            words.append(tok)
+    return len(words) >= 2 and words[1] in DAEMON_QUERIES.get(words[0], ())
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if _daemon_eligible(argv):
+        from .daemon import forward
+        code = forward(argv)
+        if code is not None:
+            return code
+    from .main import main as run
+    return run(argv)
+
 
 if __name__ == "__main__":
-    import sys
-    main(sys.argv[1:])
+    sys.exit(main(sys.argv[1:]))
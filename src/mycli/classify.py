@@ -0,0 +1,119 @@
+# src/mycli/classify.py
+"""
+Clasificación de nombres de carpetas (Doctor / temporada / ordinal).
+
+Todas las expresiones se compilan una vez: cada vocabulario (ordinales en
+español e inglés, palabras de temporada) es una sola alternancia, y
+_norm_name se memoiza porque los mismos nombres se clasifican muchas veces.
+classify_names procesa un listado completo de una vez.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+@lru_cache(maxsize=16384)
+def _norm_name(s: str) -> str:
+    """Normaliza string: unicode -> ascii, minusculas, quitar puntos/guiones, multiples espacios."""
+    if not s:
+        return ""
+    s = unicodedata.normalize("NFKD", s)
+    s = s.encode("ascii", "ignore").decode("ascii")
+    s = s.replace('.', ' ').replace('_', ' ').replace('-', ' ')
+    s = re.sub(r'\s+', ' ', s).strip().lower()
+    return s
+
+
+def _words_re(words: Iterable[str]) -> "re.Pattern":
+    # más largas primero por claridad; \b a ambos lados hace que solo case la palabra completa
+    alts = sorted({re.escape(w) for w in words}, key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(alts) + r')\b')
+
+
+# --- temporada ---
+_NUMBER_HINT_RE = re.compile(r'\b\d+\b|\b(?:decimo|tenth|10mo|10º|10th)\b')
+_SEASON_CTX_RE = re.compile(r'\b(?:season|temporada|temporad)\b')
+_SEASON_RE = re.compile(r'\b(?:season|temporada)\b')
+_ORDINAL_HINT_RE = re.compile(r'\b(?:primer|segund[ao]|tercer|cuart[ao]|quint[ao]|sext[ao]|septim[ao]|octav[ao]|noven[ao]|decim[ao])\b')
+
+# --- Doctor ---
+_DOCTOR_NAME_RE = re.compile(r'doctor|who|dr |\bdr\b')
+
+# --- ordinales numéricos ---
+_NUMBER_RE = re.compile(r'\b(\d{1,3})\b')
+_NUMBER_SUFFIX_RE = re.compile(r'\b(\d{1,3})(?:mo|º|th|st|nd|rd)\b')
+
+
+def looks_like_season_dir(name: str) -> bool:
+    """Detecta si un nombre sugiere temporada/doctor/volumen."""
+    n = _norm_name(name)
+    # si contiene 'doctor' o 'who' y además alguna pista numérica, de temporada u ordinal, es muy probable
+    if 'doctor' in n or 'who' in n or 'dr' in n:
+        if _NUMBER_HINT_RE.search(n) or _SEASON_CTX_RE.search(n) or _ORDINAL_HINT_RE.search(n):
+            return True
+    # fallback: si contiene 'season' o 'temporada' aunque no tenga doctor
+    return bool(_SEASON_RE.search(n))
+
+
+def is_doctor_dir(name: str) -> bool:
+    return bool(_DOCTOR_NAME_RE.search(_norm_name(name)))
+
+
+class OrdinalVocab:
+    """
+    Vocabulario de ordinales (español + inglés) compilado en una alternancia por idioma.
+    Si un nombre contiene varias palabras gana la que aparece antes en el dict,
+    igual que el recorrido palabra por palabra original.
+    """
+
+    def __init__(self, words: Dict[str, int], english: Dict[str, int]):
+        self._groups = []
+        for vocab in (words, english):
+            rank = {}
+            for i, w in enumerate(vocab):
+                rank.setdefault(w, (i, vocab[w]))
+            self._groups.append((_words_re(vocab), rank))
+
+    def extract(self, name: str) -> Optional[int]:
+        n = _norm_name(name)
+        # números explícitos
+        m = _NUMBER_RE.search(n)
+        if m:
+            return int(m.group(1))
+        # sufijos ordinales
+        m2 = _NUMBER_SUFFIX_RE.search(n)
+        if m2:
+            return int(m2.group(1))
+        # palabras ordinales (español y luego inglés)
+        for regex, rank in self._groups:
+            hits = [rank[m.group(0)] for m in regex.finditer(n)]
+            if hits:
+                return min(hits)[1]
+        return None
+
+
+class NameInfo(NamedTuple):
+    name: str
+    is_doctor: bool
+    is_season: bool
+    ordinal: Optional[int]
+
+
+def classify_names(names: Iterable[str], vocab: Optional[OrdinalVocab] = None) -> List[NameInfo]:
+    """Clasifica un listado completo; el ordinal solo se calcula para carpetas de Doctor."""
+    out = []
+    for name in names:
+        doc = is_doctor_dir(name)
+        out.append(NameInfo(name, doc, looks_like_season_dir(name), vocab.extract(name) if (doc and vocab) else None))
+    return out
+
+
+__all__ = [
+    "_norm_name",
+    "looks_like_season_dir",
+    "is_doctor_dir",
+    "OrdinalVocab",
+    "NameInfo",
+    "classify_names",
+]
@@ -1,9 +1,10 @@
 # src/mycli/commands/__init__.py
 """
-Paquete de comandos. Importamos los módulos concretos para que el
-paquete exponga `who_old`, `who_new` y `notes` cuando se haga:
+Paquete de comandos. Los módulos concretos (who_old, who_new, notes) no se
+importan aquí: main.py los carga bajo demanda con load_command(), así
+`ohmycli -h` o `ohmycli notes list` no pagan el import de los demás.
+Se siguen pudiendo importar explícitamente:
 from mycli.commands import who_old, who_new, notes
 """
-from . import who_old, who_new, notes
 
 __all__ = ["who_old", "who_new", "notes"]
@@ -0,0 +1,4 @@
+# src/mycli/commands/catalog/__init__.py
+from .catalog import register_parser, run
+
+__all__ = ["register_parser", "run"]
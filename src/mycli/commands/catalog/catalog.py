@@ -0,0 +1,47 @@
+# src/mycli/commands/catalog/catalog.py
+from mycli import query
+from mycli.utils import prompt_choice, WatchSession
+from mycli.library import LibraryIndex, library_index_path
+from core.catalog import Catalog
+from core.browser import browse
+
+# profundidad precargada bajo cada Doctor para list/status (temporadas y subcarpetas)
+PREFETCH_DEPTH = 2
+
+def register_parser(subparsers):
+    cat_p = subparsers.add_parser('catalog', help='Todas las colecciones configuradas')
+    # mismos list/status que who-old / who-new, sobre todas las colecciones
+    query.register_query_parser(cat_p)
+
+def run(args, cfg):
+    index = LibraryIndex.load(library_index_path(cfg))
+    catalog = Catalog.from_config(cfg, index)
+    try:
+        if getattr(args, 'who_cmd', None):
+            _query(args, cfg, catalog)
+        else:
+            _choose(catalog, cfg)
+    finally:
+        index.save()
+
+def _query(args, cfg, catalog: Catalog):
+    # todas las raíces se escanean a la vez; después los registros salen del índice ya cargado
+    depth = 0 if query.query_kind(args) == 'doctors' else PREFETCH_DEPTH
+    query.run_collections_query(args, cfg, catalog.scan(depth=depth), catalog.index)
+
+def _choose(catalog: Catalog, cfg):
+    found = catalog.scan()
+    names = list(found)
+    if not names:
+        print("No hay colecciones configuradas con rutas existentes.")
+        return
+    session = WatchSession(cfg.get("state_path"), cfg.get("state_backend"), cfg.get("watch_key"))
+    while True:
+        print("\nColecciones:")
+        for i, name in enumerate(names, 1):
+            print(f"[{i}] {name}  ({len(found[name])} doctores)  {catalog.get(name).root}")
+        idx = prompt_choice(len(names), "Selecciona colección (q para salir)")
+        if idx is None:
+            print("Saliendo de catalog.")
+            return
+        browse(catalog, names[idx], cfg, session)
@@ -0,0 +1,4 @@
+# src/mycli/commands/daemon/__init__.py
+from .daemon import register_parser, run
+
+__all__ = ["register_parser", "run"]
@@ -0,0 +1,84 @@
+# src/mycli/commands/daemon/daemon.py
+import os
+import subprocess
+import sys
+import time
+
+from mycli import daemon
+from mycli.watcher import WATCHER_MODES
+
+# cuánto esperar a que un daemon recién lanzado abra su socket
+START_TIMEOUT = 5.0
+
+def register_parser(subparsers):
+    d_p = subparsers.add_parser('daemon', help='Proceso residente para respuestas instantáneas')
+    d_sub = d_p.add_subparsers(dest='daemon_cmd')
+    for name in ('start', 'run'):
+        p = d_sub.add_parser(name, help='Lanzar en segundo plano' if name == 'start' else 'Correr en primer plano')
+        p.add_argument('--watch', choices=WATCHER_MODES, default='auto',
+                       help='Vigilancia de la biblioteca residente (default auto)')
+    d_sub.add_parser('stop', help='Detener el daemon')
+    d_sub.add_parser('status', help='¿Hay un daemon escuchando?')
+
+def _ping():
+    """PID del daemon (como texto) o None si no responde."""
+    class _Sink:
+        data = b""
+        def write(self, b):
+            self.data += b
+        def flush(self):
+            pass
+    out = _Sink()
+    code = daemon.request({"op": "ping"}, out=out, err=out)
+    return out.data.decode().strip() if code == 0 else None
+
+def run(args, cfg):
+    cmd = getattr(args, 'daemon_cmd', None) or 'status'
+    path = daemon.socket_path()
+
+    if cmd == 'run':
+        try:
+            # --config/--player del daemon se aplican a cada pedido reenviado
+            daemon.serve(path, args.watch, _global_args(args))
+        except RuntimeError as ex:
+            print(ex)
+        return
+
+    if cmd == 'start':
+        pid = _ping()
+        if pid:
+            print(f"El daemon ya está corriendo (pid {pid}) en {path}")
+            return
+        # mismo intérprete y mismos argumentos globales (--config/--player) que esta llamada
+        subprocess.Popen(
+            [sys.executable, "-m", "mycli", *_global_args(args), "daemon", "run", "--watch", args.watch],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True, env=os.environ.copy(),
+        )
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            pid = _ping()
+            if pid:
+                print(f"Daemon iniciado (pid {pid}) en {path}")
+                return
+            time.sleep(0.05)
+        print("El daemon no respondió; prueba `ohmycli daemon run` para ver el error.")
+        return
+
+    if cmd == 'stop':
+        if daemon.request({"op": "stop"}) is None:
+            print("No hay daemon corriendo.")
+        else:
+            print("Daemon detenido.")
+        return
+
+    pid = _ping()
+    print(f"Daemon corriendo (pid {pid}) en {path}" if pid else "No hay daemon corriendo.")
+
+def _global_args(args):
+    out = []
+    if getattr(args, 'config', None):
+        out += ['--config', os.path.abspath(args.config)]
+    if getattr(args, 'player', None):
+        out += ['--player', args.player]
+    return out
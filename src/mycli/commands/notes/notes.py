@@ -4,23 +4,57 @@ import datetime
 import tempfile
 import os
 import subprocess
+import shutil
+import filecmp
+import functools
+import sys
 from typing import Optional
 
+from mycli.notes_index import NotesSearchIndex, notes_index_path
+from mycli.notes_manifest import NotesManifest
+from mycli.notes_pack import NotesPack, CODECS
+from mycli import notes_view
+from mycli import notes_transfer
+from mycli.timing import traced
+
 def register_parser(subparsers):
-    notes_p = subparsers.add_parser('notes', help='Notas (add/list/view/del/edit)')
+    notes_p = subparsers.add_parser('notes', help='Notas (add/list/view/del/edit/search/pack/unpack/export/import)')
     notes_sub = notes_p.add_subparsers(dest='notes_cmd')
     add_p = notes_sub.add_parser('add', help='Agregar nota')
     add_p.add_argument('--name', '-n', help='Nombre de archivo (sin extensión), opcional')
     notes_sub.add_parser('list', help='Listar notas')
-    view_p = notes_sub.add_parser('view', help='Ver nota por índice')
+    view_p = notes_sub.add_parser('view', help='Ver nota por ID')
     view_p.add_argument('index', type=int)
+    # notas grandes: se leen por partes, sin cargar el archivo completo
+    part = view_p.add_mutually_exclusive_group()
+    part.add_argument('--head', type=int, metavar='N', help='Solo las primeras N líneas')
+    part.add_argument('--tail', type=int, metavar='N', help='Solo las últimas N líneas')
+    part.add_argument('--range', metavar='A:B', help='Líneas A a B (1-based, inclusivas; A: o :B)')
+    part.add_argument('--pager', action='store_true', help='Mostrar por páginas (Enter sigue, q sale)')
     # edit: por defecto inline; usar --external para abrir $EDITOR/notepad
-    edit_p = notes_sub.add_parser('edit', help='Editar nota por índice (inline por defecto)')
+    edit_p = notes_sub.add_parser('edit', help='Editar nota por ID (inline por defecto)')
     edit_p.add_argument('index', type=int)
     edit_p.add_argument('--external', action='store_true', help='Forzar uso de editor externo ($EDITOR o notepad)')
-    del_p = notes_sub.add_parser('del', help='Borrar nota por índice')
+    del_p = notes_sub.add_parser('del', help='Borrar nota por ID')
     del_p.add_argument('index', type=int)
     del_p.add_argument('--yes', action='store_true', help='Confirmar borrado sin preguntar')
+    search_p = notes_sub.add_parser('search', help='Buscar notas por texto (índice invertido)')
+    search_p.add_argument('query', nargs='+', help='Términos (sin importar acentos ni mayúsculas)')
+    search_p.add_argument('--limit', type=int, default=20, help='Máximo de resultados (0 = todos)')
+    pack_p = notes_sub.add_parser('pack', help='Mover notas viejas (o por ID) al archivo empaquetado')
+    pack_p.add_argument('ids', type=int, nargs='*', help='IDs a empaquetar (por defecto: las más viejas que --older-than)')
+    pack_p.add_argument('--older-than', type=int, default=30, metavar='DIAS', help='Antigüedad mínima en días (default 30)')
+    pack_p.add_argument('--codec', choices=sorted(CODECS), default='zlib', help='Compresión por nota (default zlib)')
+    unpack_p = notes_sub.add_parser('unpack', help='Devolver notas empaquetadas a la carpeta')
+    unpack_p.add_argument('ids', type=int, nargs='*', help='IDs a desempaquetar (por defecto: todas)')
+    export_p = notes_sub.add_parser('export', help='Exportar todas las notas (stdout por defecto)')
+    export_p.add_argument('--format', choices=notes_transfer.FORMATS, default='jsonl', help='tar o jsonl (default jsonl)')
+    export_p.add_argument('--gzip', action='store_true', help='Comprimir con gzip')
+    export_p.add_argument('-o', '--output', help='Archivo de salida (default: stdout)')
+    import_p = notes_sub.add_parser('import', help='Importar notas desde tar o JSON Lines (stdin por defecto)')
+    import_p.add_argument('--format', choices=notes_transfer.FORMATS, help='Forzar formato (por defecto se detecta, gzip incluido)')
+    import_p.add_argument('-i', '--input', help='Archivo de entrada (default: stdin)')
+    import_p.add_argument('--overwrite', action='store_true', help='Reemplazar notas con el mismo nombre')
 
 def run(args, cfg):
     notes_path = cfg.get('notes_path')
@@ -33,14 +67,24 @@ def run(args, cfg):
     elif cmd == 'list':
         _list(notes_path)
     elif cmd == 'view':
-        _view(notes_path, args.index)
+        _view(notes_path, args.index, head=args.head, tail=args.tail, span=args.range, pager=args.pager)
     elif cmd == 'edit':
         external = getattr(args, 'external', False)
         _edit(notes_path, args.index, external=external)
     elif cmd == 'del':
         _del(notes_path, args.index, yes=args.yes)
+    elif cmd == 'search':
+        _search(notes_path, ' '.join(args.query), limit=args.limit)
+    elif cmd == 'pack':
+        _pack(notes_path, args.ids, older_than=args.older_than, codec=args.codec)
+    elif cmd == 'unpack':
+        _unpack(notes_path, args.ids)
+    elif cmd == 'export':
+        _export(notes_path, fmt=args.format, compress=args.gzip, output=args.output)
+    elif cmd == 'import':
+        _import(notes_path, fmt=args.format, source=args.input, overwrite=args.overwrite)
     else:
-        print("Uso: mycli notes add|list|view|edit|del")
+        print("Uso: mycli notes add|list|view|edit|del|search|pack|unpack|export|import")
 
 # ---------- helpers ----------
 def _ensure_folder(p: Path, create_if_missing=True):
@@ -61,7 +105,42 @@ def _safe_filename(name: str) -> Optional[str]:
     # si queda vacío, devolver None
     return name if name else None
 
+def _lookup(p: Path, nid: int, unpack: bool = False):
+    """
+    (manifest, archivo) de la nota con ID nid; archivo None si no existe.
+    Con unpack=True una nota empaquetada se devuelve primero a la carpeta (para editarla).
+    """
+    manifest = NotesManifest.load(p)
+    entry = manifest.get(nid)
+    if unpack and entry and entry.get("packed"):
+        _unpack_entries(p, manifest, [entry["name"]])
+    target = manifest.path_of(nid)
+    if target is None or not target.exists():
+        print("No existe una nota con ese ID.")
+        return manifest, None
+    return manifest, target
+
+def _unpack_entries(p: Path, manifest: NotesManifest, names: list, pack: Optional[NotesPack] = None) -> int:
+    """Extrae names del pack a la carpeta (sin pisar archivos existentes) y los quita del pack."""
+    pack = pack or NotesPack.load(p)
+    done = []
+    for name in names:
+        if name not in pack:
+            continue
+        dest = p / name
+        if dest.exists():
+            print(f"{name} ya existe en la carpeta; se deja empaquetada.")
+            continue
+        pack.extract(name, dest)
+        done.append(name)
+    pack.remove(done)
+    pack.save()
+    for name in done:
+        manifest.set_packed(name, False)
+    return len(done)
+
 # ---------- add ----------
+@traced("notes.add")
 def _add(notes_path, name: Optional[str] = None):
     p = Path(notes_path)
     if not _ensure_folder(p, create_if_missing=True):
@@ -102,40 +181,105 @@ def _add(notes_path, name: Optional[str] = None):
     if not fname:
         fname = f"nota_{ts}.txt"
     fpath = p / fname
-    # si existe, preguntar si sobrescribir (evitar pisar)
-    if fpath.exists():
+    manifest = NotesManifest.load(p)
+    existing = manifest.get(manifest.id_of(fname))
+    # si existe (suelta o empaquetada), preguntar si sobrescribir (evitar pisar)
+    if fpath.exists() or (existing and existing.get("packed")):
         ans2 = input(f"El archivo {fpath.name} ya existe. ¿Sobrescribir? (y/N): ").strip().lower()
         if ans2 != 'y':
             print("Guardado cancelado.")
             return
+    if existing and existing.get("packed"):
+        pack = NotesPack.load(p)
+        pack.remove([fname])
+        pack.save()
     fpath.write_text(content + '\n', encoding='utf-8')
-    print(f"Nota guardada en: {fpath}")
+    nid = manifest.record_write(fname, content)
+    manifest.save()
+    print(f"Nota [{nid}] guardada en: {fpath}")
 
 # ---------- list ----------
+@traced("notes.list")
 def _list(notes_path):
     p = Path(notes_path)
     if not _ensure_folder(p, create_if_missing=False):
         return
-    files = sorted([f for f in p.iterdir() if f.is_file()])
-    if not files:
+    # todo sale del manifest: sin un stat por archivo
+    manifest = NotesManifest.load(p)
+    manifest.save()
+    entries = manifest.entries()
+    if not entries:
         print("No hay notas.")
         return
-    for i, f in enumerate(files, 1):
-        mtime = datetime.datetime.fromtimestamp(f.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{i}] {f.name} ({mtime})")
+    for nid, e in entries:
+        mtime = datetime.datetime.fromtimestamp(e["mtime"] / 1e9).strftime("%Y-%m-%d %H:%M:%S")
+        where = " [pack]" if e.get("packed") else ""
+        print(f"[{nid}] {e['name']}{where} ({mtime})  {e['title']}")
 
 # ---------- view ----------
-def _view(notes_path, index):
+@traced("notes.view")
+def _view(notes_path, index, head: Optional[int] = None, tail: Optional[int] = None,
+          span: Optional[str] = None, pager: bool = False):
+    p = Path(notes_path)
+    if not _ensure_folder(p, create_if_missing=False):
+        return
+    manifest = NotesManifest.load(p)
+    manifest.save()
+    entry = manifest.get(index)
+    if entry is None:
+        print("No existe una nota con ese ID.")
+        return
+    if entry.get("packed"):
+        # seek directo al registro de la nota en el pack
+        pack = NotesPack.load(p)
+        if entry["name"] not in pack:
+            print("No existe una nota con ese ID.")
+            return
+        target = functools.partial(pack.open_binary, entry["name"])
+        name = entry["name"]
+    else:
+        target = manifest.path_of(index)
+        if not target.exists():
+            print("No existe una nota con ese ID.")
+            return
+        name = target.name
+    if span is not None:
+        try:
+            start, end = notes_view.parse_range(span)
+        except ValueError:
+            print("Rango inválido (usa A:B, A: o :B).")
+            return
+    print(f"=== {name} ===")
+    if head is not None:
+        notes_view.write_lines(notes_view.head(target, head))
+    elif tail is not None:
+        notes_view.write_lines(notes_view.tail(target, tail))
+    elif span is not None:
+        notes_view.write_lines(notes_view.line_range(target, start, end))
+    elif pager:
+        notes_view.page(target)
+    else:
+        notes_view.copy_to(target)
+
+# ---------- search ----------
+@traced("notes.search")
+def _search(notes_path, query: str, limit: int = 20):
     p = Path(notes_path)
     if not _ensure_folder(p, create_if_missing=False):
         return
-    files = sorted([f for f in p.iterdir() if f.is_file()])
-    if index < 1 or index > len(files):
-        print("Índice fuera de rango.")
+    # solo se retokenizan las notas cuyo mtime/tamaño cambió desde la última búsqueda
+    with NotesSearchIndex(notes_index_path(p)) as index:
+        index.update(p, NotesPack.load(p))
+        results = index.search(query, limit)
+    if not results:
+        print("Sin resultados.")
         return
-    target = files[index-1]
-    print(f"=== {target.name} ===")
-    print(target.read_text(encoding='utf-8'))
+    # mismo ID que muestra `notes list`
+    manifest = NotesManifest.load(p)
+    manifest.save()
+    for name, score in results:
+        nid = manifest.id_of(name)
+        print(f"[{nid if nid is not None else '?'}] {name}  (score {score:.2f})")
 
 # ---------- edit ----------
 def _edit(notes_path, index, external: bool = False):
@@ -147,22 +291,26 @@ def _edit(notes_path, index, external: bool = False):
     p = Path(notes_path)
     if not _ensure_folder(p, create_if_missing=False):
         return
-    files = sorted([f for f in p.iterdir() if f.is_file()])
-    if index < 1 or index > len(files):
-        print("Índice fuera de rango.")
+    manifest, target = _lookup(p, index, unpack=True)
+    if target is None:
+        manifest.save()
         return
-    target = files[index-1]
+    _edit_target(target, external)
+    # refrescar mtime/tamaño/título de la nota (haya cambiado o no)
+    manifest.record_write(target.name)
+    manifest.save()
 
+def _edit_target(target: Path, external: bool):
     # si forzaron editor externo y existe, usar; si no, caeremos a inline
     if external:
         editor = os.environ.get('EDITOR')
         if not editor and os.name == 'nt':
             editor = 'notepad'
         if editor:
-            # abrir temp copy para editar y luego mover a origen si cambió
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".tmp", mode='w', encoding='utf-8') as tf:
+            # abrir temp copy para editar y luego mover a origen si cambió (copia por bloques)
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".tmp") as tf:
                 tf_name = tf.name
-                tf.write(target.read_text(encoding='utf-8'))
+            shutil.copyfile(target, tf_name)
             try:
                 subprocess.run([editor, tf_name])
             except Exception as ex:
@@ -174,17 +322,18 @@ def _edit(notes_path, index, external: bool = False):
                     pass
                 _edit_inline(target)
                 return
-            # después de editar, leer el temp y reemplazar
+            # después de editar, comparar por bloques y reemplazar
             try:
-                new_content = Path(tf_name).read_text(encoding='utf-8')
+                unchanged = filecmp.cmp(tf_name, target, shallow=False)
+                if not unchanged:
+                    shutil.copyfile(tf_name, target)
                 Path(tf_name).unlink(missing_ok=True)
             except Exception:
                 print("Error leyendo temporal del editor.")
                 return
-            if new_content == target.read_text(encoding='utf-8'):
+            if unchanged:
                 print("No hubo cambios.")
                 return
-            target.write_text(new_content, encoding='utf-8')
             print(f"{target.name} actualizado (externo).")
             return
         else:
@@ -199,7 +348,7 @@ def _edit_inline(target: Path):
     print(f"Editando (inline) {target.name}. Se mostrará contenido actual y podrás reescribirlo.")
     print("=== CONTENIDO ACTUAL ===")
     try:
-        print(target.read_text(encoding='utf-8'))
+        notes_view.copy_to(target)
     except Exception as ex:
         print(f"(No pude leer el archivo: {ex})")
     print("=== INGRESA NUEVO CONTENIDO. Termina con '.' en línea sola ===")
@@ -213,7 +362,7 @@ def _edit_inline(target: Path):
             break
         lines.append(line)
     new = '\n'.join(lines).strip()
-    if new == target.read_text(encoding='utf-8').strip():
+    if notes_view.same_stripped(target, new):
         print("No hubo cambios.")
         return
     if not new:
@@ -225,19 +374,157 @@ def _edit_inline(target: Path):
     print(f"{target.name} actualizado (inline).")
 
 # ---------- delete ----------
+@traced("notes.del")
 def _del(notes_path, index, yes=False):
     p = Path(notes_path)
     if not _ensure_folder(p, create_if_missing=False):
         return
-    files = sorted([f for f in p.iterdir() if f.is_file()])
-    if index < 1 or index > len(files):
-        print("Índice fuera de rango.")
+    manifest = NotesManifest.load(p)
+    entry = manifest.get(index)
+    packed = bool(entry and entry.get("packed"))
+    target = p / entry["name"] if entry else None
+    if target is None or not (packed or target.exists()):
+        manifest.save()
+        print("No existe una nota con ese ID.")
         return
-    target = files[index-1]
     if not yes:
         ans = input(f"¿Eliminar {target.name}? (y/N): ").strip().lower()
         if ans != 'y':
             print("Operación cancelada.")
             return
-    target.unlink()
+    if packed:
+        pack = NotesPack.load(p)
+        pack.remove([target.name])
+        pack.save()
+    else:
+        target.unlink()
+    manifest.record_delete(index)
+    manifest.save()
     print(f"{target.name} eliminado.")
+
+# ---------- pack / unpack ----------
+@traced("notes.pack")
+def _pack(notes_path, ids: list, older_than: int = 30, codec: str = 'zlib'):
+    p = Path(notes_path)
+    if not _ensure_folder(p, create_if_missing=False):
+        return
+    manifest = NotesManifest.load(p)
+    if ids:
+        chosen = [manifest.get(i) for i in ids]
+        missing = [i for i, e in zip(ids, chosen) if e is None]
+        if missing:
+            print("IDs inexistentes:", ", ".join(map(str, missing)))
+            return
+    else:
+        # antigüedad según el manifest: sin un stat por nota
+        limit = (datetime.datetime.now() - datetime.timedelta(days=older_than)).timestamp() * 1e9
+        chosen = [e for _, e in manifest.entries() if e["mtime"] < limit]
+    files = [p / e["name"] for e in chosen if not e.get("packed") and (p / e["name"]).exists()]
+    if not files:
+        print("No hay notas para empaquetar.")
+        manifest.save()
+        return
+    pack = NotesPack.load(p)
+    if pack.corrupt:
+        print(f"No se agregan notas a {pack.path}: muévelo o bórralo y vuelve a intentar.")
+        manifest.save()
+        return
+    added = pack.add_files(files, codec=codec)
+    # el índice del pack se escribe antes de borrar las sueltas
+    pack.save()
+    for name in added:
+        (p / name).unlink()
+        manifest.set_packed(name, True)
+    manifest.save()
+    print(f"{len(added)} notas empaquetadas en {pack.path}")
+
+@traced("notes.unpack")
+def _unpack(notes_path, ids: list):
+    p = Path(notes_path)
+    if not _ensure_folder(p, create_if_missing=False):
+        return
+    manifest = NotesManifest.load(p)
+    if ids:
+        names = [manifest.get(i)["name"] for i in ids if manifest.get(i) and manifest.get(i).get("packed")]
+    else:
+        names = [e["name"] for _, e in manifest.entries() if e.get("packed")]
+    n = _unpack_entries(p, manifest, names)
+    manifest.save()
+    print(f"{n} notas desempaquetadas.")
+
+# ---------- export / import ----------
+@traced("notes.export")
+def _export(notes_path, fmt: str = 'jsonl', compress: bool = False, output: Optional[str] = None):
+    p = Path(notes_path)
+    if not _ensure_folder(p, create_if_missing=False):
+        return
+    manifest = NotesManifest.load(p)
+    manifest.save()
+    pack = NotesPack.load(p)
+
+    def notes():
+        # en orden de ID, una nota a la vez (sueltas o del pack)
+        for _, e in manifest.entries():
+            name = e["name"]
+            if e.get("packed"):
+                if name not in pack:
+                    continue
+                mtime, size = pack.stat(name)
+                yield name, mtime, size, (lambda n=name: pack.open_binary(n))
+            else:
+                f = p / name
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                yield name, st.st_mtime_ns, st.st_size, (lambda f=f: open(f, 'rb'))
+
+    if output:
+        with open(output, 'wb') as out:
+            n = notes_transfer.export_notes(notes(), out, fmt, compress)
+    else:
+        n = notes_transfer.export_notes(notes(), sys.stdout.buffer, fmt, compress)
+        sys.stdout.buffer.flush()
+    # stdout lleva los datos: el resumen va a stderr
+    print(f"{n} notas exportadas.", file=sys.stderr)
+
+@traced("notes.import")
+def _import(notes_path, fmt: Optional[str] = None, source: Optional[str] = None, overwrite: bool = False):
+    p = Path(notes_path)
+    if not _ensure_folder(p, create_if_missing=True):
+        return
+    manifest = NotesManifest.load(p)
+
+    def packed(name: str) -> bool:
+        entry = manifest.get(manifest.id_of(name))
+        return bool(entry and entry.get("packed"))
+
+    n = 0
+    bad = []
+    replaced = []  # notas empaquetadas sobrescritas: su registro del pack queda muerto
+
+    def invalid(msg: str) -> None:
+        print(msg)
+        bad.append(msg)
+
+    try:
+        stream = open(source, 'rb') if source else sys.stdin.buffer
+    except OSError as ex:
+        print(f"No pude abrir {source}: {ex}")
+        return
+    try:
+        for name, text in notes_transfer.import_notes(p, stream, fmt, overwrite, _safe_filename, packed, invalid):
+            if packed(name):
+                replaced.append(name)
+            # manifest en memoria; se escribe una sola vez al final
+            manifest.record_write(name, text)
+            n += 1
+    finally:
+        if source:
+            stream.close()
+        if replaced:
+            pack = NotesPack.load(p)
+            pack.remove(replaced)
+            pack.save()
+        manifest.save()
+    print(f"{n} notas importadas en {p}" + (f" ({len(bad)} registros inválidos omitidos)" if bad else ""))
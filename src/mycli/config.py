@@ -1,11 +1,28 @@
 # src/mycli/config.py
+"""
+Carga de configuración por capas:
+
+  1. ~/.ohmycli/config.json (obligatorio)
+  2. --config ARCHIVO (opcional; sus claves pisan a las globales)
+  3. flags de la línea de comandos (--player)
+
+Las rutas relativas de cada archivo se resuelven contra la carpeta de ese
+archivo. El resultado normalizado (rutas ya resueltas y validadas) se guarda
+en ~/.ohmycli/config.snapshot junto con el mtime/tamaño de cada archivo de
+origen: mientras no cambien, arrancar cuesta un stat por capa y leer el
+snapshot (marshal), sin parsear JSON ni resolver rutas.
+"""
 from pathlib import Path
-import json
+import marshal
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 GLOBAL_CONFIG_PATH = Path.home() / ".ohmycli" / "config.json"
+SNAPSHOT_PATH = GLOBAL_CONFIG_PATH.with_name("config.snapshot")
+SNAPSHOT_VERSION = 5
 REQUIRED_KEYS = ["who_classic_path", "who_new_path", "notes_path"]
+# claves con rutas: relativas al archivo de config que las define
+PATH_KEYS = ["who_classic_path", "who_new_path", "notes_path", "state_path", "library_index_path", "trace_path"]
 
 class ConfigError(RuntimeError):
     """Excepción levantada cuando la configuración es inválida o no encontrada."""
@@ -27,61 +44,220 @@ def _safe_resolve(p: Path) -> str:
         # Fallback para versiones antiguas de pathlib
         return str(p.absolute())
 
-def load_global_config() -> Dict[str, Any]:
+def _as_bool(v: Any) -> bool:
+    # Aceptar 'true'/'false' como string además de bool
+    if isinstance(v, str):
+        return v.strip().lower() in ("1", "true", "yes", "y")
+    return bool(v)
+
+def read_config_file(cfg_file: Path) -> Dict[str, Any]:
     """
-    Carga exclusivamente ~/.ohmycli/config.json.
-    Si no existe lanza ConfigError con mensaje claro.
-    Crea notes_path si create_notes_if_missing == true.
+    Lee un archivo de config y deja sus rutas absolutas (expanduser; relativas contra
+    la carpeta del archivo). No valida: eso se hace sobre el resultado de todas las capas.
     """
-    cfg_file = GLOBAL_CONFIG_PATH
+    import json  # solo sin snapshot válido
 
+    cfg_file = Path(cfg_file).expanduser()
     if not cfg_file.exists():
-        raise ConfigError(
-            f"No existe el archivo de configuración global:\n  {cfg_file}\n"
-            "Crea uno con las claves obligatorias (who_classic_path, who_new_path, notes_path)."
-        )
-
+        raise ConfigError(f"Config no encontrada en: {cfg_file}")
     try:
-        raw = cfg_file.read_text(encoding="utf-8")
-        data = json.loads(raw)
+        data = json.loads(cfg_file.read_text(encoding="utf-8"))
     except json.JSONDecodeError as e:
         raise ConfigError(f"JSON inválido en {cfg_file}: {e}")
     except Exception as e:
         raise ConfigError(f"Error leyendo {cfg_file}: {e}")
+    if not isinstance(data, dict):
+        raise ConfigError(f"Config inválida en {cfg_file}: se esperaba un objeto JSON")
+
+    base = cfg_file.parent
+    def absolute(v: Any) -> Any:
+        if not isinstance(v, str) or not v.strip():
+            return v
+        p = Path(v).expanduser()
+        return str(p if p.is_absolute() else base / p)
+
+    for key in PATH_KEYS:
+        if key in data:
+            data[key] = absolute(data[key])
+    # Colecciones extra: {"nombre": "ruta"} o [{"name": ..., "path": ...}]
+    raw_collections = data.get("collections")
+    if isinstance(raw_collections, list):
+        try:
+            raw_collections = {e["name"]: e["path"] for e in raw_collections}
+        except (TypeError, KeyError):
+            raise ConfigError("Config inválida: cada entrada de 'collections' necesita 'name' y 'path'")
+    if isinstance(raw_collections, dict):
+        data["collections"] = {k: absolute(v) for k, v in raw_collections.items()}
+    elif raw_collections is not None:
+        raise ConfigError("Config inválida: 'collections' debe ser un objeto {nombre: ruta} o una lista")
+    return data
 
+def normalize_config(data: Dict[str, Any], source: str, create_missing_notes: bool = True) -> Dict[str, Any]:
+    """
+    Valida y normaliza la config ya combinada: claves obligatorias, rutas resueltas,
+    scan_workers, state_backend y colecciones. Crea notes_path si create_notes_if_missing
+    (o lanza ConfigError si no existe y no se permite crearla).
+    """
     # Validar claves mínimas
     for key in REQUIRED_KEYS:
         if key not in data or not str(data[key]).strip():
             raise ConfigError(f"Config inválida: falta el campo obligatorio '{key}'")
 
-    # Expandir rutas (sin resolver estrictamente)
     who_classic = Path(data["who_classic_path"]).expanduser()
     who_new = Path(data["who_new_path"]).expanduser()
     notes = Path(data["notes_path"]).expanduser()
 
     # Crear carpeta de notas si se permite
-    create_notes = bool(data.get("create_notes_if_missing", True))
-    _ensure_folder(notes, create=create_notes)
+    create_notes = _as_bool(data.get("create_notes_if_missing", True))
+    if create_missing_notes:
+        try:
+            _ensure_folder(notes, create=create_notes)
+        except OSError as e:
+            raise ConfigError(f"No se pudo crear notes_path '{notes}': {e}")
 
     player_cmd = data.get("player_cmd")
+    if isinstance(player_cmd, str) and player_cmd.strip() == "":
+        player_cmd = None
+    elif player_cmd is not None:
+        player_cmd = str(player_cmd)
+
+    # Reproductor: un proceso por episodio ("spawn") o uno persistente por JSON IPC ("ipc", ver player.py)
+    player_mode = str(data.get("player_mode") or "spawn").strip().lower()
+    if player_mode not in ("spawn", "ipc"):
+        raise ConfigError("Config inválida: 'player_mode' debe ser 'spawn' o 'ipc'")
+
+    # Hilos para listar carpetas en paralelo (1 = secuencial)
+    try:
+        scan_workers = max(1, int(data.get("scan_workers", 1)))
+    except (TypeError, ValueError):
+        raise ConfigError("Config inválida: 'scan_workers' debe ser un entero")
+
+    # Backend del estado de vistos: "json" (snapshot + journal) o "sqlite"
+    state_backend = str(data.get("state_backend") or "json").strip().lower()
+    if state_backend not in ("json", "sqlite"):
+        raise ConfigError("Config inválida: 'state_backend' debe ser 'json' o 'sqlite'")
+
+    # Clave del estado de vistos: ruta absoluta (default) o huella de contenido
+    watch_key = str(data.get("watch_key") or "path").strip().lower()
+    if watch_key not in ("path", "fingerprint"):
+        raise ConfigError("Config inválida: 'watch_key' debe ser 'path' o 'fingerprint'")
+
+    # Vigilancia de la biblioteca en sesiones interactivas (ver watcher.py)
+    library_watcher = str(data.get("library_watcher") or "off").strip().lower()
+    if library_watcher not in ("off", "auto", "inotify", "poll"):
+        raise ConfigError("Config inválida: 'library_watcher' debe ser 'off', 'auto', 'inotify' o 'poll'")
+
+    collections = {}
+    for name, path in (data.get("collections") or {}).items():
+        if name in ("who-old", "who-new") or not str(name).strip() or not str(path or "").strip():
+            raise ConfigError(f"Config inválida: colección '{name}' sin ruta o con un nombre reservado")
+        collections[str(name)] = _safe_resolve(Path(path).expanduser())
+
     state_path_raw = data.get("state_path")
+    index_path_raw = data.get("library_index_path")
+    # traza JSON Lines de listados, estado y reproductor (ver trace.py)
+    trace_path_raw = data.get("trace_path")
 
     return {
         "who_classic_path": _safe_resolve(who_classic),
         "who_new_path": _safe_resolve(who_new),
         "notes_path": _safe_resolve(notes),
         "player_cmd": player_cmd,
+        "player_mode": player_mode,
         "create_notes_if_missing": create_notes,
+        "scan_workers": scan_workers,
+        "collections": collections,
         "state_path": _safe_resolve(Path(state_path_raw).expanduser()) if state_path_raw else None,
-        "config_source": str(cfg_file),
+        "state_backend": state_backend,
+        "watch_key": watch_key,
+        "library_watcher": library_watcher,
+        "library_index_path": _safe_resolve(Path(index_path_raw).expanduser()) if index_path_raw else None,
+        "trace_path": _safe_resolve(Path(trace_path_raw).expanduser()) if trace_path_raw else None,
+        "config_source": source,
     }
 
+# ---------- snapshot ----------
+def _signature(paths: List[Path]) -> List[Any]:
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append([str(p), st.st_mtime_ns, st.st_size])
+        except OSError:
+            sig.append([str(p), None, None])
+    return sig
+
+def _read_snapshot(sig: List[Any]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(SNAPSHOT_PATH, "rb") as fh:
+            snap = marshal.load(fh)
+        if snap.get("version") == SNAPSHOT_VERSION and snap.get("sources") == sig:
+            return snap["cfg"]
+    except Exception:
+        pass
+    return None
+
+def _write_snapshot(sig: List[Any], cfg: Dict[str, Any]) -> None:
+    # best effort: si no se puede escribir, la próxima vez se vuelve a cargar desde los JSON
+    try:
+        SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            marshal.dump({"version": SNAPSHOT_VERSION, "sources": sig, "cfg": cfg}, fh)
+        os.replace(tmp, SNAPSHOT_PATH)
+    except Exception:
+        pass
+
+def load_layered_config(override_path: Optional[str] = None, cli: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Config global + --config override + flags (cli, solo valores no None).
+    Usa el snapshot si ningún archivo de origen cambió (un stat por capa).
+    """
+    cfg_file = GLOBAL_CONFIG_PATH
+    layers = [cfg_file] + ([Path(override_path).expanduser()] if override_path else [])
+    sig = _signature(layers)
+
+    cfg = _read_snapshot(sig)
+    if cfg is not None:
+        # el snapshot no vuelve a pasar por _ensure_folder: recrear notes_path si lo borraron
+        if cfg["create_notes_if_missing"] and not os.path.isdir(cfg["notes_path"]):
+            _ensure_folder(Path(cfg["notes_path"]))
+    else:
+        if not cfg_file.exists():
+            raise ConfigError(
+                f"No existe el archivo de configuración global:\n  {cfg_file}\n"
+                "Crea uno con las claves obligatorias (who_classic_path, who_new_path, notes_path)."
+            )
+        data = {}
+        for layer in layers:
+            data.update(read_config_file(layer))
+        cfg = normalize_config(data, str(cfg_file))
+        if override_path:
+            cfg["config_override"] = str(layers[1])
+        _write_snapshot(sig, cfg)
+
+    for key, value in (cli or {}).items():
+        if value is not None:
+            cfg[key] = value
+    return cfg
+
+def load_global_config() -> Dict[str, Any]:
+    """
+    Carga exclusivamente ~/.ohmycli/config.json (vía snapshot si no cambió).
+    Si no existe lanza ConfigError con mensaje claro.
+    Crea notes_path si create_notes_if_missing == true.
+    """
+    return load_layered_config()
+
 # Alias para compatibilidad con código que importe `load_config`
 load_config = load_global_config
 
 __all__ = [
     "GLOBAL_CONFIG_PATH",
     "load_global_config",
+    "load_layered_config",
     "load_config",
+    "read_config_file",
+    "normalize_config",
     "ConfigError",
 ]
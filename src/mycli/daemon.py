@@ -0,0 +1,259 @@
+# src/mycli/daemon.py
+"""
+Modo daemon: un proceso residente que atiende comandos por un socket Unix.
+
+`ohmycli daemon start` deja corriendo un proceso que ya importó todos los
+comandos y guarda en memoria (ver resident.py) el índice de biblioteca, el
+estado de vistos y el manifest de notas; el índice además queda vigilado
+(watcher.py) para no tener que validar carpetas con stat. El cliente
+(mycli/__main__.py) reenvía argv y el directorio actual, y el daemon ejecuta
+el mismo main() con stdout/stderr redirigidos al socket, así la salida llega
+en streaming. Solo se reenvían consultas no interactivas (sin menús ni
+stdin); si no hay daemon el cliente ejecuta el comando en el proceso. Las
+opciones globales con que se lanzó el daemon (--config/--player) valen para
+cada pedido, salvo que el pedido traiga las suyas.
+
+Protocolo: una línea JSON de pedido y, de vuelta, tramas (tipo, largo, datos)
+con tipo b"o" (stdout), b"e" (stderr) o b"x" (código de salida, fin).
+
+Este módulo solo importa la biblioteca estándar: el cliente lo carga en cada
+llamada.
+"""
+import io
+import json
+import os
+import socket
+import struct
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+SOCKET_ENV = "OHMYCLI_SOCKET"
+_FRAME = struct.Struct(">cI")
+# el pedido es una línea chica que el cliente manda al conectar
+REQUEST_TIMEOUT = 2.0
+MAX_REQUEST = 1024 * 1024
+
+
+def socket_path() -> Path:
+    """$OHMYCLI_SOCKET o ~/.ohmycli/daemon.sock (junto a la config global)."""
+    env = os.environ.get(SOCKET_ENV)
+    return Path(env) if env else Path.home() / ".ohmycli" / "daemon.sock"
+
+
+def _connect(path: Optional[Path] = None) -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("el daemon cerró la conexión")
+        buf += chunk
+    return buf
+
+
+# ---------- cliente ----------
+def request(payload: dict, out=None, err=None, path: Optional[Path] = None) -> Optional[int]:
+    """
+    Envía payload al daemon y copia su salida a out/err (binarios) a medida que llega.
+    Devuelve el código de salida, o None si no hay daemon escuchando.
+    """
+    sock = _connect(path)
+    if sock is None:
+        return None
+    out = out or sys.stdout.buffer
+    err = err or sys.stderr.buffer
+    with sock:
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        started = False
+        while True:
+            try:
+                kind, length = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+                data = _recv_exact(sock, length)
+            except ConnectionError:
+                if not started:
+                    return None
+                err.write("Se perdió la conexión con el daemon.\n".encode("utf-8"))
+                return 1
+            started = True
+            if kind == b"x":
+                return int(data or b"0")
+            target = out if kind == b"o" else err
+            target.write(data)
+            target.flush()
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Ejecuta argv en el daemon; None si no hay daemon (el cliente lo corre en el proceso)."""
+    return request({"op": "run", "argv": argv, "cwd": os.getcwd()})
+
+
+# ---------- servidor ----------
+class _FrameWriter(io.RawIOBase):
+    """Archivo binario de solo escritura que manda cada write como una trama."""
+
+    def __init__(self, sock: socket.socket, kind: bytes):
+        self._sock = sock
+        self._kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        if data:
+            self._sock.sendall(_FRAME.pack(self._kind, len(data)) + data)
+        return len(data)
+
+
+def _stream(sock: socket.socket, kind: bytes) -> io.TextIOWrapper:
+    return io.TextIOWrapper(io.BufferedWriter(_FrameWriter(sock, kind), 64 * 1024), encoding="utf-8", errors="replace")
+
+
+def _read_request(conn: socket.socket) -> dict:
+    """
+    Lee la línea del pedido con REQUEST_TIMEOUT: un cliente que conecta y no la manda
+    completa no debe bloquear al daemon (atiende de a un pedido). ValueError si la trama
+    es inválida; socket.timeout (OSError) si no llegó a tiempo.
+    """
+    conn.settimeout(REQUEST_TIMEOUT)
+    buf = b""
+    while not buf.endswith(b"\n"):
+        chunk = conn.recv(64 * 1024)
+        if not chunk:
+            raise ValueError("pedido incompleto")
+        buf += chunk
+        if len(buf) > MAX_REQUEST:
+            raise ValueError("pedido demasiado grande")
+    req = json.loads(buf)
+    if not isinstance(req, dict):
+        raise ValueError("el pedido no es un objeto")
+    # la salida puede tardar (o frenarse en un paginador): sin límite al escribir
+    conn.settimeout(None)
+    return req
+
+
+def _sync_library(watch_mode: str) -> None:
+    """Aplica los eventos pendientes a los índices residentes y vigila los recién cargados."""
+    from .library import LibraryIndex
+    from .watcher import attach_watcher
+    from . import resident
+    for obj in resident.objects():
+        if isinstance(obj, LibraryIndex):
+            if obj.watcher is None:
+                attach_watcher(obj, watch_mode)
+            else:
+                obj.watcher.poll()
+
+
+def _run(conn: socket.socket, req: dict, main, defaults: List[str]) -> int:
+    """
+    Ejecuta main(defaults + argv) con stdout/stderr hacia conn (las opciones del pedido
+    van después: pisan a las del daemon). Devuelve el código de salida.
+    """
+    import traceback
+    from . import resident, trace
+
+    out, err = _stream(conn, b"o"), _stream(conn, b"e")
+    saved = sys.stdout, sys.stderr, os.getcwd()
+    sys.stdout, sys.stderr = out, err
+    code = 0
+    try:
+        os.chdir(req.get("cwd") or saved[2])
+        main(list(defaults) + list(req.get("argv") or []))
+    except SystemExit as ex:
+        code = ex.code if isinstance(ex.code, int) else (0 if ex.code is None else 1)
+    except (BrokenPipeError, ConnectionError):
+        code = 1
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    finally:
+        for stream in (out, err):
+            try:
+                stream.flush()
+            except OSError:
+                pass
+        sys.stdout, sys.stderr = saved[0], saved[1]
+        os.chdir(saved[2])
+        resident.settle()
+        trace.flush()
+    return code
+
+
+def _send_exit(conn: socket.socket, code: int) -> None:
+    try:
+        conn.sendall(_FRAME.pack(b"x", len(str(code))) + str(code).encode())
+    except OSError:
+        pass
+
+
+def serve(path: Optional[Path] = None, watch_mode: str = "auto", defaults: Optional[List[str]] = None) -> None:
+    """
+    Atiende pedidos (uno a la vez) hasta recibir {"op": "stop"}. defaults son opciones
+    globales (p. ej. ["--config", ruta]) que se anteponen al argv de cada pedido.
+    """
+    from . import resident
+    from .main import COMMANDS, load_command, main
+
+    path = Path(path or socket_path())
+    probe = _connect(path)
+    if probe is not None:
+        probe.close()
+        raise RuntimeError(f"Ya hay un daemon escuchando en {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        path.unlink()  # socket huérfano de un daemon anterior
+    except FileNotFoundError:
+        pass
+
+    resident.enable()
+    # todo importado una vez: cada pedido arranca en caliente
+    for name in COMMANDS:
+        load_command(name)
+
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)  # solo el usuario puede conectarse
+    try:
+        srv.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    srv.listen(16)
+    try:
+        while True:
+            conn, _ = srv.accept()
+            with conn:
+                try:
+                    req = _read_request(conn)
+                except (OSError, ValueError):
+                    continue  # trama inválida o cliente mudo: se cierra la conexión
+                op = req.get("op")
+                if op == "stop":
+                    _send_exit(conn, 0)
+                    return
+                if op == "ping":
+                    msg = f"{os.getpid()}\n".encode()
+                    conn.sendall(_FRAME.pack(b"o", len(msg)) + msg)
+                    _send_exit(conn, 0)
+                    continue
+                if op == "run":
+                    _sync_library(watch_mode)
+                    _send_exit(conn, _run(conn, req, main, defaults or []))
+    finally:
+        srv.close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+__all__ = ["socket_path", "request", "forward", "serve", "SOCKET_ENV"]
@@ -0,0 +1,125 @@
+# src/mycli/fingerprint.py
+"""
+Huellas de contenido parciales para identificar episodios aunque cambien de ruta.
+
+La huella es el tamaño del archivo más un hash (blake2b) de tres bloques fijos:
+principio, mitad y final. Se leen como mucho 3 * CHUNK bytes por archivo, sin
+importar su tamaño. Mover o renombrar un episodio (otra carpeta, otro montaje)
+no cambia su huella, así que el estado de vistos sobrevive a reorganizar la
+biblioteca (watch_key = "fingerprint" en config.json).
+
+Las huellas se guardan en fingerprints.json (junto al estado) con clave
+inodo:tamaño:mtime: un archivo solo se vuelve a leer si es nuevo o cambió, y
+los que faltan se calculan en un pool de hilos.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+FP_VERSION = 1
+FP_FILENAME = "fingerprints.json"
+FP_PREFIX = "fp:"
+FP_WORKERS = 8
+CHUNK = 64 * 1024
+
+
+def fingerprint_cache_path(state_path: Path) -> Path:
+    return Path(state_path).with_name(FP_FILENAME)
+
+
+def is_fingerprint_key(key: str) -> bool:
+    return key.startswith(FP_PREFIX)
+
+
+def fingerprint_file(path, size: Optional[int] = None) -> Optional[str]:
+    """'fp:<tamaño>:<hash>' leyendo solo principio, mitad y final; None si no se puede leer."""
+    try:
+        with open(path, "rb") as fh:
+            if size is None:
+                size = os.fstat(fh.fileno()).st_size
+            h = hashlib.blake2b(digest_size=16)
+            h.update(size.to_bytes(8, "big"))
+            if size <= 3 * CHUNK:
+                h.update(fh.read(size))
+            else:
+                for offset in (0, (size - CHUNK) // 2, size - CHUNK):
+                    fh.seek(offset)
+                    h.update(fh.read(CHUNK))
+    except OSError:
+        return None
+    return f"{FP_PREFIX}{size}:{h.hexdigest()}"
+
+
+class FingerprintCache:
+    """"inodo:tamaño:mtime_ns" -> huella; solo se leen archivos nuevos o modificados."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.files: Dict[str, str] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "FingerprintCache":
+        cache = cls(path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data.get("version") == FP_VERSION and isinstance(data.get("files"), dict):
+                cache.files = data["files"]
+        except Exception:
+            pass
+        return cache
+
+    def save(self) -> None:
+        """Escribe el caché si hubo cambios (escritura atómica vía archivo temporal)."""
+        if not self._dirty or self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps({"version": FP_VERSION, "files": self.files}, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as ex:
+            print(f"No pude guardar el caché de huellas '{self.path}': {ex}")
+
+    def fingerprints(self, paths: Iterable, workers: int = FP_WORKERS) -> Dict[str, Optional[str]]:
+        """{str(ruta): huella} (None si no existe o no se puede leer); calcula en paralelo las que faltan."""
+        result: Dict[str, Optional[str]] = {}
+        missing = []
+        for p in paths:
+            key = str(p)
+            try:
+                st = os.stat(key)
+            except OSError:
+                result[key] = None
+                continue
+            ident = f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+            fp = self.files.get(ident)
+            if fp is not None:
+                result[key] = fp
+            else:
+                missing.append((key, st.st_size, ident))
+        if missing:
+            if workers <= 1 or len(missing) == 1:
+                fps = [fingerprint_file(k, size) for k, size, _ in missing]
+            else:
+                with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+                    fps = list(pool.map(lambda m: fingerprint_file(m[0], m[1]), missing))
+            for (key, _, ident), fp in zip(missing, fps):
+                result[key] = fp
+                if fp is not None:
+                    self.files[ident] = fp
+                    self._dirty = True
+        return result
+
+
+__all__ = [
+    "FingerprintCache",
+    "fingerprint_file",
+    "fingerprint_cache_path",
+    "is_fingerprint_key",
+    "FP_PREFIX",
+]
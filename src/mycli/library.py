@@ -0,0 +1,177 @@
+# src/mycli/library.py
+"""
+Índice persistente de la biblioteca multimedia (who_classic_path / who_new_path).
+
+Por cada carpeta visitada guardamos su mtime y su listado (subcarpetas y videos).
+Al volver a pedir una carpeta solo se compara su mtime con un stat: si no cambió,
+el listado sale del índice sin volver a leer el directorio. Así un arranque en
+caliente muestra el menú de Doctores sin tocar las carpetas de episodios.
+
+Con un watcher enganchado (ver watcher.py) las carpetas ya listadas en la sesión
+quedan "vivas": sus eventos de alta/baja se aplican al índice y el listado sale
+de memoria sin siquiera el stat.
+"""
+import bisect
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import resident
+from .timing import traced
+from .utils import default_state_path, scan_dir
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "library_index.json"
+
+
+def _release_watcher(index: "LibraryIndex") -> None:
+    """El daemon descarta un índice reescrito por otro proceso: su watcher (fd, watches) se cierra."""
+    from .watcher import detach_watcher
+    detach_watcher(index)
+
+
+def library_index_path(cfg: Optional[Dict[str, Any]] = None) -> Path:
+    """Ruta del índice: la de la config o, por defecto, junto al archivo de estado."""
+    cfg = cfg or {}
+    if cfg.get("library_index_path"):
+        return Path(cfg["library_index_path"])
+    state_path = cfg.get("state_path")
+    base = Path(state_path) if state_path else default_state_path()
+    return base.with_name(INDEX_FILENAME)
+
+
+class LibraryIndex:
+    """Caché de listados de carpetas validada por mtime."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        # str(carpeta) -> {"mtime": ns, "dirs": [nombres], "media": [nombres]}
+        self.dirs: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        # watcher opcional y carpetas que mantiene al día (no hace falta validarlas con stat)
+        self.watcher = None
+        self.live = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "LibraryIndex":
+        """Carga el índice desde disco; si no existe o es inválido, empieza vacío (escaneo en frío)."""
+        # en el daemon el índice queda en memoria entre comandos
+        return resident.cached(("library-index", str(path)), [path], lambda: cls._read(path), _release_watcher)
+
+    @classmethod
+    @traced("LibraryIndex.read")
+    def _read(cls, path: Path) -> "LibraryIndex":
+        idx = cls(path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION and isinstance(data.get("dirs"), dict):
+                idx.dirs = data["dirs"]
+        except Exception:
+            pass
+        return idx
+
+    @traced("LibraryIndex.save")
+    def save(self) -> None:
+        """Escribe el índice si hubo cambios (escritura atómica vía archivo temporal)."""
+        if not self._dirty or self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps({"version": INDEX_VERSION, "dirs": self.dirs}, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as ex:
+            print(f"No pude guardar el índice de biblioteca '{self.path}': {ex}")
+
+    def listing(self, dir_path) -> Tuple[List[str], List[str]]:
+        """(subcarpetas, videos) de dir_path; solo relista si cambió el mtime de la carpeta."""
+        key = str(dir_path)
+        entry = self.dirs.get(key)
+        if entry is not None and key in self.live:
+            return entry["dirs"], entry["media"]
+        # vigilar antes de listar: lo que cambie después llega como evento
+        watched = self.watcher is not None and self.watcher.add(key)
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            if self.dirs.pop(key, None) is not None:
+                self._dirty = True
+            return [], []
+        if watched:
+            self.live.add(key)
+        if entry is not None and entry.get("mtime") == mtime:
+            return entry["dirs"], entry["media"]
+        dirs, media = scan_dir(key)
+        self.dirs[key] = {"mtime": mtime, "dirs": dirs, "media": media}
+        self._dirty = True
+        return dirs, media
+
+    # --- cambios incrementales (eventos del watcher) ---
+    # El mtime guardado no se actualiza con los eventos: un stat ahora podría incluir
+    # cambios cuyos eventos todavía no llegaron. Mientras la carpeta está vigilada el
+    # listado vale igual; sin vigilancia, el mtime viejo fuerza un relistado completo.
+    def apply_created(self, dir_path, name: str, is_dir: bool) -> bool:
+        """Agrega name (subcarpeta o video) al listado de dir_path, si está indexado."""
+        key = str(dir_path)
+        entry = self.dirs.get(key)
+        if entry is None:
+            return False
+        names = entry["dirs"] if is_dir else entry["media"]
+        i = bisect.bisect_left(names, name)
+        if i == len(names) or names[i] != name:
+            names.insert(i, name)
+        if is_dir:
+            # una carpeta que llega movida puede traer un listado viejo con esa ruta
+            self.forget(os.path.join(key, name))
+        self._dirty = True
+        return True
+
+    def apply_removed(self, dir_path, name: str) -> bool:
+        """Quita name del listado de dir_path (y el subárbol indexado si era carpeta)."""
+        key = str(dir_path)
+        entry = self.dirs.get(key)
+        if entry is None:
+            return False
+        for names in (entry["dirs"], entry["media"]):
+            i = bisect.bisect_left(names, name)
+            if i < len(names) and names[i] == name:
+                del names[i]
+        self.forget(os.path.join(key, name))
+        self._dirty = True
+        return True
+
+    def forget(self, dir_path) -> None:
+        """Olvida dir_path y todo lo indexado debajo."""
+        key = str(dir_path)
+        prefix = key.rstrip(os.sep) + os.sep
+        for k in [k for k in self.dirs if k == key or k.startswith(prefix)]:
+            del self.dirs[k]
+            self.live.discard(k)
+            self._dirty = True
+
+    def cached_media_count(self, dir_path, depth: int = 1) -> Optional[int]:
+        """
+        Videos bajo dir_path (hasta depth niveles) según lo ya indexado, sin tocar el disco.
+        None si la carpeta todavía no se escaneó.
+        """
+        entry = self.dirs.get(str(dir_path))
+        if entry is None:
+            return None
+        total = len(entry["media"])
+        if depth > 0:
+            for d in entry["dirs"]:
+                total += self.cached_media_count(os.path.join(str(dir_path), d), depth - 1) or 0
+        return total
+
+    def subdirs(self, dir_path) -> List[Path]:
+        dir_path = Path(dir_path)
+        return [dir_path / d for d in self.listing(dir_path)[0]]
+
+    def media_files(self, dir_path) -> List[Path]:
+        dir_path = Path(dir_path)
+        return [dir_path / f for f in self.listing(dir_path)[1]]
+
+
+__all__ = ["LibraryIndex", "library_index_path", "INDEX_FILENAME"]
@@ -1,24 +1,48 @@
 # src/mycli/main.py
 import sys
 import argparse
-import json
-from pathlib import Path
+import importlib
 
 # Import loader (compatibilizado en config.py)
-from .config import load_config, ConfigError
+from .config import load_layered_config, ConfigError
 
-# Comandos (cada módulo debe exponer register_parser(subparsers) y run(args, cfg))
-from .commands import who_old, who_new, notes
 from .banner import print_banner
-
-COMMAND_MODULES = [who_old, who_new, notes]
-COMMAND_HELP = {
-    "who-old": "Navegar Doctor Who Clásico",
-    "who-new": "Navegar Doctor Who",
-    "notes": "Notas (add/list/view/del)",
+from . import timing
+from .timing import span
+
+# Registro de comandos: nombre -> (módulo, help). Los módulos (cada uno expone
+# register_parser(subparsers) y run(args, cfg)) se importan solo al despacharlos.
+COMMANDS = {
+    "who-old": ("mycli.commands.who_old", "Navegar Doctor Who Clásico"),
+    "who-new": ("mycli.commands.who_new", "Navegar Doctor Who"),
+    "catalog": ("mycli.commands.catalog", "Todas las colecciones configuradas"),
+    "notes": ("mycli.commands.notes", "Notas (add/list/view/del/search)"),
+    "daemon": ("mycli.commands.daemon", "Proceso residente (start/stop/status)"),
 }
-
-def build_parser() -> argparse.ArgumentParser:
+COMMAND_HELP = {name: help_text for name, (_, help_text) in COMMANDS.items()}
+# opciones globales que consumen un valor (para no confundirlo con el subcomando)
+_GLOBAL_VALUE_OPTS = {"--config", "--player", "--profile"}
+
+def load_command(name: str):
+    """Importa (una sola vez) el módulo del comando name."""
+    return importlib.import_module(COMMANDS[name][0])
+
+def _peek_command(argv) -> str:
+    """Primer argumento posicional de argv si es un comando conocido (sin parsear todo)."""
+    skip = False
+    for tok in argv:
+        if skip:
+            skip = False
+            continue
+        if tok in _GLOBAL_VALUE_OPTS:
+            skip = True
+            continue
+        if tok.startswith('-'):
+            continue
+        return tok if tok in COMMANDS else None
+    return None
+
+def build_parser(argv=None) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog='mycli',
         description='Doctor Who y Notas',
@@ -27,14 +51,23 @@ def build_parser() -> argparse.ArgumentParser:
     )
     subparsers = parser.add_subparsers(dest='cmd')
 
-    for mod in COMMAND_MODULES:
-        # cada módulo debe exponer register_parser(subparsers)
-        mod.register_parser(subparsers)
+    # solo el comando pedido registra su parser completo; el resto queda como stub con su help
+    selected = _peek_command(argv or [])
+    for name, (_, help_text) in COMMANDS.items():
+        if name == selected:
+            with span(f"main.import.{name}"):
+                module = load_command(name)
+            module.register_parser(subparsers)
+        else:
+            subparsers.add_parser(name, help=help_text)
 
     # argumentos globales (help manual)
     parser.add_argument('-h', '--help', action='store_true', help='Mostrar este help personalizado')
     parser.add_argument('--config', help='Archivo config.json (sobrescribe búsqueda por defecto)')
     parser.add_argument('--player', help='Comando/ejecutable para reproducir vídeos (sobrescribe config)')
+    parser.add_argument('--timings', action='store_true', help='Al salir, imprimir en stderr el tiempo por fase')
+    parser.add_argument('--profile', metavar='ARCHIVO', help='Correr bajo cProfile y guardar las estadísticas en ARCHIVO')
+    parser.add_argument('--profile-memory', action='store_true', help='Con --profile: pico de memoria (tracemalloc) en ARCHIVO.mem.txt')
     return parser
 
 def print_custom_help() -> None:
@@ -48,6 +81,10 @@ def main(argv=None):
     if argv is None:
         argv = sys.argv[1:]
 
+    # antes de importar los comandos, para que @traced los envuelva
+    if timing.wanted(argv):
+        timing.enable()
+
     # Banner solo cuando no hay argumentos
     if len(argv) == 0:
         try:
@@ -55,59 +92,69 @@ def main(argv=None):
         except Exception:
             pass
 
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    with span("main.parse_args"):
+        parser = build_parser(argv)
+        args = parser.parse_args(argv)
 
+    if not timing.enabled():
+        return _dispatch(args)
+    try:
+        if args.profile:
+            with timing.Profiler(args.profile, memory=args.profile_memory):
+                return _dispatch(args)
+        return _dispatch(args)
+    finally:
+        if args.timings:
+            timing.report()
+
+def _dispatch(args):
     # Mostrar help personalizado si se solicita
     if getattr(args, 'help', False):
         print_custom_help()
         return
 
-    # Cargar configuración (load_config apunta a load_global_config por compatibilidad)
-    try:
-        cfg = load_config()
-    except ConfigError as e:
-        print("Error cargando configuración global:")
-        print(e)
-        return
-    except Exception as e:
-        print("Error inesperado cargando configuración:")
-        print(e)
-        return
+    # Cargar configuración por capas: global + --config + flags (vía snapshot si no cambió nada)
+    cli_overrides = {"player_cmd": getattr(args, 'player', None)}
+    cfg = None
+    with span("main.load_config"):
+        if getattr(args, 'config', None):
+            try:
+                cfg = load_layered_config(args.config, cli_overrides)
+            except ConfigError as ex:
+                print(f"Error cargando config {args.config}: {ex}")
+        try:
+            if cfg is None:
+                cfg = load_layered_config(None, cli_overrides)
+        except ConfigError as e:
+            print("Error cargando configuración global:")
+            print(e)
+            return
+        except Exception as e:
+            print("Error inesperado cargando configuración:")
+            print(e)
+            return
 
     # Mostrar de dónde vino la config (si el loader lo reporta)
-    try:
-        src = cfg.get("config_source")
-        if src:
-            print("Cargando config desde:", src)
-    except Exception:
-        pass
-
-    # Override con --config (archivo específico)
-    if getattr(args, 'config', None):
-        try:
-            override_path = Path(args.config)
-            override_text = override_path.read_text(encoding='utf-8')
-            cfg.update(json.loads(override_text))
-            print(f"Config override cargada desde: {override_path}")
-        except Exception as ex:
-            print(f"Error cargando config {args.config}: {ex}")
+    src = cfg.get("config_source")
+    if src:
+        print("Cargando config desde:", src, file=sys.stderr)
+    if cfg.get("config_override"):
+        print(f"Config override cargada desde: {cfg['config_override']}", file=sys.stderr)
 
-    # Override player desde CLI
-    if getattr(args, 'player', None):
-        cfg['player_cmd'] = args.player
+    if cfg.get("trace_path"):
+        from . import trace
+        trace.configure(cfg["trace_path"])
 
     # Si no hay subcomando, imprimimos help minimal
     if args.cmd is None:
         print_custom_help()
         return
 
-    # Despachar al comando correcto
-    for mod in COMMAND_MODULES:
-        name = mod.__name__.split('.')[-1]
-        if args.cmd == name.replace('_', '-'):
-            mod.run(args, cfg)
-            return
+    # Despachar al comando correcto (import diferido)
+    if args.cmd in COMMANDS:
+        with span(f"cmd.{args.cmd}"):
+            load_command(args.cmd).run(args, cfg)
+        return
 
     print("Comando no reconocido.")
 
@@ -0,0 +1,337 @@
+# src/mycli/media_probe.py
+"""
+Metadatos de video (duración, resolución, contenedor) leyendo solo cabeceras.
+
+Sin ffprobe: cada contenedor se recorre por sus cajas/elementos con lecturas
+acotadas y seek, sin leer los datos de video:
+
+  - MP4/MOV: átomos moov -> mvhd (duración) y trak -> tkhd (ancho x alto).
+  - Matroska/WebM: EBML -> Segment -> Info (duración) y Tracks -> Video.
+  - AVI: RIFF -> hdrl -> avih (us por cuadro, cuadros, ancho x alto).
+
+El resto de VIDEO_EXTS queda solo con el contenedor. Los resultados se
+guardan en media_probe.json (junto al índice de biblioteca) con clave
+ruta -> (tamaño, mtime): en una visita repetida cada episodio es un stat y
+una búsqueda en el diccionario.
+"""
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+PROBE_VERSION = 1
+PROBE_FILENAME = "media_probe.json"
+PROBE_WORKERS = 8
+# nunca se lee más que esto de una cabecera (moov de películas largas incluido)
+MAX_HEADER = 16 * 1024 * 1024
+
+
+class MediaInfo(NamedTuple):
+    container: str
+    duration: Optional[float] = None   # segundos
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+def probe_cache_path(cfg: Optional[Dict[str, Any]] = None) -> Path:
+    """media_probe.json junto al índice de biblioteca."""
+    from .library import library_index_path
+    return library_index_path(cfg).with_name(PROBE_FILENAME)
+
+
+# ---------- MP4 / MOV ----------
+def _boxes(fh, start: int, end: int):
+    """(tipo, inicio de datos, fin) de cada caja entre start y end, solo leyendo cabeceras."""
+    pos = start
+    while pos + 8 <= end:
+        fh.seek(pos)
+        head = fh.read(16)
+        if len(head) < 8:
+            return
+        size, kind = struct.unpack(">I4s", head[:8])
+        data = pos + 8
+        if size == 1:
+            if len(head) < 16:
+                return
+            size = struct.unpack(">Q", head[8:16])[0]
+            data = pos + 16
+        elif size == 0:
+            size = end - pos
+        if size < data - pos:
+            return
+        yield kind, data, min(pos + size, end)
+        pos += size
+
+
+def _probe_mp4(fh, file_size: int, container: str) -> MediaInfo:
+    duration = width = height = None
+    for kind, start, end in _boxes(fh, 0, file_size):
+        if kind != b"moov":
+            continue
+        end = min(end, start + MAX_HEADER)
+        for sub, s_start, s_end in _boxes(fh, start, end):
+            if sub == b"mvhd":
+                fh.seek(s_start)
+                body = fh.read(32)
+                if body[:1] == b"\x01":
+                    scale, dur = struct.unpack(">IQ", body[20:32])
+                else:
+                    scale, dur = struct.unpack(">II", body[12:20])
+                if scale:
+                    duration = dur / scale
+            elif sub == b"trak":
+                for leaf, l_start, _ in _boxes(fh, s_start, s_end):
+                    if leaf != b"tkhd":
+                        continue
+                    fh.seek(l_start)
+                    body = fh.read(96)
+                    off = 88 if body[:1] == b"\x01" else 76
+                    if len(body) >= off + 8:
+                        w, h = struct.unpack(">II", body[off:off + 8])
+                        # 16.16 punto fijo; la pista de video es la de mayor ancho
+                        if (w >> 16) > (width or 0):
+                            width, height = w >> 16, h >> 16
+        break
+    return MediaInfo(container, duration, width, height)
+
+
+# ---------- Matroska / WebM ----------
+_EBML = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_TRACKS = 0x1654AE6B
+_CLUSTER = 0x1F43B675
+_DOCTYPE = 0x4282
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_TRACK_ENTRY = 0xAE
+_VIDEO = 0xE0
+_PIXEL_WIDTH = 0xB0
+_PIXEL_HEIGHT = 0xBA
+
+
+def _vint(fh, keep_marker: bool):
+    """Entero de largo variable EBML; (valor, bytes leídos). Tamaño 'desconocido' -> None."""
+    first = fh.read(1)
+    if not first:
+        raise EOFError
+    b = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not b & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("vint inválido")
+    value = b if keep_marker else b & (mask - 1)
+    rest = fh.read(length - 1)
+    if len(rest) < length - 1:
+        raise EOFError
+    for c in rest:
+        value = (value << 8) | c
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, length
+    return value, length
+
+
+def _elements(fh, start: int, end: int):
+    """(id, inicio de datos, fin) de cada elemento EBML entre start y end."""
+    pos = start
+    while pos < end:
+        fh.seek(pos)
+        try:
+            eid, n1 = _vint(fh, True)
+            size, n2 = _vint(fh, False)
+        except (EOFError, ValueError):
+            return
+        data = pos + n1 + n2
+        stop = end if size is None else min(data + size, end)
+        yield eid, data, stop
+        if size is None:
+            return
+        pos = stop
+
+
+def _read_uint(fh, start: int, end: int) -> int:
+    fh.seek(start)
+    return int.from_bytes(fh.read(min(end - start, 8)), "big")
+
+
+def _probe_mkv(fh, file_size: int, container: str) -> MediaInfo:
+    duration = width = height = None
+    for eid, start, end in _elements(fh, 0, file_size):
+        if eid == _EBML:
+            for sub, s_start, s_end in _elements(fh, start, end):
+                if sub == _DOCTYPE:
+                    fh.seek(s_start)
+                    doctype = fh.read(min(s_end - s_start, 16)).rstrip(b"\0").decode("ascii", "replace")
+                    container = "webm" if doctype == "webm" else "mkv"
+        elif eid == _SEGMENT:
+            scale = 1_000_000
+            raw_duration = None
+            for sub, s_start, s_end in _elements(fh, start, end):
+                if sub == _INFO:
+                    for leaf, l_start, l_end in _elements(fh, s_start, s_end):
+                        if leaf == _TIMECODE_SCALE:
+                            scale = _read_uint(fh, l_start, l_end)
+                        elif leaf == _DURATION:
+                            fh.seek(l_start)
+                            raw = fh.read(l_end - l_start)
+                            if len(raw) in (4, 8):
+                                raw_duration = struct.unpack(">f" if len(raw) == 4 else ">d", raw)[0]
+                elif sub == _TRACKS:
+                    for entry, e_start, e_end in _elements(fh, s_start, s_end):
+                        if entry != _TRACK_ENTRY:
+                            continue
+                        for item, i_start, i_end in _elements(fh, e_start, e_end):
+                            if item != _VIDEO:
+                                continue
+                            for px, p_start, p_end in _elements(fh, i_start, i_end):
+                                if px == _PIXEL_WIDTH:
+                                    width = _read_uint(fh, p_start, p_end)
+                                elif px == _PIXEL_HEIGHT:
+                                    height = _read_uint(fh, p_start, p_end)
+                elif sub == _CLUSTER or s_start - start > MAX_HEADER:
+                    # empiezan los datos: Info y Tracks ya quedaron atrás
+                    break
+            if raw_duration is not None:
+                duration = raw_duration * scale / 1e9
+            break
+    return MediaInfo(container, duration, width, height)
+
+
+# ---------- AVI ----------
+def _probe_avi(fh, file_size: int, container: str) -> MediaInfo:
+    # RIFF....AVI LIST....hdrl avih....<56 bytes>
+    fh.seek(12)
+    head = fh.read(12 + 8 + 56)
+    if len(head) < 76 or head[:4] != b"LIST" or head[8:12] != b"hdrl" or head[12:16] != b"avih":
+        return MediaInfo(container)
+    avih = head[20:76]
+    us_per_frame, _, _, _, frames = struct.unpack("<5I", avih[:20])
+    width, height = struct.unpack("<II", avih[32:40])
+    duration = us_per_frame * frames / 1e6 if us_per_frame and frames else None
+    return MediaInfo(container, duration, width or None, height or None)
+
+
+def probe_file(path) -> Optional[MediaInfo]:
+    """MediaInfo de un video leyendo solo su cabecera; None si no se puede abrir."""
+    ext = os.path.splitext(str(path))[1].lower().lstrip(".")
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            magic = fh.read(12)
+            if magic[4:8] == b"ftyp":
+                return _probe_mp4(fh, size, "mov" if magic[8:10] == b"qt" else "mp4")
+            if magic[:4] == b"\x1a\x45\xdf\xa3":
+                return _probe_mkv(fh, size, "webm" if ext == "webm" else "mkv")
+            if magic[:4] == b"RIFF" and magic[8:12] == b"AVI ":
+                return _probe_avi(fh, size, "avi")
+            if ext in ("mp4", "mov", "m4v"):
+                # MOV antiguos sin ftyp (moov/mdat/wide al principio)
+                return _probe_mp4(fh, size, ext)
+            return MediaInfo(ext or "?")
+    except OSError:
+        return None
+    except (struct.error, ValueError, EOFError):
+        # cabecera truncada o rara: al menos el contenedor
+        return MediaInfo(ext or "?")
+
+
+# ---------- caché ----------
+class ProbeCache:
+    """ruta -> [tamaño, mtime_ns, contenedor, duración, ancho, alto], validado por stat."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.files: Dict[str, List[Any]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "ProbeCache":
+        cache = cls(path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data.get("version") == PROBE_VERSION and isinstance(data.get("files"), dict):
+                cache.files = data["files"]
+        except Exception:
+            pass
+        return cache
+
+    def save(self) -> None:
+        """Escribe el caché si hubo cambios (escritura atómica vía archivo temporal)."""
+        if not self._dirty or self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps({"version": PROBE_VERSION, "files": self.files}, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as ex:
+            print(f"No pude guardar el caché de metadatos '{self.path}': {ex}")
+
+    def probe_many(self, paths: Iterable, workers: int = PROBE_WORKERS) -> Dict[str, Optional[MediaInfo]]:
+        """
+        MediaInfo de cada ruta: del caché si (tamaño, mtime) coinciden; las demás se leen
+        en un pool de hilos (lecturas cortas, sobre todo latencia de disco/red).
+        """
+        result: Dict[str, Optional[MediaInfo]] = {}
+        stale = []
+        for p in paths:
+            key = str(p)
+            try:
+                st = os.stat(key)
+            except OSError:
+                result[key] = None
+                continue
+            entry = self.files.get(key)
+            if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                result[key] = MediaInfo(*entry[2:])
+            else:
+                stale.append((key, st.st_size, st.st_mtime_ns))
+        if stale:
+            if workers <= 1 or len(stale) == 1:
+                infos = [probe_file(k) for k, _, _ in stale]
+            else:
+                with ThreadPoolExecutor(max_workers=min(workers, len(stale))) as pool:
+                    infos = list(pool.map(probe_file, [k for k, _, _ in stale]))
+            for (key, size, mtime), info in zip(stale, infos):
+                result[key] = info
+                if info is not None:
+                    self.files[key] = [size, mtime, *info]
+                    self._dirty = True
+        return result
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """'1:02:03' / '42:10'; '' si no se conoce."""
+    if seconds is None:
+        return ""
+    total = int(round(seconds))
+    h, rest = divmod(total, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def describe(info: Optional[MediaInfo]) -> str:
+    """'42:10 · 1920x1080 · mkv' con lo que se conozca."""
+    if info is None:
+        return ""
+    parts = [format_duration(info.duration)]
+    if info.width and info.height:
+        parts.append(f"{info.width}x{info.height}")
+    parts.append(info.container)
+    return " · ".join(p for p in parts if p)
+
+
+__all__ = [
+    "MediaInfo",
+    "ProbeCache",
+    "probe_file",
+    "probe_cache_path",
+    "format_duration",
+    "describe",
+]
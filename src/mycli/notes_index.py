@@ -0,0 +1,162 @@
+# src/mycli/notes_index.py
+"""
+Índice invertido persistente para `notes search`.
+
+Es una base sqlite junto a la carpeta de notas (<notes_path>.search.sqlite3,
+fuera de la carpeta para no aparecer como una nota más). Por cada nota se
+guarda su mtime y tamaño: al actualizar solo se vuelven a tokenizar las notas
+que cambiaron. Las postings están agrupadas por token, así que una búsqueda
+lee solo las filas de sus términos, sin cargar el índice ni leer los cuerpos.
+Los tokens se normalizan como _norm_name (sin acentos, minúsculas).
+"""
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .classify import _norm_name
+
+INDEX_SUFFIX = ".search.sqlite3"
+
+# parámetros BM25
+_K1 = 1.2
+_B = 0.75
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# _norm_name sin memoizar: los cuerpos de notas no deben quedar en la caché
+_norm_text = getattr(_norm_name, "__wrapped__", _norm_name)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(_norm_text(text))
+
+
+def notes_index_path(notes_path) -> Path:
+    p = Path(notes_path)
+    return p.with_name(p.name + INDEX_SUFFIX)
+
+
+class NotesSearchIndex:
+    """Postings token -> (nota, frecuencia), validadas por mtime/tamaño de cada nota."""
+
+    def __init__(self, path):
+        import sqlite3  # solo lo paga quien usa notes search
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        # el índice se puede reconstruir desde las notas: no hace falta fsync por transacción
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " name TEXT PRIMARY KEY, mtime INTEGER NOT NULL, size INTEGER NOT NULL, len INTEGER NOT NULL);"
+            # dlen repetido en cada posting para puntuar sin consultar docs
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " token TEXT NOT NULL, name TEXT NOT NULL, tf INTEGER NOT NULL, dlen INTEGER NOT NULL,"
+            " PRIMARY KEY (token, name)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_name ON postings(name);"
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def remove(self, names: Iterable[str]) -> None:
+        names = [(n,) for n in names]
+        with self.conn:
+            self.conn.executemany("DELETE FROM postings WHERE name = ?", names)
+            self.conn.executemany("DELETE FROM docs WHERE name = ?", names)
+
+    def add_many(self, notes: Iterable[Tuple[str, str, int, int]]) -> int:
+        """Indexa (nombre, texto, mtime_ns, tamaño) en una transacción; el nombre del archivo cuenta como texto."""
+        n = 0
+        with self.conn:
+            for name, text, mtime_ns, size in notes:
+                counts = Counter(tokenize(os.path.splitext(name)[0] + "\n" + text))
+                dlen = sum(counts.values())
+                self.conn.execute("INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?)", (name, mtime_ns, size, dlen))
+                self.conn.executemany("INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?)",
+                                      [(tok, name, tf, dlen) for tok, tf in counts.items()])
+                n += 1
+        return n
+
+    def update(self, notes_dir, pack=None) -> int:
+        """
+        Sincroniza con la carpeta (y con el NotesPack pack, si se da): reindexa notas nuevas
+        o modificadas y quita las borradas. Devuelve cuántas notas cambiaron.
+        mtime y tamaño salen siempre del scandir: editar una nota no cambia el mtime de la carpeta.
+        """
+        entries = {}
+        try:
+            with os.scandir(notes_dir) as it:
+                for e in it:
+                    if e.is_file():
+                        st = e.stat()
+                        entries[e.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        packed = {n: pack.stat(n) for n in pack.notes if n not in entries} if pack is not None else {}
+        entries.update(packed)
+        known = {name: (mtime, size) for name, mtime, size in self.conn.execute("SELECT name, mtime, size FROM docs")}
+        stale = {n for n, sig in known.items() if entries.get(n) != sig}
+        self.remove(stale)
+        pending = [n for n in entries if n not in known or n in stale]
+
+        def read_all():
+            for name in pending:
+                mtime, size = entries[name]
+                try:
+                    if name in packed:
+                        text = pack.read_text(name)
+                    else:
+                        text = Path(notes_dir, name).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    continue
+                yield name, text, mtime, size
+
+        self.add_many(read_all())
+        return len(stale.union(pending))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Notas que contienen todos los términos, ordenadas por puntuación BM25."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        n_docs, avg_len = self.conn.execute("SELECT COUNT(*), AVG(len) FROM docs").fetchone()
+        if not n_docs:
+            return []
+        avg_len = avg_len or 1.0
+        postings = []
+        for t in terms:
+            rows = self.conn.execute("SELECT name, tf, dlen FROM postings WHERE token = ?", (t,)).fetchall()
+            if not rows:
+                return []
+            postings.append(rows)
+        # intersección empezando por la lista más corta
+        postings.sort(key=len)
+        hits = {name for name, _, _ in postings[0]}
+        for rows in postings[1:]:
+            hits.intersection_update(name for name, _, _ in rows)
+        scores = dict.fromkeys(hits, 0.0)
+        for rows in postings:
+            idf = math.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            for name, tf, dlen in rows:
+                if name in scores:
+                    scores[name] += idf * tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * dlen / avg_len))
+        key = lambda kv: (-kv[1], kv[0])
+        if limit:
+            return heapq.nsmallest(limit, scores.items(), key=key)
+        return sorted(scores.items(), key=key)
+
+
+__all__ = ["NotesSearchIndex", "notes_index_path", "tokenize", "INDEX_SUFFIX"]
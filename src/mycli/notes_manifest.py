@@ -0,0 +1,189 @@
+# src/mycli/notes_manifest.py
+"""
+Manifest de notas con IDs estables (<notes_path>.manifest.json, junto a la carpeta).
+
+Cada nota tiene un ID que no cambia al agregar o borrar otras. Por ID se
+guarda nombre de archivo, mtime, tamaño y título (primera línea), así
+`notes list` se dibuja sin un stat por archivo y `notes view 123` es una
+búsqueda directa. add/edit/del actualizan el manifest; además cada carga lo
+concilia con la carpeta en un solo scandir (un stat por nota: editar una nota
+por fuera no cambia el mtime de la carpeta) y solo lee el título de las notas
+nuevas o modificadas. La primera vez los IDs siguen el orden por nombre,
+así que coinciden con los índices que mostraba `notes list`. Las notas
+empaquetadas (notes pack) conservan su ID con "packed": true y no se
+esperan en la carpeta.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import resident
+from . import trace
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+TITLE_LEN = 60
+
+
+def notes_manifest_path(notes_path) -> Path:
+    p = Path(notes_path)
+    return p.with_name(p.name + MANIFEST_SUFFIX)
+
+
+def title_of(text: str) -> str:
+    """Primera línea no vacía, recortada."""
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return line[:TITLE_LEN]
+    return ""
+
+
+def _read_title(path: Path) -> str:
+    # solo el principio del archivo: basta para la primera línea
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            return title_of(fh.read(4096))
+    except OSError:
+        return ""
+
+
+class NotesManifest:
+    """IDs estables -> {name, mtime, size, title}, validado contra la carpeta en cada carga."""
+
+    def __init__(self, notes_dir, path: Optional[Path] = None):
+        self.notes_dir = Path(notes_dir)
+        self.path = Path(path) if path else notes_manifest_path(notes_dir)
+        self.notes: Dict[int, Dict[str, Any]] = {}
+        self.next_id = 1
+        self._by_name: Dict[str, int] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, notes_dir, path: Optional[Path] = None) -> "NotesManifest":
+        """Carga el manifest y lo concilia con la carpeta."""
+        m_path = Path(path) if path else notes_manifest_path(notes_dir)
+        # en el daemon el manifest queda en memoria; igual se reconcilia con la carpeta
+        m = resident.cached(("notes-manifest", str(m_path)), [m_path], lambda: cls._read(notes_dir, path))
+        m.reconcile()
+        return m
+
+    @classmethod
+    def _read(cls, notes_dir, path: Optional[Path] = None) -> "NotesManifest":
+        m = cls(notes_dir, path)
+        try:
+            data = json.loads(m.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                m.notes = {int(k): v for k, v in data["notes"].items()}
+                m.next_id = int(data["next_id"])
+        except Exception:
+            pass
+        m._by_name = {e["name"]: i for i, e in m.notes.items()}
+        return m
+
+    def save(self) -> None:
+        """Escribe el manifest si hubo cambios (escritura atómica vía archivo temporal)."""
+        if not self._dirty:
+            return
+        try:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            data = {"version": MANIFEST_VERSION, "next_id": self.next_id,
+                    "notes": {str(i): e for i, e in self.notes.items()}}
+            tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as ex:
+            print(f"No pude guardar el manifest de notas '{self.path}': {ex}")
+
+    def reconcile(self) -> bool:
+        """
+        Agrega notas nuevas, quita las que ya no están y vuelve a registrar las que
+        cambiaron de mtime o tamaño (editadas por fuera). Devuelve si hubo cambios.
+        """
+        t0 = time.perf_counter()
+        found: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.notes_dir) as it:
+                for e in it:
+                    if e.is_file():
+                        st = e.stat()
+                        found[e.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            found = {}
+        if trace.enabled():
+            trace.event("dir_listed", path=str(self.notes_dir), entries=len(found), ms=trace.ms_since(t0))
+        changed = False
+        for name in [n for n, i in self._by_name.items() if n not in found and not self.notes[i].get("packed")]:
+            del self.notes[self._by_name.pop(name)]
+            changed = True
+        for name in sorted(found):
+            nid = self._by_name.get(name)
+            entry = self.notes[nid] if nid is not None else None
+            if entry is not None and (entry.get("packed") or (entry["mtime"], entry["size"]) == found[name]):
+                continue
+            self._register(name, sig=found[name])
+            changed = True
+        if changed:
+            self._dirty = True
+        return changed
+
+    def _register(self, name: str, content: Optional[str] = None, sig: Optional[Tuple[int, int]] = None) -> int:
+        path = self.notes_dir / name
+        if sig is not None:
+            mtime, size = sig
+        else:
+            try:
+                st = os.stat(path)
+                mtime, size = st.st_mtime_ns, st.st_size
+            except OSError:
+                mtime, size = 0, 0
+        nid = self._by_name.get(name)
+        if nid is None:
+            nid = self.next_id
+            self.next_id += 1
+            self._by_name[name] = nid
+        title = title_of(content) if content is not None else _read_title(path)
+        self.notes[nid] = {"name": name, "mtime": mtime, "size": size, "title": title}
+        self._dirty = True
+        return nid
+
+    def record_write(self, name: str, content: Optional[str] = None) -> int:
+        """Registra una nota recién creada o editada (content evita releerla). Devuelve su ID."""
+        return self._register(name, content)
+
+    def set_packed(self, name: str, packed: bool) -> None:
+        """Marca una nota como empaquetada (ya no está en la carpeta) o suelta otra vez."""
+        nid = self._by_name.get(name)
+        if nid is None:
+            return
+        if packed:
+            self.notes[nid]["packed"] = True
+        else:
+            self.notes[nid].pop("packed", None)
+        self._dirty = True
+
+    def record_delete(self, nid: int) -> None:
+        entry = self.notes.pop(nid, None)
+        if entry is not None:
+            self._by_name.pop(entry["name"], None)
+            self._dirty = True
+
+    def get(self, nid: int) -> Optional[Dict[str, Any]]:
+        return self.notes.get(nid)
+
+    def path_of(self, nid: int) -> Optional[Path]:
+        """Archivo suelto de la nota; None si no existe el ID o la nota está empaquetada."""
+        entry = self.notes.get(nid)
+        return self.notes_dir / entry["name"] if entry and not entry.get("packed") else None
+
+    def id_of(self, name: str) -> Optional[int]:
+        return self._by_name.get(name)
+
+    def entries(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """(ID, entrada) ordenados por ID."""
+        return sorted(self.notes.items())
+
+
+__all__ = ["NotesManifest", "notes_manifest_path", "title_of", "MANIFEST_SUFFIX"]
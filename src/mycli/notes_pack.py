@@ -0,0 +1,280 @@
+# src/mycli/notes_pack.py
+"""
+Archivo empaquetado de notas (<notes_path>.pack, junto a la carpeta).
+
+`notes pack` mueve notas sueltas a un único archivo de solo-agregar: cada
+nota es un registro con su propia compresión (zlib o lzma) y un índice
+aparte (<notes_path>.pack.idx.json) guarda nombre -> offset, así que leer una
+nota empaquetada es un seek a su registro y la descompresión solo de ese
+registro, por bloques. Borrar o desempaquetar agrega una marca de borrado;
+si el índice se pierde o no coincide con el tamaño del pack, se reconstruye
+recorriendo las cabeceras de los registros.
+
+Formato de registro: cabecera fija (_REC) + nombre UTF-8 + datos comprimidos.
+"""
+import io
+import json
+import lzma
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from . import resident
+
+PACK_SUFFIX = ".pack"
+INDEX_SUFFIX = ".pack.idx.json"
+INDEX_VERSION = 1
+PACK_MAGIC = b"OHMYPACK\x01"
+
+CODECS = {"zlib": 0, "lzma": 1}
+_TOMBSTONE = 255
+
+# magia, códec, largo del nombre, mtime_ns, tamaño original, largo comprimido
+_REC = struct.Struct(">4sBHqQQ")
+_REC_MAGIC = b"NREC"
+
+CHUNK = 64 * 1024
+
+
+def notes_pack_path(notes_path) -> Path:
+    p = Path(notes_path)
+    return p.with_name(p.name + PACK_SUFFIX)
+
+
+def _compressor(codec: int):
+    return zlib.compressobj(6) if codec == CODECS["zlib"] else lzma.LZMACompressor()
+
+
+def _decompressor(codec: int):
+    return zlib.decompressobj() if codec == CODECS["zlib"] else lzma.LZMADecompressor()
+
+
+class _RecordReader(io.RawIOBase):
+    """Contenido descomprimido de un registro, leído por bloques desde su offset."""
+
+    def __init__(self, fh, length: int, codec: int):
+        self._fh = fh
+        self._left = length
+        self._lzma = codec == CODECS["lzma"]
+        self._dec = _decompressor(codec)
+
+    def readable(self) -> bool:
+        return True
+
+    def _feed(self) -> bytes:
+        """Siguiente bloque comprimido del registro (b"" al terminarlo)."""
+        if self._left <= 0:
+            return b""
+        chunk = self._fh.read(min(CHUNK, self._left))
+        self._left = self._left - len(chunk) if chunk else 0
+        return chunk
+
+    def readinto(self, b) -> int:
+        # salida acotada a len(b) (max_length): un bloque muy comprimible no se infla entero
+        # en memoria; la entrada sobrante queda en unconsumed_tail (zlib) o dentro del
+        # descompresor hasta que pida más (lzma, needs_input)
+        while len(b) and not self._dec.eof:
+            if self._lzma:
+                data = self._feed() if self._dec.needs_input else b""
+                if not data and self._dec.needs_input:
+                    return 0  # registro truncado
+            else:
+                data = self._dec.unconsumed_tail or self._feed()
+            out = self._dec.decompress(data, len(b))
+            if out:
+                b[:len(out)] = out
+                return len(out)
+            if not data and not self._lzma:
+                return 0
+        return 0
+
+    def close(self) -> None:
+        if not self.closed:
+            self._fh.close()
+        super().close()
+
+
+class NotesPack:
+    """Registros comprimidos de notas + índice nombre -> (offset, largo comprimido, tamaño, mtime, códec)."""
+
+    def __init__(self, notes_path):
+        self.path = notes_pack_path(notes_path)
+        self.index_path = Path(notes_path).with_name(Path(notes_path).name + INDEX_SUFFIX)
+        self.notes: Dict[str, List[int]] = {}
+        # cabecera ilegible: se trata como vacío y no se le agregan registros
+        self.corrupt = False
+        # fin del último registro sano si el pack quedó truncado (se corta ahí al agregar)
+        self._tail = None
+        self._dirty = False
+
+    @classmethod
+    def load(cls, notes_path) -> "NotesPack":
+        probe = cls(notes_path)
+        return resident.cached(("notes-pack", str(probe.path)), [probe.path, probe.index_path], lambda: cls._read(notes_path))
+
+    @classmethod
+    def _read(cls, notes_path) -> "NotesPack":
+        pack = cls(notes_path)
+        try:
+            size = pack.path.stat().st_size
+        except OSError:
+            return pack
+        try:
+            data = json.loads(pack.index_path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION and data.get("pack_size") == size:
+                pack.notes = data["notes"]
+                return pack
+        except Exception:
+            pass
+        try:
+            pack.rebuild_index()
+        except (OSError, ValueError) as ex:
+            print(f"No pude leer el pack de notas: {ex}; se trata como vacío.")
+            pack.notes = {}
+            pack.corrupt = True
+            pack._dirty = False
+        return pack
+
+    def rebuild_index(self) -> None:
+        """
+        Reconstruye el índice leyendo solo las cabeceras (los datos se saltan con seek).
+        ValueError si el archivo no es un pack; un registro truncado o ilegible se informa
+        y el índice queda con los registros anteriores.
+        """
+        self.notes = {}
+        self._tail = None
+        with open(self.path, "rb") as fh:
+            if fh.read(len(PACK_MAGIC)) != PACK_MAGIC:
+                raise ValueError(f"No es un pack de notas: {self.path}")
+            end = os.fstat(fh.fileno()).st_size
+            while True:
+                start = fh.tell()
+                head = fh.read(_REC.size)
+                if not head:
+                    break
+                try:
+                    if len(head) < _REC.size:
+                        raise ValueError("cabecera incompleta")
+                    magic, codec, name_len, mtime, size, clen = _REC.unpack(head)
+                    if magic != _REC_MAGIC:
+                        raise ValueError("cabecera inválida")
+                    raw = fh.read(name_len)
+                    offset = fh.tell()
+                    if len(raw) < name_len or offset + clen > end:
+                        raise ValueError("registro incompleto")
+                    name = raw.decode("utf-8")
+                except ValueError as ex:
+                    print(f"Pack de notas dañado en el byte {start} ({ex}): se ignora desde ahí.")
+                    self._tail = start
+                    break
+                if codec == _TOMBSTONE:
+                    self.notes.pop(name, None)
+                else:
+                    self.notes[name] = [offset, clen, size, mtime, codec]
+                fh.seek(clen, os.SEEK_CUR)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Escribe el índice si hubo cambios; si el pack quedó sin notas, borra pack e índice."""
+        if not self._dirty:
+            return
+        try:
+            if not self.notes:
+                self.path.unlink(missing_ok=True)
+                self.index_path.unlink(missing_ok=True)
+            else:
+                data = {"version": INDEX_VERSION, "pack_size": self.path.stat().st_size, "notes": self.notes}
+                tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+                tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp, self.index_path)
+            self._dirty = False
+        except Exception as ex:
+            print(f"No pude guardar el índice del pack '{self.index_path}': {ex}")
+
+    def _open_append(self):
+        """
+        Pack abierto para escribir al final (se crea con su cabecera si no existe). Una cola
+        truncada se descarta antes, para que los registros nuevos queden alcanzables.
+        """
+        if self.corrupt:
+            raise ValueError(f"No es un pack de notas: {self.path}")
+        fh = open(self.path, "r+b" if self.path.exists() else "w+b")
+        if self._tail is not None:
+            fh.truncate(self._tail)
+            self._tail = None
+        if fh.seek(0, os.SEEK_END) == 0:
+            fh.write(PACK_MAGIC)
+        return fh
+
+    def add_files(self, files: Iterable[Path], codec: str = "zlib") -> List[str]:
+        """Agrega cada archivo como un registro (compresión por bloques). Devuelve los nombres agregados."""
+        code = CODECS[codec]
+        added = []
+        with self._open_append() as fh:
+            for src in files:
+                src = Path(src)
+                st = src.stat()
+                name = src.name.encode("utf-8")
+                start = fh.tell()
+                fh.write(_REC.pack(_REC_MAGIC, code, len(name), st.st_mtime_ns, st.st_size, 0))
+                fh.write(name)
+                offset = fh.tell()
+                comp = _compressor(code)
+                with open(src, "rb") as inp:
+                    for chunk in iter(lambda: inp.read(CHUNK), b""):
+                        fh.write(comp.compress(chunk))
+                fh.write(comp.flush())
+                end = fh.tell()
+                # completar el largo comprimido en la cabecera
+                fh.seek(start)
+                fh.write(_REC.pack(_REC_MAGIC, code, len(name), st.st_mtime_ns, st.st_size, end - offset))
+                fh.seek(end)
+                self.notes[src.name] = [offset, end - offset, st.st_size, st.st_mtime_ns, code]
+                added.append(src.name)
+        self._dirty = True
+        return added
+
+    def remove(self, names: Iterable[str]) -> None:
+        """Quita notas del pack agregando marcas de borrado (el espacio no se recupera)."""
+        names = [n for n in names if n in self.notes]
+        if not names:
+            return
+        with self._open_append() as fh:
+            for n in names:
+                raw = n.encode("utf-8")
+                fh.write(_REC.pack(_REC_MAGIC, _TOMBSTONE, len(raw), 0, 0, 0))
+                fh.write(raw)
+                del self.notes[n]
+        self._dirty = True
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.notes
+
+    def stat(self, name: str) -> Tuple[int, int]:
+        """(mtime_ns, tamaño original) de una nota empaquetada."""
+        _, _, size, mtime, _ = self.notes[name]
+        return mtime, size
+
+    def open_binary(self, name: str):
+        """Lector binario del contenido de una nota: seek directo a su registro."""
+        offset, clen, _, _, codec = self.notes[name]
+        fh = open(self.path, "rb")
+        fh.seek(offset)
+        return io.BufferedReader(_RecordReader(fh, clen, codec), CHUNK)
+
+    def read_text(self, name: str) -> str:
+        with io.TextIOWrapper(self.open_binary(name), encoding="utf-8", errors="replace") as fh:
+            return fh.read()
+
+    def extract(self, name: str, dest: Path) -> None:
+        """Escribe la nota en dest por bloques y le devuelve su mtime original."""
+        mtime, _ = self.stat(name)
+        with self.open_binary(name) as src, open(dest, "wb") as out:
+            for chunk in iter(lambda: src.read(CHUNK), b""):
+                out.write(chunk)
+        os.utime(dest, ns=(mtime, mtime))
+
+
+__all__ = ["NotesPack", "notes_pack_path", "CODECS", "PACK_SUFFIX"]
@@ -0,0 +1,145 @@
+# src/mycli/notes_transfer.py
+"""
+Exportar / importar notas en bloque como tar o JSON Lines (opcionalmente gzip).
+
+Las notas se procesan de a una: el tar se escribe y se lee en modo stream
+("w|" / "r|"), copiando cada nota por bloques, y en JSON Lines cada línea es
+una nota {"name", "mtime", "text"}. La memoria no crece con la cantidad de
+notas; el manifest se actualiza en memoria y lo guarda quien llama, una vez.
+"""
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+
+FORMATS = ("jsonl", "tar")
+CHUNK = 64 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _peek(stream: BinaryIO, n: int) -> Tuple[BinaryIO, bytes]:
+    """Primeros n bytes sin consumirlos (envuelve el stream si no admite peek)."""
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream, CHUNK)
+    return stream, stream.peek(n)[:n]
+
+
+def detect_format(stream: BinaryIO) -> Tuple[BinaryIO, str, bool]:
+    """(stream, formato, gzip) mirando los primeros bytes: JSON Lines empieza con '{'."""
+    stream, head = _peek(stream, 2)
+    gz = head == _GZIP_MAGIC
+    if gz:
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+        stream, head = _peek(stream, 1)
+    return stream, ("jsonl" if head.lstrip()[:1] in (b"{", b"") else "tar"), gz
+
+
+# ---------- export ----------
+def export_notes(notes: Iterator[Tuple[str, int, int, Callable[[], BinaryIO]]], out: BinaryIO,
+                 fmt: str = "jsonl", compress: bool = False) -> int:
+    """
+    Escribe notes (nombre, mtime_ns, tamaño, abrir) en out. abrir() devuelve un lector
+    binario del contenido (archivo suelto o registro del pack). Devuelve cuántas se exportaron.
+    """
+    count = 0
+    if fmt == "tar":
+        with tarfile.open(fileobj=out, mode="w|gz" if compress else "w|") as tar:
+            for name, mtime, size, opener in notes:
+                info = tarfile.TarInfo(name)
+                info.size = size
+                info.mtime = mtime // 1_000_000_000
+                with opener() as src:
+                    tar.addfile(info, src)
+                count += 1
+        return count
+
+    sink = gzip.GzipFile(fileobj=out, mode="wb") if compress else out
+    try:
+        for name, mtime, size, opener in notes:
+            with opener() as src:
+                text = src.read().decode("utf-8", errors="replace")
+            sink.write(json.dumps({"name": name, "mtime": mtime, "text": text}, ensure_ascii=False).encode("utf-8") + b"\n")
+            count += 1
+    finally:
+        if sink is not out:
+            sink.close()
+    return count
+
+
+# ---------- import ----------
+def import_notes(notes_dir: Path, stream: BinaryIO, fmt: Optional[str] = None, overwrite: bool = False,
+                 safe_name: Callable[[str], Optional[str]] = None,
+                 packed: Optional[Callable[[str], bool]] = None,
+                 invalid: Callable[[str], None] = print) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Escribe en notes_dir cada nota de stream y va devolviendo (nombre, texto o None).
+    Con fmt None se detecta el formato (y gzip). Sin overwrite, los nombres existentes se
+    saltan: sueltos en la carpeta o empaquetados (packed(nombre)); al sobrescribir una nota
+    empaquetada, quien llama debe sacarla del pack. Un registro inválido (JSON roto, nombre
+    vacío, "." / ".." o el de una carpeta) se informa con invalid(mensaje) y se salta; un tar
+    ilegible corta la importación (lo ya escrito queda).
+    """
+    stream, detected, _ = detect_format(stream)
+    fmt = fmt or detected
+    notes_dir = Path(notes_dir)
+
+    def target(raw: str, where: str) -> Optional[Path]:
+        name = os.path.basename(raw)
+        name = safe_name(name) if safe_name and name else name
+        if not name or name in (".", "..") or (notes_dir / name).is_dir():
+            invalid(f"{where}: nombre {raw!r} inválido; se omite.")
+            return None
+        dest = notes_dir / name
+        if not overwrite and (dest.exists() or (packed is not None and packed(name))):
+            print(f"{name} ya existe; se omite (usa --overwrite para reemplazar).")
+            return None
+        return dest
+
+    if fmt == "tar":
+        try:
+            with tarfile.open(fileobj=stream, mode="r|*") as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    dest = target(member.name, "Miembro del tar")
+                    if dest is None:
+                        continue
+                    src = tar.extractfile(member)
+                    with open(dest, "wb") as out:
+                        shutil.copyfileobj(src, out, CHUNK)
+                    os.utime(dest, (member.mtime, member.mtime))
+                    yield dest.name, None
+        except tarfile.TarError as ex:
+            invalid(f"Archivo tar inválido o truncado: {ex}")
+        return
+
+    for lineno, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError as ex:
+            invalid(f"Línea {lineno} inválida (no es JSON): {ex}; se omite.")
+            continue
+        if not isinstance(rec, dict):
+            invalid(f"Línea {lineno} inválida (se esperaba un objeto); se omite.")
+            continue
+        text = rec.get("text") or ""
+        mtime = rec.get("mtime")
+        if not isinstance(text, str) or not (mtime is None or isinstance(mtime, int)):
+            invalid(f"Línea {lineno} inválida ('text' debe ser texto y 'mtime' entero); se omite.")
+            continue
+        dest = target(str(rec.get("name") or ""), f"Línea {lineno}")
+        if dest is None:
+            continue
+        dest.write_text(text, encoding="utf-8")
+        if mtime:
+            os.utime(dest, ns=(mtime, mtime))
+        yield dest.name, text
+
+
+__all__ = ["FORMATS", "detect_format", "export_notes", "import_notes"]
@@ -0,0 +1,166 @@
+# src/mycli/notes_view.py
+"""
+Lectura por partes de notas grandes (notas tipo log de cientos de MB).
+
+Nada aquí carga la nota completa: las líneas se leen de un archivo con
+buffer, la vista completa se copia por bloques y tail busca hacia atrás
+desde el final del archivo. La memoria usada no depende del tamaño de la nota.
+
+Donde se recibe una nota (source) vale una ruta o una función que abre un
+lector binario (p. ej. una nota empaquetada, ver notes_pack.py).
+"""
+import io
+import os
+import shutil
+import sys
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, Tuple
+
+CHUNK = 64 * 1024
+_WS = b" \t\r\n\x0b\x0c"
+
+
+def _open_text(source):
+    if callable(source):
+        return io.TextIOWrapper(source(), encoding="utf-8", errors="replace", newline="")
+    return open(source, "r", encoding="utf-8", errors="replace", newline="")
+
+
+def iter_lines(source) -> Iterator[str]:
+    """Líneas de la nota (con su salto de línea), de a una."""
+    with _open_text(source) as fh:
+        yield from fh
+
+
+def head(source, n: int) -> Iterator[str]:
+    return islice(iter_lines(source), max(n, 0))
+
+
+def line_range(source, start: Optional[int], end: Optional[int]) -> Iterator[str]:
+    """Líneas start..end (1-based, inclusivas; None = desde el principio / hasta el final)."""
+    first = max((start or 1) - 1, 0)
+    return islice(iter_lines(source), first, end)
+
+
+def tail(source, n: int) -> Iterator[str]:
+    """
+    Últimas n líneas, leyendo bloques hacia atrás desde el final. Un lector que no
+    admite seek (nota comprimida) se recorre completo guardando solo n líneas.
+    """
+    if n <= 0:
+        return iter(())
+    if callable(source):
+        return iter(deque(iter_lines(source), maxlen=n))
+    with open(source, "rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+        data = b""
+        # n + 1 saltos garantizan n líneas completas (con o sin salto final)
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(CHUNK, pos)
+            pos -= step
+            fh.seek(pos)
+            data = fh.read(step) + data
+    ended = data.endswith(b"\n")
+    parts = data.split(b"\n")
+    if ended:
+        parts.pop()
+    data = b"\n".join(parts[-n:]) + (b"\n" if ended else b"")
+    return iter(io.StringIO(data.decode("utf-8", errors="replace"), newline=""))
+
+
+def parse_range(spec: str) -> Tuple[Optional[int], Optional[int]]:
+    """'10:20', '10:' o ':20' -> (inicio, fin). ValueError si no es válido."""
+    a, sep, b = spec.partition(":")
+    if not sep:
+        raise ValueError(spec)
+    start = int(a) if a.strip() else None
+    end = int(b) if b.strip() else None
+    if (start is not None and start < 1) or (start and end and end < start):
+        raise ValueError(spec)
+    return start, end
+
+
+def write_lines(lines, out: TextIO = None) -> None:
+    out = out or sys.stdout
+    last = ""
+    for line in lines:
+        out.write(line)
+        last = line
+    if last and not last.endswith("\n"):
+        out.write("\n")
+
+
+def copy_to(source, out: TextIO = None) -> None:
+    """Nota completa a out, por bloques."""
+    out = out or sys.stdout
+    with _open_text(source) as fh:
+        shutil.copyfileobj(fh, out, CHUNK)
+
+
+def page(source, lines_per_page: Optional[int] = None, out: TextIO = None) -> None:
+    """Muestra la nota por páginas: Enter sigue, q sale."""
+    out = out or sys.stdout
+    if not lines_per_page:
+        lines_per_page = max(shutil.get_terminal_size().lines - 2, 5)
+    lines = iter_lines(source)
+    shown = 0
+    while True:
+        chunk = list(islice(lines, lines_per_page))
+        if not chunk:
+            return
+        write_lines(chunk, out)
+        shown += len(chunk)
+        if len(chunk) < lines_per_page:
+            return
+        try:
+            ans = input(f"-- línea {shown} -- (Enter sigue, q sale) ").strip().lower()
+        except EOFError:
+            return
+        if ans == "q":
+            return
+
+
+def same_stripped(path: Path, text: str) -> bool:
+    """
+    ¿El contenido de path, sin espacios al inicio/fin, es igual a text.strip()?
+    Compara por bloques, sin cargar el archivo.
+    """
+    want = text.strip().encode("utf-8")
+    with open(path, "rb") as fh:
+        # saltar espacios iniciales
+        block = fh.read(CHUNK)
+        while block and not block.lstrip(_WS):
+            block = fh.read(CHUNK)
+        block = block.lstrip(_WS)
+        # comparar el cuerpo
+        i = 0
+        while i < len(want):
+            if not block:
+                return False
+            n = min(len(block), len(want) - i)
+            if block[:n] != want[i:i + n]:
+                return False
+            i += n
+            block = block[n:] or fh.read(CHUNK)
+        # el resto solo puede ser espacio
+        while block:
+            if block.strip(_WS):
+                return False
+            block = fh.read(CHUNK)
+    return True
+
+
+__all__ = [
+    "iter_lines",
+    "head",
+    "tail",
+    "line_range",
+    "parse_range",
+    "write_lines",
+    "copy_to",
+    "page",
+    "same_stripped",
+]
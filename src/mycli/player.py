@@ -0,0 +1,313 @@
+# src/mycli/player.py
+"""
+Reproductor persistente por JSON IPC (mpv y compatibles).
+
+Con player_mode = "ipc" en config.json no se lanza un proceso por episodio:
+la primera reproducción arranca un mpv en modo idle escuchando en un socket
+Unix (--input-ipc-server) y cada episodio siguiente es un comando loadfile
+sobre ese socket, así cambiar de episodio cuesta un ida y vuelta local en vez
+del arranque completo del reproductor (y no abre otra ventana). El proceso
+queda desacoplado de la CLI: al salir del menú sigue reproduciendo, y la
+próxima sesión se conecta al mismo socket si el reproductor sigue abierto.
+
+Protocolo: un objeto JSON por línea, {"command": [...], "request_id": n};
+las respuestas llevan el mismo request_id y "error": "success". Las líneas
+con "event" son notificaciones: se encolan para next_event().
+
+play_list() carga una lista M3U de una vez (loadlist) y sigue los eventos
+end-file hasta que termina: devuelve los episodios que llegaron al final
+(reason "eof"); los saltados o cortados no cuentan.
+
+player_mode = "spawn" (default), o cualquier fallo del IPC (sin sockets Unix,
+el reproductor no arrancó a tiempo), usa open_with_default como siempre. Si
+el reproductor lanzado no abre el socket (p. ej. player_cmd no es mpv) se
+lo termina y la sesión sigue en modo "spawn": no se reintenta en cada play().
+"""
+import json
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import trace
+from .timing import traced
+from .utils import open_with_default
+
+PLAYER_MODES = ("spawn", "ipc")
+DEFAULT_IPC_PLAYER = "mpv"
+START_TIMEOUT = 10.0
+REPLY_TIMEOUT = 5.0
+
+
+def player_socket_path() -> Path:
+    """Socket del reproductor persistente (junto a la config global)."""
+    return Path.home() / ".ohmycli" / "player.sock"
+
+
+def ipc_available() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+class IpcError(RuntimeError):
+    """El reproductor no respondió o rechazó un comando."""
+    pass
+
+
+class MpvIpc:
+    """Una conexión JSON IPC: command() envía y espera la respuesta con su request_id."""
+
+    def __init__(self, path, timeout: float = REPLY_TIMEOUT):
+        self.path = Path(path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(str(self.path))
+        except OSError as ex:
+            self._sock.close()
+            raise IpcError(f"sin reproductor en {self.path}: {ex}")
+        self._buf = b""
+        self._next_id = 0
+        self.events: List[Dict[str, Any]] = []
+
+    def _readline(self) -> Dict[str, Any]:
+        while b"\n" not in self._buf:
+            try:
+                chunk = self._sock.recv(64 * 1024)
+            except OSError as ex:
+                raise IpcError(f"el reproductor no respondió: {ex}")
+            if not chunk:
+                raise IpcError("el reproductor cerró la conexión")
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        try:
+            return json.loads(line)
+        except ValueError:
+            return {}
+
+    def command(self, *args) -> Any:
+        self._next_id += 1
+        rid = self._next_id
+        try:
+            self._sock.sendall(json.dumps({"command": list(args), "request_id": rid}).encode("utf-8") + b"\n")
+        except OSError as ex:
+            raise IpcError(f"no pude enviar {args[0]!r} al reproductor: {ex}")
+        while True:
+            reply = self._readline()
+            if "event" in reply:
+                self.events.append(reply)
+                continue
+            if reply.get("request_id", rid) != rid:
+                continue
+            if reply.get("error", "success") != "success":
+                raise IpcError(f"{args[0]}: {reply.get('error')}")
+            return reply.get("data")
+
+    def next_event(self) -> Dict[str, Any]:
+        """Próximo evento (bloquea sin límite hasta que llegue uno)."""
+        if self.events:
+            return self.events.pop(0)
+        timeout = self._sock.gettimeout()
+        self._sock.settimeout(None)
+        try:
+            while True:
+                msg = self._readline()
+                if "event" in msg:
+                    return msg
+        finally:
+            self._sock.settimeout(timeout)
+
+    def get_property(self, name: str) -> Any:
+        return self.command("get_property", name)
+
+    def set_property(self, name: str, value: Any) -> Any:
+        return self.command("set_property", name, value)
+
+    def loadfile(self, path: str, mode: str = "replace") -> Any:
+        return self.command("loadfile", str(path), mode)
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class PlayerSession:
+    """
+    Reproduce episodios durante una sesión de navegación.
+
+    En modo "ipc" reutiliza un único reproductor (ver docstring del módulo);
+    en modo "spawn" cada play() es open_with_default. argv es el comando del
+    reproductor IPC (por defecto [player_cmd or "mpv"]).
+    """
+
+    def __init__(self, player_cmd: Optional[str] = None, mode: str = "spawn",
+                 socket_path: Optional[Path] = None, argv: Optional[List[str]] = None,
+                 start_timeout: float = START_TIMEOUT):
+        self.player_cmd = player_cmd
+        self.mode = mode if mode in PLAYER_MODES and ipc_available() else "spawn"
+        self.socket_path = Path(socket_path or player_socket_path())
+        self.argv = argv or [player_cmd or DEFAULT_IPC_PLAYER]
+        self.start_timeout = start_timeout
+        self.proc: Optional[subprocess.Popen] = None
+        self._ipc: Optional[MpvIpc] = None
+
+    def _launch(self) -> MpvIpc:
+        """Arranca el reproductor en modo idle y espera a que su socket acepte conexiones."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.socket_path.unlink()  # socket huérfano de un reproductor que ya se cerró
+        except FileNotFoundError:
+            pass
+        try:
+            self.proc = subprocess.Popen(
+                self.argv + ["--idle=yes", "--force-window=yes", f"--input-ipc-server={self.socket_path}"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True,  # sigue abierto al salir de la CLI (y no recibe su Ctrl-C)
+            )
+        except OSError as ex:
+            self.mode = "spawn"
+            raise IpcError(f"no pude lanzar {self.argv[0]}: {ex}")
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                return MpvIpc(self.socket_path)
+            except IpcError:
+                if self.proc.poll() is not None:
+                    self.mode = "spawn"
+                    raise IpcError(f"{self.argv[0]} terminó al arrancar (código {self.proc.returncode})")
+                if time.monotonic() > deadline:
+                    self._abandon()
+                    raise IpcError(f"{self.argv[0]} no abrió {self.socket_path} en {self.start_timeout:g} s")
+                time.sleep(0.02)
+
+    def _abandon(self) -> None:
+        """El reproductor lanzado no habla IPC: se lo termina y la sesión pasa a modo "spawn"."""
+        self.mode = "spawn"
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def connection(self) -> MpvIpc:
+        """Conexión al reproductor: la actual, la de uno que ya estaba abierto, o uno nuevo."""
+        if self._ipc is None:
+            try:
+                self._ipc = MpvIpc(self.socket_path)
+            except IpcError:
+                self._ipc = self._launch()
+        return self._ipc
+
+    def _drop(self) -> None:
+        if self._ipc is not None:
+            self._ipc.close()
+            self._ipc = None
+
+    def command(self, *args) -> Any:
+        """
+        Comando IPC. Si falla sobre una conexión que ya andaba (el usuario cerró el
+        reproductor) se reconecta, o relanza, una vez; un lanzamiento fallido no se repite.
+        """
+        fresh = self._ipc is None
+        try:
+            return self.connection().command(*args)
+        except IpcError:
+            self._drop()
+            if fresh or self.mode == "spawn":
+                raise
+            return self.connection().command(*args)
+
+    @traced("player.play")
+    def play(self, path) -> bool:
+        """Reproduce path (reemplaza lo que esté sonando). False si no se pudo."""
+        if self.mode == "spawn":
+            open_with_default(str(path), self.player_cmd)
+            return True
+        t0 = time.perf_counter()
+        try:
+            self.command("loadfile", str(path), "replace")
+            self.command("set_property", "pause", False)
+        except IpcError as ex:
+            self._drop()
+            print(f"Reproductor IPC no disponible ({ex}); abro el episodio aparte.")
+            open_with_default(str(path), self.player_cmd)
+            return False
+        if trace.enabled():
+            trace.event("player_launched", path=str(path), player=self.argv[0], mode="ipc", ms=trace.ms_since(t0))
+        return True
+
+    @traced("player.play_list")
+    def play_list(self, episodes: list, m3u) -> Optional[list]:
+        """
+        Reproduce la lista m3u (los episodios de episodes, en orden) en un solo lanzamiento.
+        Con IPC espera a que termine (o a Ctrl-C, o a que se cierre el reproductor) y
+        devuelve los episodios reproducidos hasta el final. En modo "spawn" no hay forma
+        de saberlo: devuelve None (con player_cmd, después de que el reproductor se cierre).
+        """
+        if self.mode == "spawn":
+            self._spawn_list(m3u)
+            return None
+        t0 = time.perf_counter()
+        try:
+            self.command("loadlist", str(m3u), "replace")
+            self.command("set_property", "pause", False)
+            # los ids de la lista son consecutivos desde el primero (mpv >= 0.33 los informa)
+            entries = self.command("get_property", "playlist") or []
+        except IpcError as ex:
+            self._drop()
+            print(f"Reproductor IPC no disponible ({ex}); abro la lista aparte.")
+            self._spawn_list(m3u)
+            return None
+        if trace.enabled():
+            trace.event("player_launched", path=str(m3u), player=self.argv[0], mode="ipc-playlist",
+                        items=len(episodes), ms=trace.ms_since(t0))
+        base = entries[0].get("id") if entries and isinstance(entries[0], dict) else None
+        finished = []
+        try:
+            while True:
+                ev = self._ipc.next_event()
+                name = ev.get("event")
+                if name == "start-file" and base is None:
+                    base = ev.get("playlist_entry_id")
+                elif name == "end-file" and base is not None:
+                    i = ev.get("playlist_entry_id", 0) - base
+                    if ev.get("reason") == "eof" and 0 <= i < len(episodes):
+                        finished.append(episodes[i])
+                    if i >= len(episodes) - 1 and ev.get("reason") != "redirect":
+                        break
+                elif name in ("idle", "shutdown"):
+                    break
+        except IpcError:
+            self._drop()  # el usuario cerró el reproductor
+        except KeyboardInterrupt:
+            print()
+        return finished
+
+    def _spawn_list(self, m3u) -> None:
+        """
+        Abre la lista en un proceso aparte. Con player_cmd espera a que se cierre, así
+        quien pregunta qué se vio lo hace al terminar; el abridor del sistema (xdg-open,
+        open) vuelve enseguida y no sirve para esperar.
+        """
+        proc = open_with_default(str(m3u), self.player_cmd)
+        if proc is None or not self.player_cmd:
+            return
+        print("Esperando a que se cierre el reproductor (Ctrl-C para no esperar)...")
+        try:
+            proc.wait()
+        except KeyboardInterrupt:
+            print()
+
+    def close(self) -> None:
+        """Suelta la conexión; el reproductor sigue abierto (se cierra desde su ventana)."""
+        self._drop()
+
+
+def player_session(cfg: Dict[str, Any]) -> PlayerSession:
+    return PlayerSession(cfg.get("player_cmd"), cfg.get("player_mode") or "spawn")
+
+
+__all__ = ["PlayerSession", "MpvIpc", "IpcError", "player_session", "player_socket_path", "PLAYER_MODES"]
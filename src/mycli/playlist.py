@@ -0,0 +1,37 @@
+# src/mycli/playlist.py
+"""
+Listas M3U para reproducir una temporada (o un Doctor completo) de corrido.
+
+`pa` / `pf N` en el menú de episodios escriben los episodios pendientes en
+~/.ohmycli/playlist.m3u (rutas absolutas, con #EXTINF si se conoce la
+duración) y se la pasan al reproductor en un solo lanzamiento; ver
+PlayerSession.play_list.
+"""
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+def playlist_path() -> Path:
+    """Lista de reproducción de la sesión (junto a la config global)."""
+    return Path.home() / ".ohmycli" / "playlist.m3u"
+
+
+def write_m3u(path, episodes: Iterable, durations: Optional[Dict[str, float]] = None) -> Path:
+    """Escribe la lista (escritura atómica vía archivo temporal). durations: {ruta: segundos}."""
+    path = Path(path)
+    durations = durations or {}
+    lines = ["#EXTM3U"]
+    for ep in episodes:
+        secs = durations.get(str(ep))
+        ep = Path(ep).resolve()
+        lines.append(f"#EXTINF:{int(secs) if secs else -1},{ep.stem}")
+        lines.append(str(ep))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+__all__ = ["playlist_path", "write_m3u"]
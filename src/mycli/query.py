@@ -0,0 +1,117 @@
+# src/mycli/query.py
+"""
+Consultas no interactivas para who-old / who-new (cron, reportes, scripts).
+
+    ohmycli who-new list doctors|seasons|episodes [--json] [--doctor N]
+    ohmycli who-new status [--json]
+    ohmycli catalog list|status ...   (todas las colecciones, con campo "collection")
+
+Se hace un solo escaneo y cada resultado se escribe en cuanto se descubre
+(una línea por registro, JSON Lines con --json), sin acumular la salida.
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .utils import (
+    WatchSession,
+    doctor_seasons,
+    list_episodes_for_season,
+)
+from .timing import traced
+
+
+def register_query_parser(who_p) -> None:
+    """Agrega los subcomandos list/status al parser de who-old / who-new."""
+    who_sub = who_p.add_subparsers(dest='who_cmd')
+    list_p = who_sub.add_parser('list', help='Listar doctors, seasons o episodes sin menús')
+    list_p.add_argument('what', choices=['doctors', 'seasons', 'episodes'])
+    list_p.add_argument('--json', action='store_true', help='Salida JSON Lines (un objeto por línea)')
+    list_p.add_argument('--doctor', type=int, help='Limitar a un Doctor (número como en el menú)')
+    status_p = who_sub.add_parser('status', help='Vistos/total por temporada y Doctor')
+    status_p.add_argument('--json', action='store_true', help='Salida JSON Lines (un objeto por línea)')
+    status_p.add_argument('--doctor', type=int, help='Limitar a un Doctor (número como en el menú)')
+
+
+def _emit(record: dict, as_json: bool) -> None:
+    if as_json:
+        line = json.dumps(record, ensure_ascii=False)
+    else:
+        line = "\t".join("" if v is None else str(v) for k, v in record.items() if k != "type")
+    sys.stdout.write(line + "\n")
+    # streaming: cada registro sale en cuanto se conoce
+    sys.stdout.flush()
+
+
+def _selected(doctor_dirs: list, number: Optional[int]) -> list:
+    if number is None:
+        return doctor_dirs
+    if 1 <= number <= len(doctor_dirs):
+        return [doctor_dirs[number - 1]]
+    return []
+
+
+def iter_records(what: str, doctor_dirs: list, session: WatchSession, index=None, workers: int = 1) -> Iterator[dict]:
+    """Genera los registros de list/status a medida que se escanea cada Doctor y temporada."""
+    grand_watched = grand_total = 0
+    for n, (doctor, name, ordv) in enumerate(doctor_dirs, 1):
+        if what == "doctors":
+            yield {"type": "doctor", "n": n, "name": name, "path": str(doctor),
+                   "ordinal": ordv if ordv < 10**6 else None}
+            continue
+        doc_watched = doc_total = 0
+        for season in doctor_seasons(doctor, index, workers):
+            episodes: List[Path] = list_episodes_for_season(season, index, workers)
+            status = session.status(episodes)
+            watched = sum(1 for _, w in status if w)
+            doc_watched += watched
+            doc_total += len(status)
+            if what == "seasons":
+                yield {"type": "season", "doctor": name, "name": season.name, "path": str(season),
+                       "watched": watched, "total": len(status)}
+            elif what == "episodes":
+                for ep, w in status:
+                    yield {"type": "episode", "doctor": name, "season": season.name, "name": ep.name,
+                           "path": str(ep), "watched": w}
+            elif what == "status":
+                yield {"type": "season", "doctor": name, "name": season.name,
+                       "watched": watched, "total": len(status)}
+        if what == "status":
+            yield {"type": "doctor", "name": name, "watched": doc_watched, "total": doc_total}
+            grand_watched += doc_watched
+            grand_total += doc_total
+    if what == "status":
+        yield {"type": "summary", "watched": grand_watched, "total": grand_total}
+
+
+def query_kind(args) -> str:
+    return args.what if args.who_cmd == 'list' else 'status'
+
+
+@traced("query.run")
+def run_query(args, cfg: dict, doctor_dirs: list, index=None) -> None:
+    """Ejecuta `list ...` o `status` sobre los Doctors ya detectados."""
+    run_collections_query(args, cfg, {None: doctor_dirs}, index)
+
+
+@traced("query.run_collections")
+def run_collections_query(args, cfg: dict, found: dict, index=None) -> None:
+    """
+    Como run_query para varias colecciones ({nombre: Doctors}); cada registro lleva su
+    "collection" (salvo la colección sin nombre de run_query).
+    """
+    what = query_kind(args)
+    as_json = getattr(args, 'json', False)
+    session = WatchSession.shared(cfg.get("state_path"), cfg.get("state_backend"), cfg.get("watch_key"))
+    if what != "doctors":
+        session.refresh()
+    for name, doctor_dirs in found.items():
+        selected = _selected(doctor_dirs, getattr(args, 'doctor', None))
+        for rec in iter_records(what, selected, session, index, cfg.get("scan_workers", 1)):
+            if name is not None:
+                rec = {"type": rec["type"], "collection": name, **rec}
+            _emit(rec, as_json)
+
+
+__all__ = ["register_query_parser", "iter_records", "query_kind", "run_query", "run_collections_query"]
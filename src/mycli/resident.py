@@ -0,0 +1,72 @@
+# src/mycli/resident.py
+"""
+Objetos residentes para el modo daemon (ver daemon.py).
+
+Fuera del daemon cached() solo llama a la fábrica: cada comando carga lo suyo
+como siempre. Dentro del daemon (enable()) el índice de biblioteca, el
+manifest de notas, etc. se cargan una vez y se reutilizan entre comandos
+mientras los archivos de los que salieron no cambien (mtime/tamaño). Las
+escrituras del propio daemon no invalidan nada: settle() vuelve a tomar las
+firmas al terminar cada comando. Si otro proceso reescribe los archivos, el
+objeto viejo se reemplaza y on_evict(viejo) libera lo que tenga abierto (el
+watcher de un LibraryIndex, por ejemplo).
+"""
+import os
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_enabled = False
+# clave -> (archivos, firma, objeto)
+_objects: Dict[Hashable, Tuple[List[str], tuple, Any]] = {}
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _signature(files: List[str]) -> tuple:
+    sig = []
+    for f in files:
+        try:
+            st = os.stat(f)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def cached(key: Hashable, files: Iterable, factory: Callable[[], Any],
+           on_evict: Optional[Callable[[Any], None]] = None) -> Any:
+    """
+    factory() una vez por key mientras files no cambien (solo con el daemon activo).
+    Al reemplazar un objeto porque sus archivos cambiaron se llama on_evict(objeto viejo).
+    """
+    if not _enabled:
+        return factory()
+    files = [str(f) for f in files]
+    sig = _signature(files)
+    hit = _objects.get(key)
+    if hit is not None and hit[1] == sig:
+        return hit[2]
+    if hit is not None and on_evict is not None:
+        on_evict(hit[2])
+    obj = factory()
+    _objects[key] = (files, sig, obj)
+    return obj
+
+
+def settle() -> None:
+    """Toma de nuevo las firmas: lo que escribió el daemon mismo sigue siendo válido."""
+    for key, (files, _, obj) in list(_objects.items()):
+        _objects[key] = (files, _signature(files), obj)
+
+
+def objects() -> List[Any]:
+    return [obj for _, _, obj in _objects.values()]
+
+
+__all__ = ["enable", "enabled", "cached", "settle", "objects"]
@@ -0,0 +1,281 @@
+# src/mycli/state.py
+"""
+Persistencia del estado de episodios vistos con snapshot + journal.
+
+- El snapshot es el mismo watched.json de siempre (un dict clave -> entrada), así
+  que un archivo existente se lee tal cual: esa es toda la migración.
+- Cada cambio puntual (marcar/desmarcar) se agrega como una línea JSON en
+  watched.json.journal en lugar de reescribir el archivo completo.
+- Al cargar se aplica el journal sobre el snapshot; cuando el journal pasa de
+  COMPACT_BYTES se vuelve a escribir el snapshot y el journal se vacía.
+- Varios procesos pueden escribir a la vez: agregar al journal toma un flock
+  compartido sobre watched.json.lock y compactar uno exclusivo, así ningún
+  registro cae entre la lectura y el borrado del journal (sin fcntl, p. ej. en
+  Windows, no hay bloqueo).
+
+Backend opcional "sqlite" (state_backend en config.json): una tabla indexada por
+carpeta padre, de modo que los conteos de vistos por temporada/Doctor son una
+consulta y marcar una carpeta completa es una sola transacción. Al crear la base
+por primera vez se importa el watched.json existente.
+
+Con watch_key = "fingerprint" las claves son huellas de contenido (ver
+fingerprint.py) y cada entrada lleva "path": la última ruta conocida, usada solo
+para contar vistos por carpeta.
+"""
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+BACKENDS = ("json", "sqlite")
+SQLITE_SUFFIXES = (".sqlite3", ".sqlite", ".db")
+
+JOURNAL_SUFFIX = ".journal"
+COMPACT_BYTES = 512 * 1024
+
+
+def journal_path(p: Path) -> Path:
+    p = Path(p)
+    return p.with_name(p.name + JOURNAL_SUFFIX)
+
+
+def lock_path(p: Path) -> Path:
+    p = Path(p)
+    return p.with_name(p.name + ".lock")
+
+
+@contextmanager
+def _locked(p: Path, exclusive: bool):
+    """flock sobre el archivo de bloqueo del estado (compartido para agregar, exclusivo para compactar)."""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path(p), "a") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def load_state(p: Path) -> Dict[str, Any]:
+    """Carga snapshot y aplica el journal encima. Líneas corruptas (p. ej. una escritura cortada) se ignoran."""
+    p = Path(p)
+    state: Dict[str, Any] = {}
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            state = data
+    except Exception:
+        pass
+    try:
+        with open(journal_path(p), "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                    state[rec["k"]] = rec["v"]
+                except Exception:
+                    continue
+    except OSError:
+        pass
+    return state
+
+
+def write_snapshot(p: Path, state: Dict[str, Any]) -> None:
+    """Escribe el estado completo (atómico) y vacía el journal, que ya quedó incluido."""
+    p = Path(p)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, p)
+    try:
+        journal_path(p).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def append_changes(p: Path, changes: Dict[str, Any]) -> None:
+    """
+    Agrega al journal un registro por clave cambiada (una sola escritura).
+    Al compactar se relee snapshot + journal del disco (el journal puede traer
+    registros de otros procesos) con el bloqueo exclusivo tomado.
+    """
+    if not changes:
+        return
+    p = Path(p)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    payload = "".join(json.dumps({"k": k, "v": v}, ensure_ascii=False, separators=(",", ":")) + "\n" for k, v in changes.items())
+    with _locked(p, exclusive=False):
+        with open(journal_path(p), "a", encoding="utf-8") as fh:
+            fh.write(payload)
+            fh.flush()
+            size = os.fstat(fh.fileno()).st_size
+    if size > COMPACT_BYTES:
+        with _locked(p, exclusive=True):
+            try:
+                if os.stat(journal_path(p)).st_size <= COMPACT_BYTES:
+                    return  # otro proceso compactó mientras esperábamos
+            except FileNotFoundError:
+                return
+            write_snapshot(p, load_state(p))
+
+
+# ---------- backend sqlite ----------
+def sqlite_path(p: Path) -> Path:
+    """Base sqlite asociada a un state_path (watched.json -> watched.sqlite3)."""
+    p = Path(p)
+    return p if p.suffix.lower() in SQLITE_SUFFIXES else p.with_suffix(".sqlite3")
+
+
+def entry_path(key: str, entry: Dict[str, Any]) -> str:
+    """Ruta de una entrada: la clave misma, o la pista "path" si la clave es una huella."""
+    return entry.get("path") or key
+
+
+def _row(key: str, entry: Dict[str, Any]):
+    return (key, os.path.dirname(entry_path(key, entry)), 1 if entry.get("watched") else 0, entry.get("ts"), entry.get("path"))
+
+
+def _connect(p: Path):
+    import sqlite3  # solo lo paga quien usa el backend sqlite
+
+    db = sqlite_path(p)
+    fresh = not db.exists()
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db))
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS watch ("
+        " key TEXT PRIMARY KEY, dir TEXT NOT NULL, watched INTEGER NOT NULL, ts TEXT)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS watch_dir ON watch(dir, watched)")
+    if "path" not in {row[1] for row in conn.execute("PRAGMA table_info(watch)")}:
+        # bases anteriores a las claves por huella
+        conn.execute("ALTER TABLE watch ADD COLUMN path TEXT")
+    if fresh and db != Path(p):
+        # migración: importar el estado JSON (snapshot + journal) si existe
+        legacy = load_state(p)
+        if legacy:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO watch (key, dir, watched, ts, path) VALUES (?, ?, ?, ?, ?)",
+                                 [_row(k, v) for k, v in legacy.items() if isinstance(v, dict)])
+    return conn
+
+
+def _sqlite_load(p: Path) -> Dict[str, Any]:
+    conn = _connect(p)
+    try:
+        state = {}
+        for k, w, ts, path in conn.execute("SELECT key, watched, ts, path FROM watch"):
+            state[k] = {"watched": bool(w), "ts": ts, "path": path} if path else {"watched": bool(w), "ts": ts}
+        return state
+    finally:
+        conn.close()
+
+
+def _sqlite_write(p: Path, changes: Dict[str, Any], replace_all: bool = False) -> None:
+    conn = _connect(p)
+    try:
+        with conn:
+            if replace_all:
+                conn.execute("DELETE FROM watch")
+            conn.executemany("INSERT OR REPLACE INTO watch (key, dir, watched, ts, path) VALUES (?, ?, ?, ?, ?)",
+                             [_row(k, v) for k, v in changes.items() if isinstance(v, dict)])
+    finally:
+        conn.close()
+
+
+def _sqlite_watched_counts(p: Path, dirs: Iterable[str]) -> Dict[str, int]:
+    conn = _connect(p)
+    out = {}
+    try:
+        for d in dirs:
+            # la carpeta misma o cualquier subcarpeta (rango sobre el índice de dir)
+            sub = d.rstrip(os.sep) + os.sep
+            upper = sub[:-1] + chr(ord(os.sep) + 1)
+            (n,) = conn.execute(
+                "SELECT COUNT(DISTINCT COALESCE(path, key)) FROM watch"
+                " WHERE watched = 1 AND (dir = ? OR (dir >= ? AND dir < ?))",
+                (d, sub, upper),
+            ).fetchone()
+            out[d] = n
+    finally:
+        conn.close()
+    return out
+
+
+# ---------- API común ----------
+def load(p: Path, backend: Optional[str] = None) -> Dict[str, Any]:
+    if backend == "sqlite":
+        return _sqlite_load(p)
+    return load_state(p)
+
+
+def snapshot(p: Path, state: Dict[str, Any], backend: Optional[str] = None) -> None:
+    if backend == "sqlite":
+        _sqlite_write(p, state, replace_all=True)
+    else:
+        write_snapshot(p, state)
+
+
+def record(p: Path, changes: Dict[str, Any], backend: Optional[str] = None) -> None:
+    if backend == "sqlite":
+        _sqlite_write(p, changes)
+    else:
+        append_changes(p, changes)
+
+
+def files(p: Path, backend: Optional[str] = None) -> List[Path]:
+    """Archivos en disco que guardan el estado (para medir su tamaño)."""
+    if backend == "sqlite":
+        return [sqlite_path(p)]
+    return [Path(p), journal_path(p)]
+
+
+def watched_counts(p: Path, dirs: Iterable[str], state: Optional[Dict[str, Any]] = None, backend: Optional[str] = None) -> Dict[str, int]:
+    """
+    Episodios vistos bajo cada carpeta de dirs (a cualquier profundidad). Un episodio con
+    entrada por ruta y por huella (misma pista de ruta) cuenta una sola vez.
+    """
+    dirs = list(dirs)
+    if backend == "sqlite":
+        return _sqlite_watched_counts(p, dirs)
+    if state is None:
+        state = load_state(p)
+    out = {d: 0 for d in dirs}
+    prefixes = [(d, d.rstrip(os.sep) + os.sep) for d in dirs]
+    # una sola pasada sobre el estado
+    counted = set()
+    for k, v in state.items():
+        if not (isinstance(v, dict) and v.get("watched")):
+            continue
+        k = entry_path(k, v)
+        if k in counted:
+            continue
+        counted.add(k)
+        for d, pref in prefixes:
+            if k.startswith(pref):
+                out[d] += 1
+    return out
+
+
+__all__ = [
+    "BACKENDS",
+    "load",
+    "snapshot",
+    "record",
+    "watched_counts",
+    "load_state",
+    "write_snapshot",
+    "append_changes",
+    "journal_path",
+    "lock_path",
+    "sqlite_path",
+    "entry_path",
+    "COMPACT_BYTES",
+]
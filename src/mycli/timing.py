@@ -0,0 +1,153 @@
+# src/mycli/timing.py
+"""
+Instrumentación por fases para --timings y --profile.
+
+  with span("config.load"): ...        # bloque con nombre
+  @traced("utils.detect_season_dirs")  # función completa
+
+Los tiempos se acumulan por nombre (llamadas y ms inclusivos) y report()
+los imprime en stderr. Apagado no cuesta nada: traced decide al decorar,
+así que si la instrumentación no estaba activa cuando se importó el módulo
+devuelve la función original, sin envoltorio; main() llama a enable()
+mirando argv antes de importar los comandos. span() apagado devuelve un
+context manager compartido que no hace nada.
+
+--profile corre el comando bajo cProfile (estadísticas en un archivo .prof,
+para pstats/snakeviz) y, con --profile-memory, también tracemalloc: el pico
+de memoria y los sitios que más asignaron van a <archivo>.mem.txt.
+"""
+import functools
+import sys
+import time
+from typing import Dict, List, Optional
+
+FLAGS = ("--timings", "--profile", "--profile-memory")
+
+_enabled = False
+_start = 0.0
+# nombre -> [llamadas, segundos]
+_spans: Dict[str, List[float]] = {}
+
+
+def wanted(argv) -> bool:
+    """¿argv pide instrumentación? (se mira antes de parsear para activar traced a tiempo)."""
+    return any(tok == f or tok.startswith(f + "=") for tok in argv for f in FLAGS)
+
+
+def enable() -> None:
+    global _enabled, _start
+    _enabled = True
+    _start = time.perf_counter()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _add(name: str, elapsed: float) -> None:
+    entry = _spans.get(name)
+    if entry is None:
+        _spans[name] = [1, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _add(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def span(name: str):
+    return _Span(name) if _enabled else _NULL
+
+
+def traced(name: Optional[str] = None):
+    """Decorador: mide cada llamada bajo name. Sin instrumentación activa no envuelve nada."""
+    def deco(fn):
+        if not _enabled:
+            return fn
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _add(label, time.perf_counter() - t0)
+        return wrapper
+    return deco
+
+
+def report(out=None) -> None:
+    """Desglose por fase (en orden de aparición) y el total de pared desde enable()."""
+    out = out or sys.stderr
+    total = time.perf_counter() - _start
+    width = max([len(n) for n in _spans] + [10])
+    print("\n--- timings ---", file=out)
+    print(f"{'fase'.ljust(width)}  {'llamadas':>8}  {'ms':>10}", file=out)
+    for name, (calls, secs) in _spans.items():
+        print(f"{name.ljust(width)}  {int(calls):>8}  {secs * 1000:>10.2f}", file=out)
+    print(f"{'total'.ljust(width)}  {'':>8}  {total * 1000:>10.2f}", file=out)
+
+
+class Profiler:
+    """cProfile (+ tracemalloc opcional) alrededor de un bloque; guarda los resultados al salir."""
+
+    def __init__(self, path: str, memory: bool = False):
+        self.path = path
+        self.memory = memory
+        self._prof = None
+
+    def __enter__(self):
+        import cProfile
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start(10)
+        self._prof = cProfile.Profile()
+        self._prof.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._prof.disable()
+        self._prof.dump_stats(self.path)
+        print(f"Perfil guardado en {self.path} (python -m pstats {self.path})", file=sys.stderr)
+        if self.memory:
+            import tracemalloc
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:15]
+            tracemalloc.stop()
+            mem_path = self.path + ".mem.txt"
+            with open(mem_path, "w", encoding="utf-8") as fh:
+                fh.write(f"pico: {peak / 1024 / 1024:.2f} MiB\n\n")
+                for stat in top:
+                    fh.write(f"{stat}\n")
+            print(f"Memoria: pico {peak / 1024 / 1024:.2f} MiB (detalle en {mem_path})", file=sys.stderr)
+        return False
+
+
+__all__ = ["FLAGS", "wanted", "enable", "enabled", "span", "traced", "report", "Profiler"]
@@ -0,0 +1,77 @@
+# src/mycli/trace.py
+"""
+Traza estructurada de operaciones en JSON Lines (opcional, trace_path en config.json).
+
+Cada operación deja un registro con ts (epoch), pid y op:
+
+  {"op": "dir_listed", "path": ..., "entries": 12, "ms": 0.41}
+  {"op": "state_loaded" | "state_saved", "path": ..., "bytes": 5120, "ms": 1.2}
+  {"op": "player_launched", "path": ..., "player": "mpv", "ms": 3.4}
+
+Los registros se juntan en memoria y se agregan al archivo al salir (atexit)
+con una sola escritura en modo append, así trazar no suma un syscall por
+evento y varios procesos pueden compartir el archivo. Pasado MAX_BUFFER
+registros se vacía antes, para acotar la memoria. Sin trace_path enabled()
+es falso y los puntos de traza no hacen nada.
+"""
+import atexit
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MAX_BUFFER = 10_000
+
+_path: Optional[Path] = None
+_buffer: List[Dict[str, Any]] = []
+_registered = False
+
+
+def configure(path) -> None:
+    """Activa la traza hacia path (idempotente; cambiar de archivo vacía lo pendiente)."""
+    global _path, _registered
+    path = Path(path)
+    if _path is not None and path != _path:
+        flush()
+    _path = path
+    if not _registered:
+        atexit.register(flush)
+        _registered = True
+
+
+def enabled() -> bool:
+    return _path is not None
+
+
+def event(op: str, **fields) -> None:
+    """Agrega un registro al buffer (no escribe nada hasta flush())."""
+    if _path is None:
+        return
+    record = {"ts": round(time.time(), 6), "pid": os.getpid(), "op": op}
+    record.update(fields)
+    _buffer.append(record)
+    if len(_buffer) >= MAX_BUFFER:
+        flush()
+
+
+def flush() -> None:
+    """Escribe lo pendiente de una vez al final de trace_path."""
+    if _path is None or not _buffer:
+        return
+    records = _buffer[:]
+    del _buffer[:len(records)]
+    data = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+    try:
+        _path.parent.mkdir(parents=True, exist_ok=True)
+        with open(_path, "a", encoding="utf-8") as fh:
+            fh.write(data)
+    except OSError as ex:
+        print(f"No pude escribir la traza '{_path}': {ex}")
+
+
+def ms_since(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 3)
+
+
+__all__ = ["configure", "enabled", "event", "flush", "ms_since", "MAX_BUFFER"]
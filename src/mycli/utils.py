@@ -2,14 +2,21 @@ import os
 import sys
 import subprocess
 import re
-import unicodedata
 from pathlib import Path
 from typing import List, Tuple
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, Optional
+
+from . import resident as _resident
+from . import state as _state_store
+from . import trace as _trace
+from .timing import traced
+# normalización/clasificación de nombres (compiladas y memoizadas en classify.py)
+from .classify import _norm_name, looks_like_season_dir
 
 VIDEO_EXTS = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.mpg', '.mpeg', '.flv', '.webm'}
 
@@ -36,32 +43,29 @@ def prompt_choice(max_n, prompt_text="Selecciona una opción"):
         except ValueError:
             print("Entrada inválida. Ingresa un número.")
 
+@traced("utils.open_with_default")
 def open_with_default(path, player_cmd=None):
+    """Abre path sin esperar. Devuelve el proceso lanzado (None en Windows o si falló)."""
+    t0 = time.perf_counter()
+    proc = None
     try:
         if player_cmd:
-            subprocess.Popen([player_cmd, path])
+            proc = subprocess.Popen([player_cmd, path])
         else:
             if sys.platform.startswith('win'):
                 os.startfile(path)
             elif sys.platform.startswith('darwin'):
-                subprocess.Popen(['open', path])
+                proc = subprocess.Popen(['open', path])
             else:
-                subprocess.Popen(['xdg-open', path])
+                proc = subprocess.Popen(['xdg-open', path])
     except Exception as ex:
         print(f"No pude abrir '{path}': {ex}")
+        return None
+    if _trace.enabled():
+        _trace.event("player_launched", path=str(path), player=player_cmd or "default", ms=_trace.ms_since(t0))
+    return proc
 
 
-# --- normalización de nombres ---
-def _norm_name(s: str) -> str:
-    """Normaliza string: unicode -> ascii, minusculas, quitar puntos/guiones, multiples espacios."""
-    if not s:
-        return ""
-    s = unicodedata.normalize("NFKD", s)
-    s = s.encode("ascii", "ignore").decode("ascii")
-    s = s.replace('.', ' ').replace('_', ' ').replace('-', ' ')
-    s = re.sub(r'\s+', ' ', s).strip().lower()
-    return s
-
 # --- heurística para detectar 'temporada' o 'doctor N' ---
 DOCTOR_KEYWORDS = [
     r'\bdoctor\b', r'\bdr\b', r'\bwho\b',
@@ -72,95 +76,142 @@ DOCTOR_KEYWORDS = [
 
 DOCTOR_RE = re.compile("|".join(DOCTOR_KEYWORDS), re.IGNORECASE)
 
-def looks_like_season_dir(name: str) -> bool:
-    """Detecta si un nombre sugiere temporada/doctor/volumen."""
-    n = _norm_name(name)
-    # si contiene 'doctor' o 'who' y además alguna pista numérica, es muy probable
-    if 'doctor' in n or 'who' in n or 'dr' in n:
-        # si hay número u ordinal
-        if re.search(r'\b\d+\b', n) or re.search(r'\b(decimo|tenth|10mo|10º|10th)\b', n):
-            return True
-        # si el nombre contiene "season" o "temporada"
-        if re.search(r'\bseason\b|\btemporada\b|\btemporad\b', n):
-            return True
-        # si solo es "octavo doctor" también cuenta
-        if re.search(r'\bprimer\b|\bsegund[ao]\b|\btercer\b|\bcuart[ao]\b|\bquint[ao]\b|\bsext[ao]\b|\bseptim[ao]\b|\boctav[ao]\b|\bnoven[ao]\b|\bdecim[ao]\b', n):
-            return True
-    # fallback: si contiene 'season' o 'temporada' aunque no tenga doctor
-    if re.search(r'\bseason\b|\btemporada\b', n):
-        return True
-    return False
+# --- listar una carpeta una sola vez: (subcarpetas, archivos multimedia) ---
+@traced("utils.scan_dir")
+def scan_dir(path) -> Tuple[List[str], List[str]]:
+    """
+    Lista path con os.scandir y devuelve (nombres de subcarpetas, nombres de videos), ordenados.
+    Usa el tipo que trae cada DirEntry, así que no hace un stat por entrada.
+    """
+    t0 = time.perf_counter()
+    dirs = []
+    media = []
+    entries = 0
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                entries += 1
+                try:
+                    if e.is_dir():
+                        dirs.append(e.name)
+                    elif e.is_file() and os.path.splitext(e.name)[1].lower() in VIDEO_EXTS:
+                        media.append(e.name)
+                except OSError:
+                    continue
+    except OSError:
+        return [], []
+    dirs.sort()
+    media.sort()
+    if _trace.enabled():
+        _trace.event("dir_listed", path=str(path), entries=entries, ms=_trace.ms_since(t0))
+    return dirs, media
+
+def _listing(path: Path, index=None) -> Tuple[List[str], List[str]]:
+    """Listado de path, pasando por el índice de biblioteca si se recibe uno."""
+    if index is not None:
+        return index.listing(path)
+    return scan_dir(path)
 
 # --- listar archivos multimedia en una carpeta (no recursivo) ---
-def list_media_files(path: Path) -> List[Path]:
-    try:
-        return sorted([p for p in path.iterdir() if p.is_file() and p.suffix.lower() in VIDEO_EXTS])
-    except Exception:
-        return []
+def list_media_files(path: Path, index=None) -> List[Path]:
+    path = Path(path)
+    return [path / f for f in _listing(path, index)[1]]
+
+# --- recorrer un árbol listando cada carpeta una sola vez ---
+def list_many(paths: List[Path], index=None, workers: int = 1) -> List[Tuple[List[str], List[str]]]:
+    """
+    Lista varias carpetas; con workers > 1 los listados se reparten en un pool de hilos
+    (útil en montajes de red, donde cada listado es sobre todo latencia). Conserva el orden de paths.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        return [_listing(p, index) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(lambda p: _listing(p, index), paths))
+
+@traced("utils.walk_tree")
+def walk_tree(base_path: Path, max_depth: int, index=None, workers: int = 1,
+              descend: Optional[Callable[[Path], bool]] = None) -> Dict[Path, Tuple[List[str], List[str]]]:
+    """
+    Recorre base_path por niveles hasta max_depth (0 = solo base) con un único listado por carpeta.
+    Las carpetas de un mismo nivel se listan en paralelo si workers > 1; con descend, solo
+    se listan las subcarpetas para las que devuelve True.
+    Retorna {carpeta: (subcarpetas, videos)} para que los cálculos se hagan en memoria.
+    """
+    tree = {}
+    level = [Path(base_path)]
+    for depth in range(max_depth + 1):
+        next_level = []
+        for p, (dirs, media) in zip(level, list_many(level, index, workers)):
+            tree[p] = (dirs, media)
+            if depth < max_depth:
+                next_level.extend(c for c in (p / d for d in dirs) if descend is None or descend(c))
+        level = next_level
+    return tree
+
+def media_in_tree(tree: Dict[Path, Tuple[List[str], List[str]]], root: Path, depth: int = 1) -> List[Path]:
+    """Videos de root y de sus subcarpetas hasta depth niveles, a partir de un árbol ya recorrido."""
+    root = Path(root)
+    dirs, media = tree.get(root, ([], []))
+    out = [root / f for f in media]
+    if depth > 0:
+        for d in dirs:
+            out.extend(media_in_tree(tree, root / d, depth - 1))
+    return out
 
 # --- detectar temporadas dentro de un base path ---
-def detect_season_dirs(base_path: Path, max_depth: int = 2) -> List[Tuple[Path, str, int]]:
+@traced("utils.detect_season_dirs")
+def detect_season_dirs(base_path: Path, max_depth: int = 2, index=None, workers: int = 1) -> List[Tuple[Path, str, int]]:
     """
     Busca carpetas candidatas que parezcan 'temporadas' bajo base_path.
     Retorna lista de (path, display_name, score) ordenada por score descendente.
     score heurístico: +20 si contiene videos directos, +10 si nombre sugiere temporada, +5 si subcarpetas contienen videos.
     max_depth controla cuánto profundiza (1 = solo hijos directos; 2 = hijos y nietos).
+    index (LibraryIndex opcional) permite reutilizar listados cacheados; workers > 1 lista en paralelo.
     """
     base = Path(base_path)
     if not base.exists():
         return []
 
+    # un solo recorrido: la comprobación de subcarpetas mira hasta dos niveles por debajo de max_depth - 1
+    tree = walk_tree(base, max_depth + 1, index, workers)
+
+    # de abajo hacia arriba: ¿hay videos en la carpeta o en alguna hija directa?
+    near_media = {}
+    for p, (dirs, media) in sorted(tree.items(), key=lambda kv: -len(kv[0].parts)):
+        near_media[p] = bool(media) or any(tree.get(p / d, ((), ()))[1] for d in dirs)
+
     candidates = []
-    # buscamos en árbol hasta profundidad max_depth
     def walk_dir(p: Path, depth: int):
-        if depth > max_depth:
-            return
-        # comprobar si esta carpeta contiene videos directos
-        media = list_media_files(p)
+        dirs, media = tree.get(p, ([], []))
         score = 0
+        # videos directos
         if media:
             score += 20
         # comprobar nombre
         if looks_like_season_dir(p.name):
             score += 10
-        # revisar subcarpetas si depth < max_depth
-        sub_has_media = False
-        if depth < max_depth:
-            for sd in [d for d in p.iterdir() if d.is_dir()]:
-                if list_media_files(sd):
-                    sub_has_media = True
-                    break
-                # mirar un nivel más si allowed
-                if depth + 1 <= max_depth:
-                    for ssd in [d for d in sd.iterdir() if d.is_dir()]:
-                        if list_media_files(ssd):
-                            sub_has_media = True
-                            break
-                if sub_has_media:
-                    break
-        if sub_has_media:
+        # subcarpetas (o nietas) con videos, si depth < max_depth
+        if depth < max_depth and any(near_media.get(p / d) for d in dirs):
             score += 5
 
         # solo añadir si hay alguna pista (videos directos o subcarpetas con videos o nombre sugerente)
         if score > 0:
-            # display name: preferir nombre normalizado pero legible
-            display = p.name
-            candidates.append((p, display, score))
+            candidates.append((p, p.name, score))
 
-        # continuar recursión (solo si depth < max_depth)
+        # continuar recursión (solo si depth < max_depth), evitando carpetas ocultas / system
         if depth < max_depth:
-            for d in [d for d in p.iterdir() if d.is_dir()]:
-                # evitar entrar en carpetas ocultas / system
-                if d.name.startswith('.'):
+            for d in dirs:
+                if d.startswith('.'):
                     continue
-                walk_dir(d, depth + 1)
+                walk_dir(p / d, depth + 1)
 
     # iniciar en hijos directos de base (no en base mismo para evitar duplicados)
-    for child in [c for c in base.iterdir() if c.is_dir()]:
-        walk_dir(child, 1)
+    base_dirs, base_media = tree[base]
+    for d in base_dirs:
+        walk_dir(base / d, 1)
 
     # También considerar base itself if it contains media (ej. Dr.Who/10mo Doctor/ podría ser base)
-    if list_media_files(base):
+    if base_media:
         candidates.insert(0, (base, base.name, 25))
 
     # ordenar por score descendente y por nombre
@@ -176,23 +227,65 @@ def detect_season_dirs(base_path: Path, max_depth: int = 2) -> List[Tuple[Path,
         out.append((p, display, score))
     return out
 
+def season_dirs_in(doctor_path: Path, index=None, workers: int = 1) -> Tuple[List[Path], List[Path]]:
+    """
+    Temporadas dentro de la carpeta de un Doctor y sus videos directos, con un solo recorrido.
+    Una subcarpeta es temporada si su nombre lo sugiere o si tiene videos (directos o 1 nivel más abajo);
+    solo se listan por dentro las que no se reconocen por el nombre.
+    """
+    doctor_path = Path(doctor_path)
+
+    def unnamed(p: Path) -> bool:
+        return p.parent != doctor_path or not looks_like_season_dir(p.name)
+
+    tree = walk_tree(doctor_path, 2, index, workers, descend=unnamed)
+    dirs, media = tree[doctor_path]
+    seasons = []
+    for d in dirs:
+        sp = doctor_path / d
+        if looks_like_season_dir(d) or media_in_tree(tree, sp, 1):
+            seasons.append(sp)
+    return seasons, [doctor_path / f for f in media]
+
+def doctor_seasons(doctor_path: Path, index=None, workers: int = 1) -> List[Path]:
+    """
+    Carpetas de episodios de un Doctor, con el mismo criterio que el menú interactivo:
+    temporadas detectadas; si no hay, la carpeta misma (videos directos); si no, candidatas más abajo.
+    """
+    seasons, media_here = season_dirs_in(doctor_path, index, workers)
+    if seasons:
+        return seasons
+    if media_here:
+        return [Path(doctor_path)]
+    return [p for p, _, _ in detect_season_dirs(doctor_path, max_depth=2, index=index, workers=workers)]
+
 # --- obtener episodios para una temporada (plan B: si no hay archivos directos, recoger de subcarpetas) ---
-def list_episodes_for_season(season_path: Path) -> List[Path]:
+@traced("utils.list_episodes_for_season")
+def list_episodes_for_season(season_path: Path, index=None, workers: int = 1) -> List[Path]:
     """
     Retorna lista de archivos multimedia que representan episodios dentro de season_path.
     Busca archivos directos; si no hay, busca en subcarpetas (1 nivel) y los devuelve.
     """
     season_path = Path(season_path)
-    files = list_media_files(season_path)
-    if files:
-        return files
+    dirs, media = _listing(season_path, index)
+    if media:
+        return [season_path / f for f in media]
     # buscar 1 nivel en subfolders
     episodes = []
-    for sd in [d for d in season_path.iterdir() if d.is_dir()]:
-        episodes.extend(list_media_files(sd))
+    subdirs = [season_path / d for d in dirs]
+    for sd, (_, sd_media) in zip(subdirs, list_many(subdirs, index, workers)):
+        episodes.extend(sd / f for f in sd_media)
     # ordenar por nombre
     return sorted(episodes)
 
+# --- episodios de un Doctor completo: todas sus temporadas, en orden ---
+def doctor_episodes(season_paths: List[Path], index=None, workers: int = 1) -> List[Path]:
+    """list_episodes_for_season de cada temporada, concatenados en el orden de season_paths."""
+    episodes = []
+    for season in season_paths:
+        episodes.extend(list_episodes_for_season(season, index, workers))
+    return episodes
+
 def default_state_path() -> Path:
     """Ruta por defecto para el archivo de estado según plataforma."""
     home = Path.home()
@@ -207,69 +300,284 @@ def default_state_path() -> Path:
 def ensure_state_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
-def load_watch_state(path: Optional[str] = None) -> Dict[str, Any]:
-    """Carga el JSON de estado (path opcional). Devuelve dict vacío si no existe."""
+@traced("utils.load_watch_state")
+def load_watch_state(path: Optional[str] = None, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Carga el estado (snapshot JSON + journal, o sqlite; path opcional). Devuelve dict vacío si no existe."""
     p = Path(path) if path else default_state_path()
-    if not p.exists():
-        return {}
-    try:
-        return json.loads(p.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    if not _trace.enabled():
+        return _state_store.load(p, backend)
+    t0 = time.perf_counter()
+    state = _state_store.load(p, backend)
+    _trace_state("state_loaded", p, backend, t0, entries=len(state))
+    return state
+
+@traced("utils.save_watch_state")
+def save_watch_state(state: Dict[str, Any], path: Optional[str] = None, backend: Optional[str] = None) -> None:
+    """Guarda el estado completo como snapshot (crea el directorio si hace falta) y compacta el journal."""
+    p = Path(path) if path else default_state_path()
+    t0 = time.perf_counter()
+    _state_store.snapshot(p, state, backend)
+    if _trace.enabled():
+        _trace_state("state_saved", p, backend, t0, mode="snapshot", entries=len(state))
+
+@traced("utils.record_watch_changes")
+def _record_watch_changes(state: Dict[str, Any], changes: Dict[str, Any], path: Optional[str] = None, backend: Optional[str] = None) -> None:
+    """Aplica changes al estado en memoria y los persiste (journal o una transacción sqlite)."""
+    state.update(changes)
+    p = Path(path) if path else default_state_path()
+    t0 = time.perf_counter()
+    _state_store.record(p, changes, backend)
+    if _trace.enabled():
+        _trace_state("state_saved", p, backend, t0, mode="changes", entries=len(changes))
+
+def _trace_state(op: str, p: Path, backend: Optional[str], t0: float, **fields) -> None:
+    """Registro de traza de una lectura/escritura del estado: bytes en disco tras la operación."""
+    size = 0
+    for f in _state_store.files(p, backend):
+        try:
+            size += os.stat(f).st_size
+        except OSError:
+            pass
+    _trace.event(op, path=str(p), backend=backend or "json", bytes=size, ms=_trace.ms_since(t0), **fields)
 
-def save_watch_state(state: Dict[str, Any], path: Optional[str] = None) -> None:
-    """Guarda el estado en JSON (crea el directorio si hace falta)."""
+@traced("utils.watched_counts")
+def watched_counts(dirs: list, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None, backend: Optional[str] = None) -> Dict[str, int]:
+    """{str(carpeta): episodios vistos debajo} para mostrar progreso en los menús."""
     p = Path(path) if path else default_state_path()
-    ensure_state_dir(p)
-    p.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    keys = {episode_key(str(d)): str(d) for d in dirs}
+    counts = _state_store.watched_counts(p, keys.keys(), state, backend)
+    return {keys[k]: n for k, n in counts.items()}
+
+def progress_label(watched: int, total: Optional[int] = None) -> str:
+    """Texto corto de progreso: '12/26 vistos' o '12 vistos' si no se conoce el total."""
+    if total is None:
+        return f"{watched} vistos"
+    return f"{min(watched, total)}/{total} vistos"
 
+@traced("utils.episode_key")
 def episode_key(ep_path: str) -> str:
     """Clave única para un episodio. Usamos la ruta absoluta normalizada."""
     return str(Path(ep_path).resolve())
 
-def is_watched(ep_path: str, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> bool:
+def is_watched(ep_path: str, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None, backend: Optional[str] = None) -> bool:
     if state is None:
-        state = load_watch_state(path)
+        state = load_watch_state(path, backend)
     return bool(state.get(episode_key(ep_path), {}).get("watched"))
 
-def mark_watched(ep_path: str, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> None:
+def mark_watched(ep_path: str, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None, backend: Optional[str] = None) -> None:
     if state is None:
-        state = load_watch_state(path)
+        state = load_watch_state(path, backend)
     k = episode_key(ep_path)
-    state[k] = {"watched": True, "ts": datetime.utcnow().isoformat()}
-    save_watch_state(state, path)
+    _record_watch_changes(state, {k: {"watched": True, "ts": datetime.utcnow().isoformat()}}, path, backend)
 
-def mark_unwatched(ep_path: str, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> None:
+def mark_unwatched(ep_path: str, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None, backend: Optional[str] = None) -> None:
     if state is None:
-        state = load_watch_state(path)
+        state = load_watch_state(path, backend)
     k = episode_key(ep_path)
     if k in state:
-        state[k]["watched"] = False
-        state[k]["ts"] = datetime.utcnow().isoformat()
-        save_watch_state(state, path)
+        entry = dict(state[k], watched=False, ts=datetime.utcnow().isoformat())
+        _record_watch_changes(state, {k: entry}, path, backend)
 
-def mark_all_in_dir(dir_path: str, watched: bool = True, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> None:
+def mark_all_in_dir(dir_path: str, watched: bool = True, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None, index=None, workers: int = 1, backend: Optional[str] = None) -> None:
     """Marca todos los archivos multimedia (recursivo 1 nivel) dentro de dir_path."""
     if state is None:
-        state = load_watch_state(path)
+        state = load_watch_state(path, backend)
     dirp = Path(dir_path)
-    for f in list_media_files(dirp):
-        k = episode_key(str(f))
-        state[k] = {"watched": bool(watched), "ts": datetime.utcnow().isoformat()}
-    # también buscar en subcarpetas 1 nivel
-    for sd in [d for d in dirp.iterdir() if d.is_dir()]:
-        for f in list_media_files(sd):
-            k = episode_key(str(f))
-            state[k] = {"watched": bool(watched), "ts": datetime.utcnow().isoformat()}
-    save_watch_state(state, path)
-
-def list_with_watch_status(episodes: list, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> list:
+    # carpeta y subcarpetas 1 nivel, listadas una sola vez
+    tree = walk_tree(dirp, 1, index, workers)
+    ts = datetime.utcnow().isoformat()
+    changes = {episode_key(str(f)): {"watched": bool(watched), "ts": ts} for f in media_in_tree(tree, dirp, 1)}
+    _record_watch_changes(state, changes, path, backend)
+
+@traced("utils.list_with_watch_status")
+def list_with_watch_status(episodes: list, state: Optional[Dict[str, Any]] = None, path: Optional[str] = None, backend: Optional[str] = None) -> list:
     """Devuelve lista de tuples (Path, watched:bool)."""
     if state is None:
-        state = load_watch_state(path)
+        state = load_watch_state(path, backend)
     out = []
     for e in episodes:
         kp = episode_key(str(e))
         watched = bool(state.get(kp, {}).get("watched", False))
         out.append((e, watched))
-    return out
\ No newline at end of file
+    return out
+
+def _file_id(path: str) -> tuple:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, st.st_size, st.st_mtime_ns)
+
+
+class WatchSession:
+    """
+    Estado de vistos en memoria para una sesión interactiva.
+    Se carga una vez y solo se recarga si cambian mtime/tamaño de los archivos de estado
+    (otro proceso escribió); las claves resueltas de episodios se cachean, así redibujar
+    un menú no hace Path.resolve() ni relee el JSON.
+
+    key_mode "fingerprint": las claves son huellas de contenido (fingerprint.py) y la
+    ruta queda como pista en la entrada. Leer no escribe nada: una entrada antigua por
+    ruta se usa tal cual mientras el episodio no tenga huella en el estado, y las pistas
+    de episodios movidos se corrigen en memoria y se guardan con la próxima marca. Marcar
+    o desmarcar migra el episodio a su huella y, si existe, actualiza también la entrada
+    por ruta, así volver a watch_key "path" no pierde nada.
+    """
+
+    def __init__(self, path: Optional[str] = None, backend: Optional[str] = None, key_mode: Optional[str] = None):
+        self.path = path
+        self.backend = backend
+        self.key_mode = key_mode or "path"
+        base = Path(path) if path else default_state_path()
+        if backend == "sqlite":
+            self._files = [_state_store.sqlite_path(base)]
+        else:
+            self._files = [base, _state_store.journal_path(base)]
+        self.state: Dict[str, Any] = {}
+        self._sig = None
+        self._keys: Dict[str, str] = {}
+        # (ruta, tamaño, mtime_ns) -> huella: un archivo reemplazado en la misma ruta se recalcula.
+        # El id de cada ruta se toma una vez por sesión (sin stat en cada redibujo); invalidate()
+        # lo descarta cuando el watcher informa cambios.
+        self._fps: Dict[tuple, Optional[str]] = {}
+        self._ids: Dict[str, tuple] = {}
+        # huella -> ruta actual, vista al leer y pendiente de la próxima escritura
+        self._hints: Dict[str, str] = {}
+        self._fp_cache = None
+        if self.key_mode == "fingerprint":
+            from .fingerprint import FingerprintCache, fingerprint_cache_path
+            self._fp_cache = FingerprintCache.load(fingerprint_cache_path(base))
+
+    @classmethod
+    def shared(cls, path: Optional[str] = None, backend: Optional[str] = None, key_mode: Optional[str] = None) -> "WatchSession":
+        """
+        Como el constructor; en el daemon la misma sesión se reutiliza entre comandos
+        (refresh() valida el estado; los ids de archivo se vuelven a tomar en cada comando).
+        """
+        session = _resident.cached(("watch-session", path, backend, key_mode), [], lambda: cls(path, backend, key_mode))
+        session.invalidate()
+        return session
+
+    def invalidate(self, dirs: Optional[Iterable] = None) -> None:
+        """Olvida los ids de archivo de todos los episodios, o de los que están bajo dirs."""
+        if dirs is None:
+            self._ids.clear()
+            return
+        prefixes = tuple(str(d).rstrip(os.sep) + os.sep for d in dirs)
+        for p in [p for p in self._ids if p.startswith(prefixes)]:
+            del self._ids[p]
+
+    def _signature(self):
+        sig = []
+        for f in self._files:
+            try:
+                st = os.stat(f)
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+    def refresh(self) -> Dict[str, Any]:
+        """Recarga el estado solo si los archivos cambiaron desde la última lectura/escritura."""
+        sig = self._signature()
+        if sig != self._sig:
+            self.state = load_watch_state(self.path, self.backend)
+            self._sig = sig
+        return self.state
+
+    def path_key(self, ep) -> str:
+        s = str(ep)
+        k = self._keys.get(s)
+        if k is None:
+            k = self._keys[s] = episode_key(s)
+        return k
+
+    @traced("WatchSession.keys")
+    def keys(self, episodes: list) -> list:
+        """Clave de cada episodio; las huellas que faltan se calculan juntas (en paralelo)."""
+        if self._fp_cache is None:
+            return [self.path_key(e) for e in episodes]
+        ids = []
+        for e in episodes:
+            s = str(e)
+            i = self._ids.get(s)
+            if i is None:
+                i = self._ids[s] = _file_id(s)
+            ids.append(i)
+        todo = [i for i in ids if i not in self._fps]
+        if todo:
+            fps = self._fp_cache.fingerprints([i[0] for i in todo])
+            for i in todo:
+                self._fps[i] = fps.get(i[0])
+            self._fp_cache.save()
+        # un archivo ilegible (sin huella) cae a la clave por ruta
+        return [self._fps.get(i) or self.path_key(e) for e, i in zip(episodes, ids)]
+
+    def key(self, ep) -> str:
+        return self.keys([ep])[0]
+
+    def _entry(self, ep, k: str) -> Optional[Dict[str, Any]]:
+        """Entrada de un episodio: la de su huella o, si todavía no tiene, la antigua por ruta."""
+        entry = self.state.get(k)
+        if entry is None and k.startswith("fp:"):
+            legacy = self.state.get(self.path_key(ep))
+            if isinstance(legacy, dict):
+                return legacy
+        return entry
+
+    def _note_hints(self, episodes: list, keys: list) -> None:
+        """
+        Pistas de ruta de huellas movidas (solo en memoria; se guardan con la próxima marca).
+        Si varios episodios tienen la misma huella (copias idénticas) la pista se queda en
+        cualquiera de ellos que siga presente.
+        """
+        present = {self.path_key(e) for e, k in zip(episodes, keys) if k.startswith("fp:")}
+        for e, k in zip(episodes, keys):
+            entry = self.state.get(k) if k.startswith("fp:") else None
+            if entry is not None and k not in self._hints and entry.get("path") not in present:
+                self._hints[k] = self.path_key(e)
+
+    @traced("WatchSession.status")
+    def status(self, episodes: list) -> list:
+        """Como list_with_watch_status, con claves cacheadas. No escribe el estado."""
+        keys = self.keys(episodes)
+        if self._fp_cache is not None:
+            self._note_hints(episodes, keys)
+        return [(e, bool((self._entry(e, k) or {}).get("watched", False))) for e, k in zip(episodes, keys)]
+
+    @traced("WatchSession.set_watched")
+    def set_watched(self, episodes: list, watched: bool = True) -> int:
+        """
+        Marca/desmarca episodes con una sola escritura (journal o transacción sqlite).
+        Al desmarcar solo se tocan episodios que ya estaban en el estado, como mark_unwatched.
+        Con huellas, la entrada antigua por ruta (si existe) recibe el mismo cambio.
+        Devuelve cuántos episodios cambiaron.
+        """
+        ts = datetime.utcnow().isoformat()
+        changes = {}
+        count = 0
+        for e, k in zip(episodes, self.keys(episodes)):
+            current = self._entry(e, k)
+            if not watched and current is None:
+                continue
+            entry = {"watched": True, "ts": ts} if watched else dict(current, watched=False, ts=ts)
+            if k.startswith("fp:"):
+                where = self.path_key(e)
+                legacy = self.state.get(where)
+                if isinstance(legacy, dict):
+                    changes[where] = dict(legacy, watched=watched, ts=ts)
+                entry["path"] = where
+                self._hints.pop(k, None)
+            changes[k] = entry
+            count += 1
+        if changes:
+            # la entrada se toma al escribir: el estado pudo recargarse desde que se vio la pista
+            for k, where in self._hints.items():
+                entry = self.state.get(k)
+                if k not in changes and entry is not None and entry.get("path") != where:
+                    changes[k] = dict(entry, path=where)
+            self._hints.clear()
+            _record_watch_changes(self.state, changes, self.path, self.backend)
+            # nuestra propia escritura no debe provocar una recarga
+            self._sig = self._signature()
+        return count
@@ -0,0 +1,239 @@
+# src/mycli/watcher.py
+"""
+Vigilancia de la biblioteca para sesiones interactivas largas.
+
+Un watcher se engancha a un LibraryIndex (attach_watcher) y vigila cada carpeta
+que el índice lista durante la sesión. En Linux usa inotify vía ctypes: las
+altas, bajas y renombres se leen sin bloquear en poll() y se aplican al índice
+de forma incremental, así un episodio recién descargado aparece en el menú sin
+volver a listar nada. Sin inotify (otro sistema, límite de watches agotado) hay
+un fallback por sondeo: poll() compara el mtime de las carpetas vivas cada
+POLL_INTERVAL segundos y relista solo las que cambiaron.
+
+library_watcher en config.json: "off" (default), "auto", "inotify" o "poll".
+"""
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from .utils import VIDEO_EXTS, scan_dir
+
+WATCHER_MODES = ("off", "auto", "inotify", "poll")
+POLL_INTERVAL = 2.0
+
+# constantes de <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    return _libc
+
+
+def inotify_available() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+class InotifyWatcher:
+    """Watches de inotify sobre las carpetas listadas; poll() aplica los eventos pendientes al índice."""
+
+    def __init__(self, index):
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.index = index
+        self.fd = fd
+        self._libc = libc
+        self._wds: Dict[int, str] = {}
+        self._paths: Dict[str, int] = {}
+        # listing() puede llamarse desde los hilos de walk_tree
+        self._lock = threading.Lock()
+        self.exhausted = False
+
+    def add(self, path: str) -> bool:
+        """Vigila path; False si no se pudo (la carpeta sigue validándose con stat)."""
+        with self._lock:
+            if path in self._paths:
+                return True
+            if self.exhausted:
+                return False
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _MASK)
+            if wd < 0:
+                # ENOSPC: se agotó fs.inotify.max_user_watches; no insistir
+                if ctypes.get_errno() == 28:
+                    self.exhausted = True
+                return False
+            self._wds[wd] = path
+            self._paths[path] = wd
+            return True
+
+    def _drop(self, path: str) -> None:
+        """Deja de vigilar path y todo lo que cuelga de él."""
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            for p in [p for p in self._paths if p == path or p.startswith(prefix)]:
+                wd = self._paths.pop(p)
+                self._wds.pop(wd, None)
+                self._libc.inotify_rm_watch(self.fd, wd)
+
+    def _read(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            chunks.append(data)
+        return b"".join(chunks)
+
+    def poll(self) -> Set[str]:
+        """Aplica al índice los eventos pendientes (sin bloquear). Devuelve las carpetas cambiadas."""
+        data = self._read()
+        changed: Set[str] = set()
+        pos = 0
+        while pos + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            name = data[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+            pos += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # se perdieron eventos: todo vuelve a validarse con stat
+                self.index.live.clear()
+                changed.update(self._paths)
+                continue
+            parent = self._wds.get(wd)
+            if parent is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                self.index.live.discard(parent)
+                if mask & IN_IGNORED:
+                    with self._lock:
+                        self._wds.pop(wd, None)
+                        self._paths.pop(parent, None)
+                continue
+            name = os.fsdecode(name)
+            full = os.path.join(parent, name)
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                is_dir = os.path.isdir(full)
+                if not is_dir and os.path.splitext(name)[1].lower() not in VIDEO_EXTS:
+                    continue
+                if self.index.apply_created(parent, name, is_dir):
+                    changed.add(parent)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                if mask & IN_ISDIR:
+                    self._drop(full)
+                if self.index.apply_removed(parent, name):
+                    changed.add(parent)
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Fallback: compara el mtime de las carpetas vivas, como mucho cada interval segundos."""
+
+    def __init__(self, index, interval: float = POLL_INTERVAL):
+        self.index = index
+        self.interval = interval
+        self._last = time.monotonic()
+
+    def add(self, path: str) -> bool:
+        return True
+
+    def poll(self) -> Set[str]:
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return set()
+        self._last = now
+        changed: Set[str] = set()
+        for key in list(self.index.live):
+            entry = self.index.dirs.get(key)
+            try:
+                mtime = os.stat(key).st_mtime_ns
+            except OSError:
+                self.index.forget(key)
+                changed.add(key)
+                continue
+            if entry is None or entry.get("mtime") == mtime:
+                continue
+            dirs, media = scan_dir(key)
+            # subcarpetas que ya no están: olvidar sus listados
+            for gone in set(entry["dirs"]) - set(dirs):
+                self.index.forget(os.path.join(key, gone))
+            entry.update(mtime=mtime, dirs=dirs, media=media)
+            self.index._dirty = True
+            changed.add(key)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def attach_watcher(index, mode: Optional[str] = None):
+    """Engancha un watcher al índice según mode; None si está desactivado."""
+    mode = mode or "off"
+    if mode == "off":
+        return None
+    watcher = None
+    if mode in ("auto", "inotify") and inotify_available():
+        try:
+            watcher = InotifyWatcher(index)
+        except OSError as ex:
+            if mode == "inotify":
+                print(f"inotify no disponible ({ex}); uso sondeo.")
+    if watcher is None:
+        watcher = PollingWatcher(index)
+    index.watcher = watcher
+    return watcher
+
+
+def detach_watcher(index) -> None:
+    watcher = index.watcher
+    if watcher is not None:
+        watcher.close()
+        index.watcher = None
+        index.live.clear()
+
+
+__all__ = [
+    "WATCHER_MODES",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "attach_watcher",
+    "detach_watcher",
+    "inotify_available",
+]
@@ -0,0 +1,22 @@
+# tests/conftest.py
+"""
+Configuración común de pytest: el paquete se importa desde src/ sin instalarlo.
+Esta carpeta queda en sys.path (modo prepend de pytest), así los tests importan
+los ayudantes de aquí (p. ej. fake_mpv) directamente.
+"""
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+
+@pytest.fixture
+def sock():
+    # ruta corta: los sockets Unix tienen un límite de ~100 bytes
+    tmp = tempfile.mkdtemp(prefix="mpv")
+    yield Path(tmp) / "player.sock"
+    shutil.rmtree(tmp, ignore_errors=True)
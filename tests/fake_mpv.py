@@ -0,0 +1,245 @@
+# tests/fake_mpv.py
+"""
+Reproductor falso que habla el JSON IPC de mpv sobre un socket Unix.
+
+Sirve para probar y medir mycli.player sin mpv ni pantalla. Entiende lo que
+usa la CLI: loadfile (replace/append/append-play), loadlist, playlist-next,
+stop, quit, set_property y get_property de path, pause, idle-active,
+playlist, playlist-pos y playlist-count. Responde con el request_id del
+pedido y emite los eventos start-file / end-file como mpv.
+
+En el proceso (hilo servidor):
+    with FakeMpv(sock_path) as fake: ...
+
+Como ejecutable, en lugar de mpv (acepta sus flags, ignora los demás):
+    python tests/fake_mpv.py --idle=yes --input-ipc-server=/tmp/x.sock [--startup-delay 0.3]
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+def read_m3u(path) -> List[str]:
+    base = Path(path).parent
+    entries = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            entries.append(str(line if os.path.isabs(line) else base / line))
+    return entries
+
+
+class FakeMpv:
+    """Servidor IPC con estado de playlist; un hilo por conexión."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.playlist: List[str] = []
+        self.ids: List[int] = []  # como en mpv: únicos y crecientes, no posiciones
+        self._next_id = 0
+        self.pos = -1
+        self.pause = False
+        self.commands: List[list] = []
+        self.stopped = threading.Event()
+        self._clients: List[socket.socket] = []
+        self._lock = threading.RLock()  # también ordena respuestas y eventos en el socket
+        self._srv: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- estado ----------
+    def _emit(self, event: dict) -> None:  # con _lock tomado
+        data = (json.dumps(event) + "\n").encode("utf-8")
+        for c in list(self._clients):
+            try:
+                c.sendall(data)
+            except OSError:
+                pass
+
+    def _stop_current(self) -> None:
+        if 0 <= self.pos < len(self.playlist):
+            self._emit({"event": "end-file", "reason": "stop", "playlist_entry_id": self.ids[self.pos]})
+
+    def _start(self, pos: int) -> None:
+        self.pos = pos
+        if 0 <= pos < len(self.playlist):
+            self._emit({"event": "start-file", "playlist_entry_id": self.ids[pos]})
+
+    def _append(self, entries: List[str]) -> None:
+        for f in entries:
+            self._next_id += 1
+            self.playlist.append(f)
+            self.ids.append(self._next_id)
+
+    def advance(self) -> None:
+        """Simula que el archivo actual terminó (end-file eof) y pasa al siguiente."""
+        with self._lock:
+            if 0 <= self.pos < len(self.playlist):
+                self._emit({"event": "end-file", "reason": "eof", "playlist_entry_id": self.ids[self.pos]})
+                self.pos += 1
+                if self.pos < len(self.playlist):
+                    self._emit({"event": "start-file", "playlist_entry_id": self.ids[self.pos]})
+                else:
+                    self.pos = -1
+                    self._emit({"event": "idle"})
+
+    def _load(self, entries: List[str], mode: str) -> None:
+        if mode == "replace":
+            self._stop_current()
+            self.playlist, self.ids = [], []
+            self._append(entries)
+            self._start(0 if entries else -1)
+        else:
+            was_idle = self.pos < 0
+            self._append(entries)
+            if mode == "append-play" and was_idle:
+                self._start(len(self.playlist) - len(entries))
+
+    def _property(self, name: str):
+        current = self.playlist[self.pos] if 0 <= self.pos < len(self.playlist) else None
+        if name == "path":
+            return current
+        if name == "pause":
+            return self.pause
+        if name == "idle-active":
+            return current is None
+        if name == "playlist-pos":
+            return self.pos
+        if name == "playlist-count":
+            return len(self.playlist)
+        if name == "playlist":
+            return [dict({"filename": f, "id": self.ids[i]}, **({"current": True, "playing": True} if i == self.pos else {}))
+                    for i, f in enumerate(self.playlist)]
+        raise KeyError(name)
+
+    def handle(self, cmd: list):
+        """(error, data) de un comando."""
+        self.commands.append(cmd)
+        name, args = cmd[0], cmd[1:]
+        with self._lock:
+            if name == "loadfile":
+                self._load([args[0]], args[1] if len(args) > 1 else "replace")
+            elif name == "loadlist":
+                try:
+                    self._load(read_m3u(args[0]), args[1] if len(args) > 1 else "replace")
+                except OSError:
+                    return "error running command", None
+            elif name == "playlist-next":
+                if self.pos + 1 >= len(self.playlist):
+                    return "error running command", None
+                self._stop_current()
+                self._start(self.pos + 1)
+            elif name == "stop":
+                self._stop_current()
+                self.playlist, self.ids, self.pos = [], [], -1
+            elif name == "quit":
+                self.stopped.set()
+            elif name == "set_property":
+                if args[0] == "pause":
+                    self.pause = bool(args[1])
+            elif name == "get_property":
+                try:
+                    return "success", self._property(args[0])
+                except KeyError:
+                    return "property not found", None
+            else:
+                return "invalid parameter", None
+        return "success", None
+
+    # ---------- servidor ----------
+    def _client(self, conn: socket.socket) -> None:
+        self._clients.append(conn)
+        buf = b""
+        try:
+            while not self.stopped.is_set():
+                chunk = conn.recv(64 * 1024)
+                if not chunk:
+                    break
+                buf += chunk
+                while b"\n" in buf:
+                    line, buf = buf.split(b"\n", 1)
+                    try:
+                        req = json.loads(line)
+                    except ValueError:
+                        continue
+                    error, data = self.handle(list(req.get("command") or ["?"]))
+                    reply = {"error": error, "data": data}
+                    if "request_id" in req:
+                        reply["request_id"] = req["request_id"]
+                    with self._lock:
+                        conn.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+                    if self.stopped.is_set():
+                        break
+        except OSError:
+            pass
+        finally:
+            if conn in self._clients:
+                self._clients.remove(conn)
+            conn.close()
+
+    def start(self) -> "FakeMpv":
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._srv.bind(str(self.path))
+        self._srv.listen(8)
+        self._srv.settimeout(0.1)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                conn, _ = self._srv.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            threading.Thread(target=self._client, args=(conn,), daemon=True).start()
+        self._srv.close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def stop(self) -> None:
+        """Como cerrar la ventana de mpv: corta las conexiones y quita el socket (al volver, ya no está)."""
+        self.stopped.set()
+        for c in list(self._clients):
+            try:
+                c.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self) -> "FakeMpv":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--input-ipc-server", required=True)
+    ap.add_argument("--startup-delay", type=float, default=0.0, help="Segundos antes de abrir el socket (arranque simulado)")
+    args, _ = ap.parse_known_args(argv)
+    time.sleep(args.startup_delay)
+    fake = FakeMpv(args.input_ipc_server).start()
+    fake.stopped.wait()
+    time.sleep(0.05)  # deja que salga la respuesta a quit
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
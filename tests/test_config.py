@@ -0,0 +1,47 @@
+# tests/test_config.py
+"""Config por capas: el snapshot (marshal) devuelve lo mismo que cargar los JSON y se invalida al editarlos."""
+import json
+import os
+
+import pytest
+
+from mycli import config
+
+
+@pytest.fixture
+def cfg_home(tmp_path, monkeypatch):
+    cfg_file = tmp_path / ".ohmycli" / "config.json"
+    cfg_file.parent.mkdir()
+    for d in ("classic", "new"):
+        (tmp_path / d).mkdir()
+    cfg_file.write_text(json.dumps({"who_classic_path": "../classic", "who_new_path": "../new",
+                                    "notes_path": "../notas", "player_cmd": "mpv"}), encoding="utf-8")
+    monkeypatch.setattr(config, "GLOBAL_CONFIG_PATH", cfg_file)
+    monkeypatch.setattr(config, "SNAPSHOT_PATH", cfg_file.with_name("config.snapshot"))
+    return cfg_file
+
+
+def test_snapshot_round_trip(cfg_home, monkeypatch):
+    first = config.load_layered_config()
+    assert config.SNAPSHOT_PATH.exists()
+    assert first["notes_path"] == str((cfg_home.parent.parent / "notas").resolve())
+
+    def no_json(path):
+        raise AssertionError("con el snapshot vigente no se relee el JSON")
+    monkeypatch.setattr(config, "read_config_file", no_json)
+    assert config.load_layered_config() == first
+
+
+def test_snapshot_invalidated_by_edit(cfg_home):
+    assert config.load_layered_config()["player_cmd"] == "mpv"
+    data = json.loads(cfg_home.read_text(encoding="utf-8"))
+    data["player_cmd"] = "vlc"
+    cfg_home.write_text(json.dumps(data), encoding="utf-8")
+    st = os.stat(cfg_home)
+    os.utime(cfg_home, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert config.load_layered_config()["player_cmd"] == "vlc"
+
+
+def test_cli_flags_override_snapshot(cfg_home):
+    config.load_layered_config()
+    assert config.load_layered_config(cli={"player_cmd": "vlc", "state_path": None})["player_cmd"] == "vlc"
@@ -0,0 +1,53 @@
+# tests/test_notes_manifest.py
+"""NotesManifest: IDs estables entre cargas y notas editadas por fuera de la CLI."""
+import os
+
+from mycli.notes_manifest import NotesManifest, notes_manifest_path
+
+
+def _names(m):
+    return {nid: e["name"] for nid, e in m.entries()}
+
+
+def test_ids_are_stable_across_loads(tmp_path):
+    notes = tmp_path / "notas"
+    notes.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (notes / name).write_text(f"título {name}\n", encoding="utf-8")
+    m = NotesManifest.load(notes)
+    m.save()
+    assert _names(m) == {1: "a.txt", 2: "b.txt", 3: "c.txt"}
+    assert notes_manifest_path(notes).exists()
+
+    (notes / "b.txt").unlink()
+    (notes / "d.txt").write_text("nueva\n", encoding="utf-8")
+    m = NotesManifest.load(notes)
+    m.save()
+    assert _names(m) == {1: "a.txt", 3: "c.txt", 4: "d.txt"}
+    assert m.get(4)["title"] == "nueva"
+    assert _names(NotesManifest.load(notes)) == _names(m)
+
+
+def test_outside_edit_refreshes_entry(tmp_path):
+    notes = tmp_path / "notas"
+    notes.mkdir()
+    (notes / "a.txt").write_text("viejo título\n", encoding="utf-8")
+    NotesManifest.load(notes).save()
+
+    dir_mtime = os.stat(notes).st_mtime_ns
+    (notes / "a.txt").write_text("título nuevo y más largo\n", encoding="utf-8")
+    assert os.stat(notes).st_mtime_ns == dir_mtime
+
+    m = NotesManifest.load(notes)
+    entry = m.get(1)
+    st = os.stat(notes / "a.txt")
+    assert entry["title"] == "título nuevo y más largo"
+    assert (entry["mtime"], entry["size"]) == (st.st_mtime_ns, st.st_size)
+
+
+def test_unchanged_folder_is_not_rewritten(tmp_path):
+    notes = tmp_path / "notas"
+    notes.mkdir()
+    (notes / "a.txt").write_text("a\n", encoding="utf-8")
+    NotesManifest.load(notes).save()
+    assert NotesManifest.load(notes).reconcile() is False
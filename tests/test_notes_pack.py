@@ -0,0 +1,95 @@
+# tests/test_notes_pack.py
+"""NotesPack: ida y vuelta de notas, índice reconstruido y packs dañados."""
+import pytest
+
+from mycli.notes_pack import NotesPack, PACK_MAGIC
+
+
+@pytest.fixture
+def notes(tmp_path):
+    folder = tmp_path / "notas"
+    folder.mkdir()
+    return folder
+
+
+def _write(folder, texts):
+    for name, text in texts.items():
+        (folder / name).write_text(text, encoding="utf-8")
+    return [folder / name for name in texts]
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_pack_round_trip(notes, tmp_path, codec):
+    texts = {"a.txt": "uno\n", "b.txt": "dos ñ\n" * 1000, "c.txt": ""}
+    pack = NotesPack.load(notes)
+    assert sorted(pack.add_files(_write(notes, texts), codec=codec)) == sorted(texts)
+    pack.remove(["c.txt"])
+    pack.save()
+
+    for rebuild in (False, True):
+        if rebuild:
+            pack.index_path.unlink()  # sin índice: se recorre el pack
+        loaded = NotesPack.load(notes)
+        assert sorted(loaded.notes) == ["a.txt", "b.txt"]
+        assert loaded.read_text("b.txt") == texts["b.txt"]
+    dest = tmp_path / "a.txt"
+    loaded.extract("a.txt", dest)
+    assert dest.read_text(encoding="utf-8") == "uno\n"
+    assert dest.stat().st_mtime_ns == (notes / "a.txt").stat().st_mtime_ns
+
+
+def test_bad_header_is_read_as_empty(notes, capsys):
+    pack = NotesPack(notes)
+    pack.path.write_bytes(b"no es un pack")
+    loaded = NotesPack.load(notes)
+    assert loaded.notes == {} and loaded.corrupt
+    assert "se trata como vacío" in capsys.readouterr().out
+    loaded.save()
+    assert pack.path.read_bytes() == b"no es un pack"
+    with pytest.raises(ValueError):
+        loaded.add_files(_write(notes, {"a.txt": "x"}))
+
+
+def test_truncated_record_is_reported_and_cut_on_append(notes, capsys):
+    pack = NotesPack.load(notes)
+    pack.add_files(_write(notes, {"a.txt": "uno\n", "b.txt": "dos\n" * 100}))
+    pack.save()
+    data = pack.path.read_bytes()
+    pack.path.write_bytes(data[:-5])
+    pack.index_path.unlink()
+
+    loaded = NotesPack.load(notes)
+    assert sorted(loaded.notes) == ["a.txt"]
+    assert "Pack de notas dañado" in capsys.readouterr().out
+    loaded.add_files(_write(notes, {"c.txt": "tres\n"}))
+    loaded.save()
+    loaded.index_path.unlink()
+    again = NotesPack.load(notes)
+    assert sorted(again.notes) == ["a.txt", "c.txt"]
+    assert again.read_text("c.txt") == "tres\n"
+    assert again.path.read_bytes().startswith(PACK_MAGIC)
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_compressible_note_is_inflated_by_blocks(notes, codec):
+    import tracemalloc
+
+    size = 32 * 1024 * 1024
+    with open(notes / "ceros.txt", "wb") as fh:
+        fh.truncate(size)  # 32 MiB de ceros: unos pocos KiB comprimidos
+    pack = NotesPack.load(notes)
+    pack.add_files([notes / "ceros.txt"], codec=codec)
+
+    total = 0
+    tracemalloc.start()
+    try:
+        with pack.open_binary("ceros.txt") as fh:
+            for block in iter(lambda: fh.read(64 * 1024), b""):
+                assert not block.strip(b"\0")
+                total += len(block)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert total == size
+    # sin max_length el primer bloque se inflaba entero; lzma suma su diccionario (8 MiB)
+    assert peak < size // 3
@@ -0,0 +1,28 @@
+# tests/test_notes_search.py
+"""notes search: el índice sigue a las notas editadas por fuera de la CLI."""
+import os
+
+from mycli.commands.notes import notes as notes_cmd
+
+
+def _search(notes_dir, capsys, query):
+    capsys.readouterr()
+    notes_cmd._search(notes_dir, query)
+    return capsys.readouterr().out
+
+
+def test_search_sees_note_edited_outside_cli(tmp_path, capsys):
+    notes_dir = tmp_path / "notas"
+    notes_dir.mkdir()
+    (notes_dir / "a.txt").write_text("zanahoria\n", encoding="utf-8")
+    (notes_dir / "b.txt").write_text("apio\n", encoding="utf-8")
+    assert "a.txt" in _search(notes_dir, capsys, "zanahoria")
+    assert "Sin resultados" in _search(notes_dir, capsys, "gallifrey")
+
+    dir_mtime = os.stat(notes_dir).st_mtime_ns
+    with open(notes_dir / "a.txt", "a", encoding="utf-8") as fh:
+        fh.write("gallifrey\n")
+    assert os.stat(notes_dir).st_mtime_ns == dir_mtime  # editar no mueve el mtime de la carpeta
+
+    out = _search(notes_dir, capsys, "gallifrey")
+    assert "a.txt" in out and "b.txt" not in out
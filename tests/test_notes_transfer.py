@@ -0,0 +1,70 @@
+# tests/test_notes_transfer.py
+"""export/import de notas: ida y vuelta en ambos formatos y nombres de registro inválidos."""
+import io
+import json
+import tarfile
+
+import pytest
+
+from mycli import notes_transfer
+
+
+def _notes(folder):
+    out = []
+    for path in sorted(folder.iterdir()):
+        st = path.stat()
+        out.append((path.name, st.st_mtime_ns, st.st_size, lambda path=path: open(path, "rb")))
+    return out
+
+
+@pytest.mark.parametrize("fmt,compress", [("jsonl", False), ("jsonl", True), ("tar", False), ("tar", True)])
+def test_export_import_round_trip(tmp_path, fmt, compress):
+    src = tmp_path / "src"
+    src.mkdir()
+    texts = {"a.txt": "primera\nnota\n", "ñandú.txt": "acentos: áéíóú\n", "vacía.txt": ""}
+    for name, text in texts.items():
+        (src / name).write_text(text, encoding="utf-8")
+
+    buf = io.BytesIO()
+    assert notes_transfer.export_notes(iter(_notes(src)), buf, fmt, compress) == len(texts)
+
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    bad = []
+    buf.seek(0)
+    names = [name for name, _ in notes_transfer.import_notes(dst, buf, invalid=bad.append)]
+    assert sorted(names) == sorted(texts)
+    assert bad == []
+    assert {p.name: p.read_text(encoding="utf-8") for p in dst.iterdir()} == texts
+    assert int((dst / "a.txt").stat().st_mtime) == int((src / "a.txt").stat().st_mtime)
+
+
+def _tar(members):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    buf.seek(0)
+    return buf
+
+
+def _jsonl(records):
+    return io.BytesIO(b"".join(json.dumps(r).encode("utf-8") + b"\n" for r in records))
+
+
+@pytest.mark.parametrize("stream", [
+    lambda: _tar([("..", b"x"), ("a/.", b"x"), ("sub", b"x"), ("ok.txt", b"bien")]),
+    lambda: _jsonl([{"name": "..", "text": "x"}, {"name": ".", "text": "x"}, {"name": "", "text": "x"},
+                    {"name": "sub", "text": "x"}, {"name": "ok.txt", "text": "bien"}]),
+])
+def test_dot_and_directory_names_are_skipped(tmp_path, stream):
+    notes = tmp_path / "notas"
+    (notes / "sub").mkdir(parents=True)
+    bad = []
+    names = [name for name, _ in notes_transfer.import_notes(notes, stream(), overwrite=True, invalid=bad.append)]
+    assert names == ["ok.txt"]
+    assert (notes / "ok.txt").read_text(encoding="utf-8") == "bien"
+    assert (notes / "sub").is_dir()
+    assert len(bad) >= 3
@@ -0,0 +1,122 @@
+# tests/test_player.py
+"""
+mycli.player contra el reproductor falso de tests/fake_mpv.py (en el proceso):
+loadfile por episodio, reconexión cuando el reproductor se cierra, y la cuenta de
+vistos de play_list (eof cuenta; saltado o cortado, no).
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from fake_mpv import FakeMpv
+from mycli import player as player_mod
+from mycli.player import PlayerSession
+from mycli.playlist import write_m3u
+
+EPISODES = [f"/biblioteca/Doctor 10/Temporada 2/S02E{i:02d}.mkv" for i in range(1, 6)]
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """Registra lo que caería en open_with_default (sin lanzar nada)."""
+    opened = []
+    monkeypatch.setattr(player_mod, "open_with_default", lambda path, cmd=None: opened.append(path))
+    return opened
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timeout esperando al reproductor falso"
+        time.sleep(0.005)
+
+
+def test_play_sends_loadfile(sock, fallback):
+    with FakeMpv(sock) as fake:
+        player = PlayerSession(mode="ipc", socket_path=sock)
+        assert player.play(EPISODES[0])
+        assert player.play(EPISODES[1])
+        player.close()
+    assert [c[1:] for c in fake.commands if c[0] == "loadfile"] == [[EPISODES[0], "replace"], [EPISODES[1], "replace"]]
+    assert fake.playlist == [EPISODES[1]]
+    assert fake.pause is False
+    assert fallback == []
+
+
+def test_reconnects_after_player_closed(sock, fallback):
+    fake = FakeMpv(sock).start()
+    player = PlayerSession(mode="ipc", socket_path=sock)
+    assert player.play(EPISODES[0])
+    fake.stop()  # el usuario cerró la ventana; otro reproductor abre el mismo socket
+    with FakeMpv(sock) as again:
+        assert player.play(EPISODES[1])
+        player.close()
+    assert again.playlist == [EPISODES[1]]
+    assert player.mode == "ipc"
+    assert fallback == []
+
+
+def test_failed_launch_falls_back_to_spawn_once(sock, fallback, tmp_path):
+    # un "reproductor" que ignora --input-ipc-server y nunca abre el socket
+    script = tmp_path / "mudo.py"
+    script.write_text("import time\ntime.sleep(30)\n", encoding="utf-8")
+    player = PlayerSession(mode="ipc", socket_path=sock, argv=[sys.executable, str(script)], start_timeout=0.3)
+    t0 = time.monotonic()
+    assert not player.play(EPISODES[0])
+    assert player.play(EPISODES[1])
+    assert time.monotonic() - t0 < 2.0  # un solo intento de lanzamiento
+    assert player.mode == "spawn"
+    assert player.proc.poll() is not None  # el proceso mudo se terminó
+    assert fallback == EPISODES[:2]
+
+
+def _run_list(sock, script):
+    """play_list sobre EPISODES mientras script(fake) simula al espectador; devuelve los vistos."""
+    with FakeMpv(sock) as fake:
+        m3u = write_m3u(sock.with_name("lista.m3u"), EPISODES)
+        player = PlayerSession(mode="ipc", socket_path=sock)
+
+        def viewer():
+            _wait_for(lambda: any(c[0] == "get_property" and c[1] == "playlist" for c in fake.commands))
+            script(fake)
+        threading.Thread(target=viewer, daemon=True).start()
+        finished = player.play_list(EPISODES, m3u)
+        player.close()
+    return [str(Path(e)) for e in finished]
+
+
+def test_play_list_counts_only_finished(sock):
+    def script(fake):
+        fake.advance()                   # E01 termina
+        fake.handle(["playlist-next"])   # E02 se salta
+        for _ in range(3):
+            fake.advance()               # E03..E05 terminan
+    assert _run_list(sock, script) == [EPISODES[0]] + EPISODES[2:]
+
+
+def test_play_list_stops_when_player_closes(sock):
+    def script(fake):
+        fake.advance()
+        fake.advance()
+        fake.stop()                      # se cierra a mitad de E03
+    assert _run_list(sock, script) == EPISODES[:2]
+
+
+def test_play_list_spawn_mode_cannot_tell(sock, fallback):
+    m3u = write_m3u(sock.with_name("lista.m3u"), EPISODES)
+    assert PlayerSession(mode="spawn").play_list(EPISODES, m3u) is None
+    assert fallback == [str(m3u)]
+
+
+def test_play_list_spawn_waits_for_player_cmd(sock, tmp_path):
+    # con player_cmd la pregunta de qué se vio llega después de cerrar el reproductor
+    script = tmp_path / "reproductor.sh"
+    script.write_text("#!/bin/sh\nsleep 0.3\n", encoding="utf-8")
+    script.chmod(0o755)
+    m3u = write_m3u(sock.with_name("lista.m3u"), EPISODES)
+    t0 = time.monotonic()
+    assert PlayerSession(str(script), mode="spawn").play_list(EPISODES, m3u) is None
+    assert time.monotonic() - t0 >= 0.3
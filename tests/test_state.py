@@ -0,0 +1,49 @@
+# tests/test_state.py
+"""Estado de vistos en JSON: journal, compactación y escritores concurrentes."""
+import json
+import threading
+import time
+
+from mycli import state
+
+
+def _entry(i):
+    return {"watched": True, "ts": f"2024-01-01T00:00:{i:02d}"}
+
+
+def test_journal_round_trip(tmp_path):
+    p = tmp_path / "watched.json"
+    state.write_snapshot(p, {"a": _entry(0)})
+    state.append_changes(p, {"b": _entry(1)})
+    state.append_changes(p, {"a": dict(_entry(2), watched=False)})
+    assert state.journal_path(p).exists()
+    assert state.load_state(p) == {"a": dict(_entry(2), watched=False), "b": _entry(1)}
+    assert json.loads(p.read_text(encoding="utf-8")) == {"a": _entry(0)}  # el snapshot no se reescribió
+
+
+def test_compaction_keeps_records_from_other_writers(tmp_path, monkeypatch):
+    p = tmp_path / "watched.json"
+    monkeypatch.setattr(state, "COMPACT_BYTES", 200)
+    state.append_changes(p, {"otro/a": _entry(0)})  # otro proceso
+    state.append_changes(p, {f"mio/{i}": _entry(i) for i in range(1, 4)})
+    assert not state.journal_path(p).exists()
+    assert sorted(json.loads(p.read_text(encoding="utf-8"))) == ["mio/1", "mio/2", "mio/3", "otro/a"]
+
+
+def test_append_during_compaction_is_not_lost(tmp_path, monkeypatch):
+    p = tmp_path / "watched.json"
+    monkeypatch.setattr(state, "COMPACT_BYTES", 200)
+    real_load = state.load_state
+    writer = threading.Thread(target=state.append_changes, args=(p, {"tarde": _entry(9)}))
+
+    def slow_load(path):
+        # otro escritor llega entre la lectura del journal y su borrado
+        loaded = real_load(path)
+        writer.start()
+        time.sleep(0.2)
+        return loaded
+    monkeypatch.setattr(state, "load_state", slow_load)
+    state.append_changes(p, {f"k{i}": _entry(i) for i in range(6)})
+    writer.join(5)
+    monkeypatch.setattr(state, "load_state", real_load)
+    assert "tarde" in state.load_state(p)
@@ -0,0 +1,58 @@
+# tests/test_watch_session.py
+"""WatchSession con watch_key "fingerprint" sobre un estado antiguo por ruta."""
+import json
+
+import pytest
+
+from mycli import state as state_store
+from mycli.utils import WatchSession, episode_key, watched_counts
+
+
+@pytest.fixture
+def library(tmp_path):
+    season = tmp_path / "Doctor 10" / "Temporada 2"
+    season.mkdir(parents=True)
+    episodes = []
+    for i in range(1, 4):
+        ep = season / f"S02E{i:02d}.mkv"
+        ep.write_bytes(bytes([i]) * 1000)
+        episodes.append(ep)
+    st = tmp_path / "st" / "watched.json"
+    st.parent.mkdir()
+    # estado escrito en modo "path": E01 visto
+    st.write_text(json.dumps({episode_key(str(episodes[0])): {"watched": True, "ts": "2024-01-01T00:00:00"}}),
+                  encoding="utf-8")
+    return season, episodes, st
+
+
+def _snapshot_files(st):
+    return {f.name: f.read_bytes() for f in st.parent.iterdir() if f.name != "fingerprints.json"}
+
+
+def test_status_reads_legacy_entries_without_writing(library):
+    season, episodes, st = library
+    before = _snapshot_files(st)
+    session = WatchSession(str(st), None, "fingerprint")
+    session.refresh()
+    assert [w for _, w in session.status(episodes)] == [True, False, False]
+    assert _snapshot_files(st) == before
+
+
+def test_marks_keep_path_mode_in_sync(library):
+    season, episodes, st = library
+    fp = WatchSession(str(st), None, "fingerprint")
+    fp.refresh()
+    assert fp.set_watched([episodes[0]], False) == 1
+    assert fp.set_watched([episodes[1]], True) == 1
+
+    path_mode = WatchSession(str(st))
+    path_mode.refresh()
+    assert [w for _, w in path_mode.status(episodes)] == [False, False, False]  # E02 nunca tuvo entrada por ruta
+
+    fp.set_watched([episodes[0]], True)
+    path_mode.refresh()
+    assert [w for _, w in path_mode.status(episodes)] == [True, False, False]
+
+    # E01 tiene entrada por ruta y por huella: cuenta una vez
+    counts = watched_counts([str(season)], state=state_store.load_state(st), path=str(st))
+    assert counts == {str(season): 2}